@@ -8,6 +8,8 @@ import json
 import random
 import time
 
+from services.report_templates import NEGOTIATION_LEVERAGE, NEGOTIATION_PARTNERSHIP, report
+
 
 class NegotiationAgent:
     def __init__(self):
@@ -46,50 +48,21 @@ class NegotiationAgent:
         }
 
     def _develop_strategy(self, supplier: dict, current_cost: float, 
-                         target_cost: float, market_scenario: dict) -> str:
+                         target_cost: float, market_scenario: dict) -> dict:
         """Develops negotiation strategy based on market conditions (simulated AI)."""
         savings_needed = ((current_cost - target_cost) / current_cost) * 100
         
-        strategy_templates = [
-            f"""Negotiation Strategy for {supplier.get('name', 'Supplier')}:
-
-Market Analysis:
-- Current market trend: {market_scenario.get('market_trend', 'stable')}
-- Supply availability: {market_scenario.get('supply_availability', 'good')}
-- Competitive landscape: {market_scenario.get('competitor_pricing', 'competitive')}
-
-Strategy Approach:
-1. Volume Commitment: Propose long-term partnership with volume guarantees
-2. Payment Terms: Offer favorable payment terms in exchange for better pricing
-3. Market Benchmarking: Reference competitive pricing in the market
-4. Partnership Value: Emphasize strategic partnership benefits beyond pricing
-
-Target: Achieve {savings_needed:.1f}% cost reduction to meet procurement expectations.
-
-[AI-Generated Negotiation Strategy - Based on market analysis and supplier profile]""",
-            
-            f"""Strategic Negotiation Plan:
-
-Key Leverage Points:
-- Market conditions favor buyer (supply availability: {market_scenario.get('supply_availability', 'good')})
-- Opportunity for long-term contract with guaranteed volumes
-- Potential for expanded business relationship
-
-Negotiation Tactics:
-1. Open with partnership value proposition
-2. Present market data and competitive benchmarks
-3. Propose win-win scenarios (volume discounts, extended contracts)
-4. Emphasize quality and service alignment
-
-Expected Outcome: {savings_needed:.1f}% reduction through strategic negotiation.
-
-[AI-Powered Negotiation Framework - Optimized for mutual value creation]"""
-        ]
-        
-        return random.choice(strategy_templates)
+        return report(
+            random.choice([NEGOTIATION_PARTNERSHIP, NEGOTIATION_LEVERAGE]),
+            supplier_name=supplier.get('name', 'Supplier'),
+            market_trend=market_scenario.get('market_trend', 'stable'),
+            supply_availability=market_scenario.get('supply_availability', 'good'),
+            competitor_pricing=market_scenario.get('competitor_pricing', 'competitive'),
+            savings_needed=savings_needed
+        )
 
     def _simulate_negotiation(self, supplier: dict, current_cost: float, 
-                             target_cost: float, strategy: str) -> dict:
+                             target_cost: float, strategy: dict) -> dict:
         """Simulates negotiation outcome."""
         # Simulate negotiation - typically results in 5-15% improvement
         cost_reduction_percentage = random.uniform(0.05, 0.15)
@@ -5,9 +5,13 @@ Note: This is a demo version that simulates AI behavior without using real AI se
 """
 from datetime import datetime
 import json
+import os
 import random
 import time
 
+# Simulated channel round trip per contact (0 = instant, the demo default)
+SIMULATED_LATENCY_MS = float(os.getenv("OUTREACH_SIMULATED_LATENCY_MS", "0"))
+
 
 class OutreachAgent:
     def __init__(self):
@@ -20,15 +24,25 @@ class OutreachAgent:
         Handles supplier contact based on available contact methods.
         Simulates AI-powered contact management.
         """
-        # No delay for demo - instant response
+        if SIMULATED_LATENCY_MS > 0:
+            time.sleep(SIMULATED_LATENCY_MS / 1000)
         
-        if has_phone and supplier.get("phone"):
+        channel = self.contact_channel(supplier, has_phone)
+        if channel == "phone":
             return self._make_phone_call(supplier, requirement_description)
-        elif supplier.get("email"):
+        elif channel == "email":
             return self._send_email(supplier, requirement_description)
         else:
             return self._social_media_engagement(supplier, requirement_description)
 
+    def contact_channel(self, supplier: dict, has_phone: bool = False) -> str:
+        """Returns the channel handle_supplier_contact will use: phone, email or social_media."""
+        if has_phone and supplier.get("phone"):
+            return "phone"
+        elif supplier.get("email"):
+            return "email"
+        return "social_media"
+
     def _send_email(self, supplier: dict, requirement_description: str) -> dict:
         """Sends email to supplier and simulates response (simulated AI)."""
         email_content = self._generate_email_content(supplier, requirement_description)
@@ -164,8 +164,8 @@ AI-Powered Sourcing System"""
         
         suppliers = supplier_templates.get(template_key, supplier_templates["office supplies"])
         
-        # Randomly select 3-5 suppliers
-        num_suppliers = random.randint(3, min(5, len(suppliers)))
+        # Randomly select 3-5 suppliers (all of them for categories with fewer)
+        num_suppliers = random.randint(min(3, len(suppliers)), min(5, len(suppliers)))
         selected = random.sample(suppliers, num_suppliers)
         
         # Ensure certifications match requirements
@@ -0,0 +1,19 @@
+"""
+Supplier Snapshot Backfill
+Recomputes suppliers.latest_sample_id / latest_cost_analysis_id and their
+cached figures from the samples and cost_analyses tables. Migration 4 runs this
+once; run it again after importing or editing those tables outside the API.
+"""
+from models.database import engine, DATABASE_URL
+from models.migrations import backfill_supplier_snapshot, run_migrations
+
+print(f"Backfilling supplier snapshots: {DATABASE_URL}")
+
+try:
+    run_migrations(engine)
+    with engine.begin() as conn:
+        updated = backfill_supplier_snapshot(conn)
+    print(f"✓ Updated {updated} supplier(s)")
+except Exception as e:
+    print(f"Error during backfill: {e}")
+    raise
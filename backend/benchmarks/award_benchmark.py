@@ -0,0 +1,97 @@
+"""
+Award Benchmark
+Times services.award_optimizer.allocate_award on synthetic landed unit cost
+matrices shaped like the ones the award endpoint builds from
+CostAnalysisService.analyze_cost_batch: negotiated unit price plus freight per
+(supplier location, warehouse) scaled by the warehouse cost factor and spread
+over the quantity. One location is the production case (northwest corner);
+several locations take the reduced LP. Each plan is checked against capacities
+and demand and, up to --reference-max-variables, against the cost of the full
+S x W transportation LP.
+
+Usage (from the backend directory):
+    python -m benchmarks.award_benchmark --sizes 10x3 100x20 300x100 500x300 --locations 1 5
+"""
+import argparse
+import time
+
+import numpy as np
+from scipy import sparse
+from scipy.optimize import linprog
+
+from services.award_optimizer import AwardTooLarge, allocate_award
+
+
+def build_instance(suppliers: int, warehouses: int, locations: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    demand = rng.integers(100, 1000, warehouses).astype(np.float64)
+    quantity = demand.sum()
+    unit_prices = rng.uniform(50, 150, suppliers)
+    freight = rng.uniform(500, 5000, (locations, 1)) * rng.uniform(0.9, 1.3, warehouses)
+    supplier_location = rng.integers(0, locations, suppliers)
+    landed = unit_prices[:, None] + np.round(freight[supplier_location], 2) / quantity
+    # Total capacity about 1.5x demand so several suppliers must share the award
+    capacities = rng.uniform(0.5, 1.5, suppliers)
+    capacities *= quantity * 1.5 / capacities.sum()
+    return landed, capacities, demand
+
+
+def reference_cost(cost: np.ndarray, capacities: np.ndarray, demand: np.ndarray) -> float:
+    """Optimal cost of the full S x W transportation LP."""
+    suppliers, warehouses = cost.shape
+    result = linprog(
+        cost.ravel(),
+        A_ub=sparse.kron(sparse.identity(suppliers, format="csr"), np.ones((1, warehouses)), format="csr"),
+        b_ub=capacities,
+        A_eq=sparse.kron(np.ones((1, suppliers)), sparse.identity(warehouses, format="csr"), format="csr"),
+        b_eq=demand,
+        bounds=(0, None),
+        method="highs"
+    )
+    return result.fun
+
+
+def timed(repeats: int, fn):
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", default=["10x3", "100x20", "300x100", "500x300"],
+                        help="Instances as SUPPLIERSxWAREHOUSES")
+    parser.add_argument("--locations", nargs="+", type=int, default=[1, 5],
+                        help="Distinct supplier freight locations per instance")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--reference-max-variables", type=int, default=30000,
+                        help="Skip the full LP cost check above this many variables")
+    args = parser.parse_args()
+
+    print(f"{'suppliers':>10}{'warehouses':>12}{'locations':>11}{'method':>11}{'ms':>10}{'cost':>16}{'vs full LP':>12}")
+    for size in args.sizes:
+        suppliers, warehouses = (int(part) for part in size.lower().split("x"))
+        for locations in args.locations:
+            cost, capacities, demand = build_instance(suppliers, warehouses, locations)
+            try:
+                elapsed, plan = timed(args.repeats, lambda: allocate_award(cost, capacities, warehouse_demand=demand))
+            except AwardTooLarge as exc:
+                print(f"{suppliers:>10}{warehouses:>12}{locations:>11}  skipped: {exc}")
+                continue
+            allocation = plan["allocation"]
+            assert np.allclose(allocation.sum(axis=0), demand, atol=1e-6)
+            assert np.all(allocation.sum(axis=1) <= capacities + 1e-6)
+
+            gap = "-"
+            if suppliers * warehouses <= args.reference_max_variables:
+                gap = f"{(plan['total_cost'] / reference_cost(cost, capacities, demand) - 1) * 100:.4f}%"
+
+            print(f"{suppliers:>10}{warehouses:>12}{locations:>11}{plan['method']:>11}{elapsed * 1000:>10.2f}"
+                  f"{plan['total_cost']:>16,.0f}{gap:>12}")
+
+
+if __name__ == "__main__":
+    main()
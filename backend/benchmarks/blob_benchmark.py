@@ -0,0 +1,210 @@
+"""
+Blob Benchmark
+Builds a synthetic SQLite database with certifications, warehouse locations
+and negotiation strategies stored inline, as they were before the
+content-addressed blobs migration, then applies that migration and prints:
+
+- storage: inline column bytes vs blob bytes + digest references, and the
+  database file size after VACUUM, before and after;
+- read path: time to load requirement graphs and read every warehouse list
+  and negotiation strategy, inline vs blobs with a cold and a warm decode
+  cache.
+
+Only warehouse lists are blob-stored. Certifications move to link tables
+(migration 8), and negotiation strategies, unique per row since they became
+report documents, stay inline.
+
+Usage (from the backend directory):
+    python -m benchmarks.blob_benchmark --requirements 20000 --reads 2000
+    python -m benchmarks.blob_benchmark --strategy-format text   # rows written before structured reports
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from agents.negotiation_agent import NegotiationAgent
+from agents.scouting_agent import ScoutingAgent
+from models.blobs import decode_cache
+from models.database import Base
+from models.migrations import _006_content_addressed_blobs
+from services.cost_analysis import CostAnalysisService
+from services.report_templates import pack, render
+from services.requirement_loader import load_requirement_graph
+
+CATEGORIES = ["office supplies", "raw materials"]
+REQUIRED_CERTIFICATIONS = [[], ["ISO 9001"], ["ISO 9001", "ISO 14001"], ["ISO 27001"]]
+BLOB_COLUMNS = {
+    "cost_analyses": ("warehouse_locations", "warehouse_locations_digest"),
+}
+
+
+def build_database(path: str, requirements: int, strategy_format: str, seed: int = 42):
+    """Creates the schema and fills it with inline (pre-migration) values."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+
+    random.seed(seed)
+    scouting, negotiation = ScoutingAgent(), NegotiationAgent()
+    warehouses = json.dumps(CostAnalysisService().warehouse_locations)
+    now = datetime(2024, 1, 1)
+
+    requirement_rows, supplier_rows, analysis_rows, iteration_rows = [], [], [], []
+    supplier_id = 0
+    for requirement_id in range(1, requirements + 1):
+        category = random.choice(CATEGORIES)
+        requirement_rows.append((requirement_id, f"Requirement {requirement_id}", category, "SHORTLISTED", now))
+        for supplier in scouting._generate_suppliers_for_category(category, list(random.choice(REQUIRED_CERTIFICATIONS))):
+            supplier_id += 1
+            supplier_rows.append((supplier_id, requirement_id, supplier["name"],
+                                  json.dumps(supplier.get("certifications", [])), "SHORTLISTED"))
+            total_cost = random.uniform(5000, 150000)
+            analysis_rows.append((supplier_id, total_cost, warehouses, now))
+
+            current_cost, target_cost = total_cost, total_cost * 0.9
+            for number in range(1, random.randint(1, 3) + 1):
+                result = negotiation.negotiate({"id": supplier_id, "name": supplier["name"]}, current_cost, target_cost)
+                strategy = result["negotiation_strategy"]
+                iteration_rows.append((supplier_id, number, result["negotiated_cost"],
+                                       render(strategy) if strategy_format == "text" else pack(strategy),
+                                       result["outcome"], now))
+                current_cost = result["negotiated_cost"]
+                if result["outcome"] == "success":
+                    break
+
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO procurement_requirements (id, title, category, status, created_at, version) VALUES (?, ?, ?, ?, ?, 1)",
+        requirement_rows
+    )
+    conn.executemany(
+        "INSERT INTO suppliers (id, requirement_id, name, certifications, status) VALUES (?, ?, ?, ?, ?)",
+        supplier_rows
+    )
+    conn.executemany(
+        "INSERT INTO cost_analyses (supplier_id, total_cost, warehouse_locations, created_at) VALUES (?, ?, ?, ?)",
+        analysis_rows
+    )
+    conn.executemany(
+        "INSERT INTO negotiation_iterations (supplier_id, iteration_number, proposed_cost, negotiation_strategy, "
+        "outcome, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+        iteration_rows
+    )
+    # The loader finds each supplier's analysis through its latest_* pointer
+    conn.execute(
+        "UPDATE suppliers SET latest_cost_analysis_id = "
+        "(SELECT MAX(id) FROM cost_analyses WHERE cost_analyses.supplier_id = suppliers.id)"
+    )
+    conn.commit()
+    conn.close()
+    return {"requirements": len(requirement_rows), "suppliers": len(supplier_rows),
+            "cost_analyses": len(analysis_rows), "negotiation_iterations": len(iteration_rows)}
+
+
+def storage_report(path: str) -> dict:
+    conn = sqlite3.connect(path)
+    conn.execute("VACUUM")
+    report = {"file_bytes": os.path.getsize(path), "columns": {}}
+    for table, (text_column, digest_column) in BLOB_COLUMNS.items():
+        inline, references = conn.execute(
+            f"SELECT COALESCE(SUM(LENGTH({text_column})), 0), COALESCE(SUM(LENGTH({digest_column})), 0) FROM {table}"
+        ).fetchone()
+        report["columns"][table] = {"inline_bytes": inline, "digest_bytes": references}
+    report["blobs"] = conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) FROM blobs"
+    ).fetchone()
+    conn.close()
+    return report
+
+
+def read_requirements(path: str, requirement_ids: list, repeats: int, cold: bool = False) -> float:
+    """
+    Best-of-`repeats` seconds to load each requirement graph and read every
+    warehouse list and negotiation strategy in it. `cold` empties the decode cache before each run.
+    """
+    engine = create_engine(f"sqlite:///{path}")
+    Session = sessionmaker(bind=engine)
+    best = float("inf")
+    for _ in range(repeats):
+        if cold:
+            decode_cache.clear()
+        start = time.perf_counter()
+        with Session() as db:
+            for requirement_id in requirement_ids:
+                graph = load_requirement_graph(db, requirement_id)
+                for supplier in graph.suppliers:
+                    analysis = graph.cost_analyses.get(supplier.id)
+                    if analysis is not None:
+                        analysis.warehouse_locations
+                    for iteration in graph.iterations.get(supplier.id, []):
+                        iteration.negotiation_strategy
+                db.expunge_all()
+        best = min(best, time.perf_counter() - start)
+    engine.dispose()
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requirements", type=int, default=20000)
+    parser.add_argument("--reads", type=int, default=2000, help="requirement graphs loaded per read-path run")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--strategy-format", choices=["document", "text"], default="document")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="blob_benchmark_")
+    inline_path = os.path.join(workdir, "inline.db")
+    blob_path = os.path.join(workdir, "blobs.db")
+    try:
+        counts = build_database(inline_path, args.requirements, args.strategy_format)
+        print("Rows:", ", ".join(f"{table}={count}" for table, count in counts.items()))
+        shutil.copy(inline_path, blob_path)
+
+        engine = create_engine(f"sqlite:///{blob_path}")
+        start = time.perf_counter()
+        with engine.begin() as conn:
+            _006_content_addressed_blobs(conn)
+        migration_seconds = time.perf_counter() - start
+        engine.dispose()
+
+        before, after = storage_report(inline_path), storage_report(blob_path)
+        blob_count, blob_size, blob_bytes = after["blobs"]
+        inline_total = sum(column["inline_bytes"] for column in before["columns"].values())
+        reference_total = sum(column["digest_bytes"] for column in after["columns"].values())
+        print(f"\nMigration: {migration_seconds:.2f}s")
+        print(f"{'column':<46}{'inline bytes':>14}{'digest bytes':>14}")
+        for table, (text_column, _) in BLOB_COLUMNS.items():
+            print(f"{table + '.' + text_column:<46}{before['columns'][table]['inline_bytes']:>14,}"
+                  f"{after['columns'][table]['digest_bytes']:>14,}")
+        print(f"\nDistinct blobs: {blob_count:,} ({blob_size:,} bytes decoded, {blob_bytes:,} stored)")
+        print(f"Value bytes:    {inline_total:,} inline -> {reference_total + blob_bytes:,} "
+              f"({1 - (reference_total + blob_bytes) / max(inline_total, 1):.1%} saved)")
+        print(f"Database file:  {before['file_bytes']:,} -> {after['file_bytes']:,} bytes "
+              f"({1 - after['file_bytes'] / before['file_bytes']:.1%} saved)")
+
+        requirement_ids = random.Random(7).sample(range(1, counts["requirements"] + 1),
+                                                  min(args.reads, counts["requirements"]))
+        inline_seconds = read_requirements(inline_path, requirement_ids, args.repeats)
+        cold_seconds = read_requirements(blob_path, requirement_ids, args.repeats, cold=True)
+        cold_info = decode_cache.info()
+        warm_seconds = read_requirements(blob_path, requirement_ids, args.repeats)
+        print(f"\nRead path ({len(requirement_ids)} requirement graphs):")
+        print(f"  inline            {inline_seconds * 1000 / len(requirement_ids):8.3f} ms/graph")
+        print(f"  blobs, cold cache {cold_seconds * 1000 / len(requirement_ids):8.3f} ms/graph "
+              f"({cold_info['misses']} misses, {cold_info['hits']} hits)")
+        print(f"  blobs, warm cache {warm_seconds * 1000 / len(requirement_ids):8.3f} ms/graph")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
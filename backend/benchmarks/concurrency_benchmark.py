@@ -0,0 +1,166 @@
+"""
+Concurrency Benchmark
+Starts the API under uvicorn once in sync (threadpool) mode and once with
+ENABLE_ASYNC_DB=true, then drives both with the same number of concurrent
+clients and reports requests per second and latency percentiles.
+
+Clients read requirement details and the requirement list. With
+--outreach-share, that fraction of requests instead contacts a supplier
+(POST /api/suppliers/{id}/outreach), whose channel call waits
+--outreach-latency-ms (OUTREACH_SIMULATED_LATENCY_MS). Sync mode holds a
+threadpool thread for the whole wait; async mode awaits it off the event loop.
+
+Usage (from the backend directory, requires httpx):
+    python -m benchmarks.concurrency_benchmark --clients 200 --duration 15
+    python -m benchmarks.concurrency_benchmark --outreach-share 0.25 --outreach-latency-ms 200
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def start_server(db_path: str, port: int, async_mode: bool, outreach_latency_ms: float = 0) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{db_path}",
+        ENABLE_ASYNC_DB="true" if async_mode else "false",
+        OUTREACH_SIMULATED_LATENCY_MS=str(outreach_latency_ms),
+    )
+    env.pop("ASYNC_DATABASE_URL", None)
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env
+    )
+
+
+async def wait_until_ready(base_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start")
+
+
+async def seed(base_url: str, requirements: int) -> tuple:
+    """Creates and scouts `requirements` requirements; returns their ids and the ids of suppliers in scope."""
+    ids, jobs = [], []
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        for i in range(requirements):
+            response = await client.post("/api/requirements", json={
+                "title": f"Benchmark requirement {i}",
+                "description": "Benchmark load",
+                "category": "office supplies",
+                "quantity": 1000,
+                "unit": "units",
+                "required_certifications": ["ISO 9001"],
+            })
+            requirement_id = response.json()["id"]
+            job = await client.post(f"/api/requirements/{requirement_id}/scout")
+            ids.append(requirement_id)
+            jobs.append(job.json()["job_id"])
+        for job_id in jobs:
+            while (await client.get(f"/api/jobs/{job_id}")).json()["status"] not in ("completed", "failed"):
+                await asyncio.sleep(0.1)
+        supplier_ids = []
+        for requirement_id in ids:
+            detail = (await client.get(f"/api/requirements/{requirement_id}")).json()
+            supplier_ids += [supplier["id"] for supplier in detail["suppliers"] if supplier["availability_scope"]]
+    return ids, supplier_ids
+
+
+async def drive(base_url: str, requirement_ids: list, supplier_ids: list, clients: int, duration: float,
+                outreach_share: float = 0.0) -> dict:
+    latencies = []
+    errors = 0
+    stop_at = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        async def worker(worker_id: int):
+            nonlocal errors
+            rng = random.Random(worker_id)
+            n = worker_id
+            while time.monotonic() < stop_at:
+                n += 1
+                method = "GET"
+                if supplier_ids and rng.random() < outreach_share:
+                    method, path = "POST", f"/api/suppliers/{rng.choice(supplier_ids)}/outreach"
+                elif n % 4 == 0:
+                    path = "/api/requirements"
+                else:
+                    path = f"/api/requirements/{requirement_ids[n % len(requirement_ids)]}"
+                began = time.perf_counter()
+                try:
+                    response = await client.request(method, path)
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - began)
+
+        began = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(clients)))
+        elapsed = time.perf_counter() - began
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+async def run_mode(async_mode: bool, args) -> dict:
+    db_path = os.path.join(tempfile.mkdtemp(), "concurrency_benchmark.db")
+    port = args.port + (1 if async_mode else 0)
+    base_url = f"http://127.0.0.1:{port}"
+    server = start_server(db_path, port, async_mode, args.outreach_latency_ms)
+    try:
+        await wait_until_ready(base_url)
+        requirement_ids, supplier_ids = await seed(base_url, args.requirements)
+        await drive(base_url, requirement_ids, supplier_ids, args.clients, 2, args.outreach_share)  # warm-up
+        return await drive(base_url, requirement_ids, supplier_ids, args.clients, args.duration, args.outreach_share)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--requirements", type=int, default=20)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--outreach-share", type=float, default=0.0,
+                        help="fraction of requests that contact a supplier instead of reading")
+    parser.add_argument("--outreach-latency-ms", type=float, default=0.0,
+                        help="simulated channel round trip per contact")
+    args = parser.parse_args()
+
+    for label, async_mode in (("sync", False), ("async", True)):
+        result = asyncio.run(run_mode(async_mode, args))
+        print(
+            f"{label:>5}: {result['rps']:8.1f} req/s  p50 {result['p50_ms']:7.1f} ms  "
+            f"p95 {result['p95_ms']:7.1f} ms  ({result['requests']} requests, {result['errors']} errors)"
+        )
+
+
+if __name__ == "__main__":
+    main()
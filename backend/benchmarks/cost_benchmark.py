@@ -0,0 +1,64 @@
+"""
+Cost Analysis Benchmark
+Runs CostAnalysisService.analyze_cost once per (supplier, warehouse) pair, the
+way a portfolio review through /api/suppliers/{id}/cost-analysis would, and
+compares it with a single analyze_cost_batch call over the same synthetic
+suppliers and warehouses.
+
+Usage (from the backend directory):
+    python -m benchmarks.cost_benchmark --suppliers 5000 --warehouses 3
+"""
+import argparse
+import random
+import time
+
+from services.cost_analysis import CostAnalysisService
+
+CITIES = ["New York, NY", "Los Angeles, CA", "Chicago, IL", "Houston, TX", "Seattle, WA", "Unknown"]
+
+
+def build_inputs(service: CostAnalysisService, suppliers: int, warehouses: int, seed: int = 42):
+    rng = random.Random(seed)
+    supplier_rows = [{
+        "id": i + 1,
+        "name": f"Supplier {i + 1}",
+        "location": rng.choice(CITIES),
+        "proposed_price": rng.uniform(50, 1500),
+        "quantity": rng.randint(10, 1000)
+    } for i in range(suppliers)]
+    warehouse_rows = [
+        dict(service.warehouse_locations[i % len(service.warehouse_locations)],
+             id=i + 1, cost_factor=round(rng.uniform(0.9, 1.3), 2))
+        for i in range(warehouses)
+    ]
+    return supplier_rows, warehouse_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--suppliers", type=int, default=5000)
+    parser.add_argument("--warehouses", type=int, default=3)
+    args = parser.parse_args()
+
+    service = CostAnalysisService()
+    suppliers, warehouses = build_inputs(service, args.suppliers, args.warehouses)
+
+    start = time.perf_counter()
+    for supplier in suppliers:
+        for warehouse in warehouses:
+            service.analyze_cost(supplier, supplier["proposed_price"], supplier["quantity"], warehouse["location"])
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    portfolio = service.analyze_cost_batch(suppliers, warehouses)
+    batch_time = time.perf_counter() - start
+
+    pairs = args.suppliers * args.warehouses
+    print(f"{args.suppliers} suppliers x {args.warehouses} warehouses ({pairs} pairs)")
+    print(f"  analyze_cost per pair  {loop_time * 1000:10.2f} ms")
+    print(f"  analyze_cost_batch     {batch_time * 1000:10.2f} ms  ({loop_time / batch_time:.0f}x)")
+    print(f"  suppliers meeting expectations: {sum(r['meets_expectations'] for r in portfolio['results'])}")
+
+
+if __name__ == "__main__":
+    main()
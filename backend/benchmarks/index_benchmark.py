@@ -0,0 +1,154 @@
+"""
+Index Benchmark
+Builds a synthetic SQLite database (about one million rows by default), then
+prints EXPLAIN QUERY PLAN output and timings for the hot lookup queries before
+and after the composite-index migration.
+
+Usage (from the backend directory):
+    python -m benchmarks.index_benchmark --rows 1000000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+
+from models.database import Base
+from models.migrations import _002_hot_path_indexes
+
+HOT_QUERIES = {
+    "latest sample": (
+        "SELECT * FROM samples WHERE supplier_id = :supplier_id "
+        "ORDER BY received_date DESC LIMIT 1"
+    ),
+    "latest cost analysis": (
+        "SELECT * FROM cost_analyses WHERE supplier_id = :supplier_id "
+        "ORDER BY created_at DESC LIMIT 1"
+    ),
+    "negotiation iterations": (
+        "SELECT * FROM negotiation_iterations WHERE supplier_id = :supplier_id "
+        "ORDER BY iteration_number"
+    ),
+    "suppliers by status": (
+        "SELECT * FROM suppliers WHERE requirement_id = :requirement_id "
+        "AND status IN ('COST_ANALYZED', 'SHORTLISTED')"
+    ),
+    "shortlist by rank": (
+        "SELECT * FROM supplier_shortlists WHERE requirement_id = :requirement_id "
+        "ORDER BY rank"
+    ),
+}
+
+STATUSES = ["DISCOVERED", "CONTACTED", "SAMPLE_RECEIVED", "COST_ANALYZED", "SHORTLISTED"]
+
+
+def build_database(path: str, total_rows: int, seed: int = 42):
+    """Creates the schema without composite indexes and fills it with synthetic rows."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if len(index.expressions) > 1:
+                conn.execute(f"DROP INDEX IF EXISTS {index.name}")
+
+    # Split the row budget roughly like a busy deployment would.
+    n_suppliers = max(total_rows // 20, 10)
+    n_requirements = max(n_suppliers // 25, 1)
+    n_samples = total_rows * 35 // 100
+    n_analyses = total_rows * 35 // 100
+    n_iterations = total_rows * 20 // 100
+    n_shortlist = max(total_rows - n_suppliers - n_requirements - n_samples - n_analyses - n_iterations, 0)
+    start = datetime(2024, 1, 1)
+
+    conn.executemany(
+        "INSERT INTO procurement_requirements (id, title, status, created_at) VALUES (?, ?, 'SCOUTING', ?)",
+        ((i, f"Requirement {i}", start) for i in range(1, n_requirements + 1))
+    )
+    conn.executemany(
+        "INSERT INTO suppliers (id, requirement_id, name, status) VALUES (?, ?, ?, ?)",
+        ((i, rng.randint(1, n_requirements), f"Supplier {i}", rng.choice(STATUSES))
+         for i in range(1, n_suppliers + 1))
+    )
+    conn.executemany(
+        "INSERT INTO samples (supplier_id, received_date, quantity, price_quoted) VALUES (?, ?, 10, 100)",
+        ((rng.randint(1, n_suppliers), start + timedelta(minutes=rng.randint(0, 500000)))
+         for _ in range(n_samples))
+    )
+    conn.executemany(
+        "INSERT INTO cost_analyses (supplier_id, total_cost, created_at) VALUES (?, 1000, ?)",
+        ((rng.randint(1, n_suppliers), start + timedelta(minutes=rng.randint(0, 500000)))
+         for _ in range(n_analyses))
+    )
+    conn.executemany(
+        "INSERT INTO negotiation_iterations (supplier_id, iteration_number) VALUES (?, ?)",
+        ((rng.randint(1, n_suppliers), rng.randint(1, 3)) for _ in range(n_iterations))
+    )
+    conn.executemany(
+        "INSERT INTO supplier_shortlists (requirement_id, supplier_id, rank) VALUES (?, ?, ?)",
+        ((rng.randint(1, n_requirements), rng.randint(1, n_suppliers), rng.randint(1, 25))
+         for _ in range(n_shortlist))
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+    return n_suppliers, n_requirements
+
+
+def measure(path: str, n_suppliers: int, n_requirements: int, lookups: int) -> dict:
+    conn = sqlite3.connect(path)
+    rng = random.Random(7)
+    results = {}
+    for label, sql in HOT_QUERIES.items():
+        params = [
+            {"supplier_id": rng.randint(1, n_suppliers), "requirement_id": rng.randint(1, n_requirements)}
+            for _ in range(lookups)
+        ]
+        plan = [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params[0]).fetchall()]
+        began = time.perf_counter()
+        for p in params:
+            conn.execute(sql, p).fetchall()
+        elapsed_ms = (time.perf_counter() - began) * 1000 / lookups
+        results[label] = {"plan": plan, "ms_per_query": elapsed_ms}
+    conn.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--db", help="database file (default: temporary file)")
+    args = parser.parse_args()
+
+    path = args.db or os.path.join(tempfile.mkdtemp(), "index_benchmark.db")
+    print(f"Building {args.rows:,} rows in {path}...")
+    n_suppliers, n_requirements = build_database(path, args.rows)
+
+    before = measure(path, n_suppliers, n_requirements, args.lookups)
+
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        _002_hot_path_indexes(conn)
+        conn.exec_driver_sql("ANALYZE")
+    engine.dispose()
+
+    after = measure(path, n_suppliers, n_requirements, args.lookups)
+
+    for label in HOT_QUERIES:
+        b, a = before[label], after[label]
+        speedup = b["ms_per_query"] / a["ms_per_query"] if a["ms_per_query"] else float("inf")
+        print(f"\n{label}: {b['ms_per_query']:.3f} ms -> {a['ms_per_query']:.3f} ms ({speedup:.0f}x)")
+        print(f"  before: {' | '.join(b['plan'])}")
+        print(f"  after:  {' | '.join(a['plan'])}")
+
+
+if __name__ == "__main__":
+    main()
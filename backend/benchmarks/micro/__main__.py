@@ -0,0 +1,54 @@
+"""
+Microbenchmarks
+pytest-benchmark suite for the agent and service entry points
+(benchmarks/micro/bench_*.py), each over seeded inputs of 1 to 100k items.
+
+Usage (from the backend directory, requires pytest-benchmark):
+    # Record a baseline under benchmarks/micro/.baselines/<machine>/
+    python -m benchmarks.micro --save baseline
+    # Fail if any median is more than 10% slower than the latest saved run
+    python -m benchmarks.micro --check --threshold 10
+    # Quick run on small inputs; arguments after -- go to pytest
+    python -m benchmarks.micro --max-size 1000 -- -k negotiation
+
+Baselines are only comparable on the machine that recorded them; record one
+per CI runner (or per developer machine) before checking.
+"""
+import argparse
+import os
+import sys
+
+import pytest
+
+MICRO_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(os.path.dirname(MICRO_DIR))
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.micro", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--save", metavar="NAME", help="store this run as a baseline named NAME")
+    parser.add_argument("--check", nargs="?", const="", metavar="RUN",
+                        help="compare against saved run RUN (default: the latest) and fail on regressions")
+    parser.add_argument("--threshold", type=int, default=int(os.getenv("MICROBENCH_THRESHOLD_PERCENT", "10")),
+                        help="allowed median slowdown in percent for --check (default: %(default)s)")
+    parser.add_argument("--max-size", type=int, help="largest input size (default: 100000)")
+    args, pytest_args = parser.parse_known_args()
+    if pytest_args[:1] == ["--"]:
+        pytest_args = pytest_args[1:]
+
+    options = [MICRO_DIR, "-c", os.path.join(MICRO_DIR, "pytest.ini"), "--rootdir", BACKEND_DIR]
+    if args.max_size is not None:
+        options.append(f"--micro-max-size={args.max_size}")
+    if args.save:
+        options.append(f"--benchmark-save={args.save}")
+    if args.check is not None:
+        options.append(f"--benchmark-compare={args.check}" if args.check else "--benchmark-compare")
+        options.append(f"--benchmark-compare-fail=median:{args.threshold}%")
+
+    os.chdir(BACKEND_DIR)
+    sys.exit(pytest.main(options + pytest_args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+from agents.negotiation_agent import NegotiationAgent
+from agents.outreach_agent import OutreachAgent
+from agents.scouting_agent import ScoutingAgent
+
+from .conftest import run_seeded
+
+
+def bench_scouting_source_suppliers(benchmark, requirements, size):
+    agent = ScoutingAgent()
+
+    def source():
+        for requirement in requirements:
+            agent.source_suppliers(requirement["description"], requirement["required_certifications"],
+                                   requirement["category"])
+
+    run_seeded(benchmark, source, size)
+
+
+def bench_outreach_handle_supplier_contact(benchmark, suppliers, size):
+    agent = OutreachAgent()
+
+    def contact():
+        for supplier in suppliers:
+            agent.handle_supplier_contact(supplier, "Benchmark requirement", bool(supplier["phone"]))
+
+    run_seeded(benchmark, contact, size)
+
+
+def bench_outreach_manage_sampling_followups(benchmark, suppliers, size):
+    agent = OutreachAgent()
+
+    def follow_up():
+        for supplier in suppliers:
+            agent.manage_sampling_followups(supplier, "Benchmark requirement")
+
+    run_seeded(benchmark, follow_up, size)
+
+
+def bench_negotiation_negotiate(benchmark, suppliers, size):
+    agent = NegotiationAgent()
+
+    def negotiate():
+        for supplier in suppliers:
+            agent.negotiate(supplier, supplier["current_cost"], supplier["current_cost"] * 0.9)
+
+    run_seeded(benchmark, negotiate, size)
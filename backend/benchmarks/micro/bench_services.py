@@ -0,0 +1,42 @@
+from services.cost_analysis import CostAnalysisService
+from services.shortlist_service import ShortlistService
+from services.srm_service import SRMService
+from services.supplier_metrics import SupplierMetricsService
+
+from .conftest import CITIES, run_seeded
+
+
+def bench_cost_analyze_cost(benchmark, suppliers, size):
+    service = CostAnalysisService()
+
+    def analyze():
+        for i, supplier in enumerate(suppliers):
+            service.analyze_cost(supplier, supplier["proposed_price"], supplier["quantity"], CITIES[i % 3])
+
+    run_seeded(benchmark, analyze, size)
+
+
+def bench_shortlist_create_shortlist(benchmark, suppliers, size):
+    """One call over the whole candidate pool, as /shortlist does."""
+    service = ShortlistService()
+    run_seeded(benchmark, lambda: service.create_shortlist(suppliers), size)
+
+
+def bench_srm_analyze_srm(benchmark, suppliers, requirements, size):
+    service = SRMService()
+
+    def analyze():
+        for supplier, requirement in zip(suppliers, requirements):
+            service.analyze_srm(supplier, requirement)
+
+    run_seeded(benchmark, analyze, size)
+
+
+def bench_supplier_metrics_calculate(benchmark, suppliers, size):
+    service = SupplierMetricsService()
+
+    def calculate():
+        for supplier in suppliers:
+            service.calculate_supplier_metrics(supplier)
+
+    run_seeded(benchmark, calculate, size)
@@ -0,0 +1,87 @@
+"""
+Seeded inputs and sizes shared by the microbenchmarks.
+
+Every benchmark takes a `size` (1 to 100k inputs, capped with
+--micro-max-size) and runs through `run_seeded`, which reseeds the global
+`random` module before each round: the simulated agents draw from it, so
+every round does exactly the same work and medians are comparable between runs.
+"""
+import os
+import random
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+SEED = 42
+SIZES = [1, 100, 1_000, 10_000, 100_000]
+CATEGORIES = ["office supplies", "raw materials", "services", "electronics"]
+CERTIFICATIONS = ["ISO 9001", "ISO 14001", "ISO 27001", "OHSAS 18001", "CE"]
+CITIES = ["New York, NY", "Los Angeles, CA", "Chicago, IL", "Houston, TX", "Seattle, WA", "Unknown"]
+
+
+def pytest_addoption(parser):
+    parser.addoption("--micro-max-size", type=int, default=SIZES[-1],
+                     help="largest input size to benchmark (default: %(default)s)")
+
+
+def pytest_generate_tests(metafunc):
+    if "size" in metafunc.fixturenames:
+        max_size = metafunc.config.getoption("--micro-max-size")
+        metafunc.parametrize("size", [size for size in SIZES if size <= max_size])
+
+
+def rounds_for(size: int) -> int:
+    """Keeps each benchmark to a few seconds while small sizes still get enough rounds for a stable median."""
+    return max(3, min(100, 20_000 // size))
+
+
+def run_seeded(benchmark, target, size: int):
+    """Benchmarks `target()` with the global RNG reset to SEED before every round."""
+    return benchmark.pedantic(target, setup=lambda: random.seed(SEED), rounds=rounds_for(size),
+                              warmup_rounds=1 if size <= 1_000 else 0)
+
+
+def build_suppliers(size: int, seed: int = SEED) -> list:
+    """Supplier dicts carrying every field the agents and services read."""
+    rng = random.Random(seed)
+    return [{
+        "id": i + 1,
+        "name": f"Supplier {i + 1}",
+        "email": f"sales{i + 1}@supplier.example" if rng.random() < 0.8 else None,
+        "phone": f"+1-555-{rng.randint(1000, 9999)}" if rng.random() < 0.5 else None,
+        "location": rng.choice(CITIES),
+        "category": rng.choice(CATEGORIES),
+        "certifications": rng.sample(CERTIFICATIONS, rng.randint(0, 3)),
+        "quality_approved": rng.random() < 0.6,
+        "savings_percentage": rng.uniform(-15, 30),
+        "response_received": rng.random() < 0.9,
+        "proposed_price": rng.uniform(50, 1500),
+        "quantity": rng.randint(10, 1000),
+        "current_cost": rng.uniform(5_000, 150_000),
+    } for i in range(size)]
+
+
+def build_requirements(size: int, seed: int = SEED) -> list:
+    rng = random.Random(seed)
+    return [{
+        "id": i + 1,
+        "title": f"Requirement {i + 1}",
+        "description": f"Sourcing {rng.randint(100, 10_000)} units for requirement {i + 1}",
+        "category": rng.choice(CATEGORIES),
+        "quantity": rng.randint(100, 10_000),
+        "required_certifications": rng.sample(CERTIFICATIONS, rng.randint(0, 2)),
+    } for i in range(size)]
+
+
+@pytest.fixture
+def suppliers(size):
+    return build_suppliers(size)
+
+
+@pytest.fixture
+def requirements(size):
+    return build_requirements(size)
@@ -0,0 +1,196 @@
+"""
+Serialization Benchmark
+Measures how long it takes to turn the requirement detail payload into JSON
+bytes for a requirement with many suppliers. Every supplier has a reviewed
+sample, a cost analysis and three negotiation iterations with strategy
+documents, and is on the shortlist.
+
+Two tables are printed:
+
+- Serializers: the same payload encoded by each path FastAPI can take.
+    - jsonable_encoder + json: the default for dict-returning endpoints.
+    - response_model validate + json: the default when a response model is
+      declared.
+    - stdlib json: what get_requirement used before.
+    - orjson: FastJSONResponse, for endpoints without a response model.
+    - response_model trim + orjson: FastJSONRoute / dumps_as, what
+      get_requirement uses.
+    - response_model validate + orjson: the same with RESPONSE_VALIDATION=true.
+- Endpoint: GET /api/requirements/{id} end to end (TestClient, payload cache
+  off), once with each serializer swapped in for the handler's dumps_as().
+
+Each row reports CPU time (process_time) and wall-clock p50/p95 per call.
+
+Usage (from the backend directory):
+    python -m benchmarks.serialization_benchmark --suppliers 500 --iterations 30
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(q / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def seed_requirement(supplier_count: int) -> int:
+    """One shortlisted requirement whose suppliers carry every nested detail the endpoint returns."""
+    from agents.negotiation_agent import NegotiationAgent
+    from models.database import SessionLocal
+    from models.procurement import (
+        ProcurementRequirement, Supplier, Sample, CostAnalysis, NegotiationIteration, SupplierShortlist,
+        RequirementStatus, SupplierStatus
+    )
+    from services.report_templates import pack
+
+    rng = random.Random(42)
+    negotiation = NegotiationAgent()
+    now = datetime.utcnow()
+    with SessionLocal() as db:
+        requirement = ProcurementRequirement(
+            title="Serialization benchmark", description="Requirement with a large supplier graph",
+            category="office supplies", quantity=10000, unit="units",
+            required_certifications=["ISO 9001", "ISO 14001"], status=RequirementStatus.SHORTLISTED
+        )
+        db.add(requirement)
+        for i in range(supplier_count):
+            supplier = Supplier(
+                requirement=requirement, name=f"Supplier {i}", email=f"sales{i}@example.com",
+                company=f"Supplier {i} Ltd", website=f"https://supplier{i}.example.com", phone="+1-555-0100",
+                certifications=["ISO 9001", "ISO 14001", "FSC Certified"][:rng.randint(1, 3)],
+                availability_scope=True, selected_for_outreach=True, status=SupplierStatus.SHORTLISTED,
+                experience_years=rng.randint(2, 30), quality_rating=round(rng.uniform(3, 5), 1),
+                delivery_reliability=round(rng.uniform(80, 99), 1),
+                price_competitiveness=round(rng.uniform(50, 95), 1), overall_score=round(rng.uniform(50, 95), 1),
+                contact_method="email", last_contacted=now,
+                notes="Responded to outreach | Sample requested | Onboarding initiated | Risk: Low"
+            )
+            total_cost = rng.uniform(5000, 150000)
+            db.add_all([
+                supplier,
+                Sample(supplier=supplier, received_date=now, quantity=100, address="Main Warehouse, New York, NY",
+                       price_quoted=rng.uniform(500, 5000), quality_approved=True,
+                       quality_notes="Meets specification; packaging acceptable", quality_reviewed_by="qa",
+                       quality_reviewed_at=now),
+                CostAnalysis(supplier=supplier, current_supplier_cost=total_cost * 1.1, proposed_cost=total_cost,
+                             total_cost=total_cost, savings=total_cost * 0.1, savings_percentage=10.0,
+                             meets_expectations=True),
+                SupplierShortlist(requirement=requirement, supplier=supplier, rank=i + 1,
+                                  integrated_score=rng.uniform(50, 95), cost_score=rng.uniform(50, 95),
+                                  quality_score=rng.uniform(50, 95),
+                                  recommendation="Recommended: strong balance of cost and quality"),
+            ])
+            cost = total_cost
+            for number in range(1, 4):
+                result = negotiation.negotiate({"id": i, "name": supplier.name}, cost, total_cost * 0.9)
+                cost = result["negotiated_cost"]
+                db.add(NegotiationIteration(
+                    supplier=supplier, iteration_number=number, proposed_cost=cost, target_cost=total_cost * 0.9,
+                    negotiation_strategy=pack(result["negotiation_strategy"]), outcome=result["outcome"],
+                    notes=result["notes"]
+                ))
+        db.commit()
+        return requirement.id
+
+
+def measure(call, iterations: int, warmup: int) -> dict:
+    for _ in range(warmup):
+        call()
+    walls, cpus = [], []
+    for _ in range(iterations):
+        cpu, wall = time.process_time(), time.perf_counter()
+        call()
+        walls.append(time.perf_counter() - wall)
+        cpus.append(time.process_time() - cpu)
+    walls.sort()
+    return {
+        "cpu_ms": statistics.mean(cpus) * 1000,
+        "p50_ms": percentile(walls, 50) * 1000,
+        "p95_ms": percentile(walls, 95) * 1000,
+    }
+
+
+def print_table(title: str, rows: dict, baseline: str):
+    print(f"\n{title}")
+    print(f"  {'':<36}{'CPU ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'vs ' + baseline:>18}")
+    for name, row in rows.items():
+        ratio = rows[baseline]["cpu_ms"] / row["cpu_ms"] if row["cpu_ms"] else float("inf")
+        print(f"  {name:<36}{row['cpu_ms']:>10.2f}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}"
+              f"{ratio:>17.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--suppliers", type=int, default=500)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--render", action="store_true", help="request rendered report texts (?render=true)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="serialization_benchmark_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'benchmark.db')}"
+    # Every request has to build and serialize the payload
+    os.environ["PAYLOAD_CACHE_BACKEND"] = "none"
+    sys.path.insert(0, BACKEND_DIR)
+
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from fastapi.testclient import TestClient
+    from pydantic import TypeAdapter
+
+    import main as app_module
+    from models.schemas import RequirementDetail
+    from services.responses import FastJSONResponse, dumps, dumps_as
+
+    requirement_id = seed_requirement(args.suppliers)
+    client = TestClient(app_module.app)
+    url = f"/api/requirements/{requirement_id}" + ("?render=true" if args.render else "")
+    body = client.get(url).content
+    payload = json.loads(body)
+    print(f"Payload: {args.suppliers} suppliers, {len(body):,} bytes")
+
+    detail = TypeAdapter(RequirementDetail)
+    serializers = {
+        "jsonable_encoder + json": lambda content: JSONResponse(jsonable_encoder(content)).body,
+        "response_model validate + json": lambda content: JSONResponse(
+            detail.dump_python(detail.validate_python(content), mode="json")).body,
+        "stdlib json": lambda content: JSONResponse(content).body,
+        "orjson (FastJSONResponse)": lambda content: FastJSONResponse(content).body,
+        "response_model trim + orjson": lambda content: dumps_as(RequirementDetail, content),
+        "response_model validate + orjson": lambda content: dumps(
+            detail.dump_python(detail.validate_python(content))),
+    }
+    print_table(
+        "Serializers (payload -> bytes)",
+        {name: measure(lambda: serialize(payload), args.iterations, args.warmup)
+         for name, serialize in serializers.items()},
+        baseline="stdlib json"
+    )
+
+    endpoint = {}
+    original = app_module.dumps_as
+    try:
+        for name, serialize in serializers.items():
+            if name == "response_model validate + json":
+                continue
+            app_module.dumps_as = lambda response_model, content, serialize=serialize: serialize(content)
+            endpoint[name] = measure(lambda: client.get(url), args.iterations, args.warmup)
+    finally:
+        app_module.dumps_as = original
+    print_table(f"Endpoint (GET {url})", endpoint, baseline="stdlib json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Shortlist Benchmark
+Scores a synthetic candidate pool with ShortlistService.create_shortlist (one
+dict per supplier, full sort) and with create_shortlist_batch (NumPy columns,
+argpartition top-k), checks that both return the same top k, and prints the
+timings.
+
+Usage (from the backend directory):
+    python -m benchmarks.shortlist_benchmark --candidates 50000 --k 10
+"""
+import argparse
+import random
+import time
+
+from services.shortlist_service import ShortlistService
+
+
+def build_candidates(count: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    return [{
+        "id": i + 1,
+        "name": f"Supplier {i + 1}",
+        "quality_approved": rng.random() < 0.6,
+        "certifications": ["ISO 9001"] * rng.randint(0, 5),
+        "savings_percentage": rng.uniform(-15, 30),
+        "response_received": rng.random() < 0.9
+    } for i in range(count)]
+
+
+def best_of(repeats: int, fn):
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=50000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    service = ShortlistService()
+    candidates = build_candidates(args.candidates)
+    columns = (
+        [c["id"] for c in candidates],
+        [c["savings_percentage"] for c in candidates],
+        [c["quality_approved"] for c in candidates],
+        [len(c["certifications"]) for c in candidates],
+        [c["response_received"] for c in candidates],
+    )
+    names = [c["name"] for c in candidates]
+
+    scalar_time, scalar = best_of(args.repeats, lambda: service.create_shortlist(candidates)[:args.k])
+    batch_time, batch = best_of(
+        args.repeats, lambda: service.create_shortlist_batch(*columns, k=args.k, supplier_names=names)
+    )
+
+    print(f"{args.candidates} candidates, top {args.k} (best of {args.repeats})")
+    print(f"  create_shortlist        {scalar_time * 1000:9.2f} ms")
+    print(f"  create_shortlist_batch  {batch_time * 1000:9.2f} ms  ({scalar_time / batch_time:.1f}x)")
+    print(f"  same top {args.k}: {scalar == batch}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""
+Workflow Benchmark
+Drives the full procurement lifecycle through the FastAPI app in-process
+(httpx ASGI transport, no server): create requirement, scout (queued job),
+select suppliers, create samples, quality review (with the automatic cost
+analysis and negotiation), shortlist and onboard, reading the requirement
+detail between steps as the UI does.
+
+Workflows run at a configurable concurrency against a fresh SQLite database
+pre-filled with a configurable number of completed requirements. Prints
+p50/p95/p99 latency and SQL statements per call for every endpoint and
+writes the results as JSON; pass an earlier results file with --compare to
+print the differences (e.g. between two commits).
+
+Usage (from the backend directory, requires httpx):
+    python -m benchmarks.workflow_benchmark --workflows 50 --concurrency 8 --database-size 2000
+    python -m benchmarks.workflow_benchmark --output after.json --compare before.json
+"""
+import argparse
+import asyncio
+import contextvars
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Label of the endpoint a statement runs for; copied into the threadpool with the request context
+current_step = contextvars.ContextVar("current_step", default=None)
+# Statements issued by the scouting pipeline's worker threads
+JOB_STEP = "scouting job (worker)"
+
+SEED_CATEGORIES = ["office supplies", "raw materials"]
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(q / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class Recorder:
+    """Latencies per step (recorded by the client) and SQL statements per step (counted on the engine)."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statements = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def count_statement(self, *args, **kwargs):
+        step = current_step.get()
+        if step is None and threading.current_thread().name.startswith("pipeline-job"):
+            step = JOB_STEP
+        with self._lock:
+            self.statements[step or "(other)"] += 1
+
+    def summary(self) -> dict:
+        steps = {}
+        for step in sorted(set(self.latencies) | set(self.statements)):
+            values = sorted(self.latencies.get(step, []))
+            calls = len(values)
+            steps[step] = {
+                "calls": calls,
+                "errors": self.errors.get(step, 0),
+                "p50_ms": round(percentile(values, 50) * 1000, 3),
+                "p95_ms": round(percentile(values, 95) * 1000, 3),
+                "p99_ms": round(percentile(values, 99) * 1000, 3),
+                "mean_ms": round(sum(values) / calls * 1000, 3) if calls else 0.0,
+                "max_ms": round(values[-1] * 1000, 3) if calls else 0.0,
+                "sql_statements": self.statements.get(step, 0),
+                "sql_per_call": round(self.statements[step] / calls, 2) if calls and step in self.statements else None,
+            }
+        return steps
+
+
+def seed_database(size: int, batch_size: int = 200):
+    """
+    Adds `size` shortlisted requirements with suppliers, approved samples and
+    cost analyses through the ORM, so flush listeners (version, blobs, status
+    counts, supplier snapshots) keep derived tables consistent.
+    """
+    from agents.scouting_agent import ScoutingAgent
+    from models.database import SessionLocal
+    from models.procurement import (
+        ProcurementRequirement, Supplier, Sample, CostAnalysis, RequirementStatus, SupplierStatus
+    )
+
+    rng = random.Random(42)
+    scouting = ScoutingAgent()
+    now = datetime.utcnow()
+    for start in range(0, size, batch_size):
+        with SessionLocal() as db:
+            for i in range(start, min(start + batch_size, size)):
+                category = rng.choice(SEED_CATEGORIES)
+                requirement = ProcurementRequirement(
+                    title=f"Seeded requirement {i}", description="Benchmark seed data", category=category,
+                    quantity=rng.randint(100, 5000), unit="units", required_certifications=["ISO 9001"],
+                    status=RequirementStatus.SHORTLISTED
+                )
+                db.add(requirement)
+                for supplier_data in scouting._generate_suppliers_for_category(category, ["ISO 9001"]):
+                    supplier = Supplier(
+                        requirement=requirement, name=supplier_data["name"], email=supplier_data.get("email"),
+                        certifications=supplier_data.get("certifications", []),
+                        availability_scope=True, selected_for_outreach=True,
+                        status=SupplierStatus.COST_ANALYZED, overall_score=rng.uniform(50, 95)
+                    )
+                    total_cost = rng.uniform(5000, 150000)
+                    db.add_all([
+                        supplier,
+                        Sample(supplier=supplier, received_date=now, quantity=10, address="Seed",
+                               price_quoted=rng.uniform(5, 50), quality_approved=True),
+                        CostAnalysis(supplier=supplier, current_supplier_cost=total_cost * 1.1,
+                                     proposed_cost=total_cost, total_cost=total_cost,
+                                     savings=total_cost * 0.1, savings_percentage=10.0, meets_expectations=True),
+                    ])
+            db.commit()
+
+
+async def run_workflow(client, recorder: Recorder, index: int, job_poll_interval: float):
+    async def call(step: str, method: str, url: str, **kwargs):
+        token = current_step.set(step)
+        began = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        finally:
+            recorder.latencies[step].append(time.perf_counter() - began)
+            current_step.reset(token)
+        if response.status_code >= 400:
+            recorder.errors[step] += 1
+            raise RuntimeError(f"{method} {url} -> {response.status_code}: {response.text[:200]}")
+        return response.json()
+
+    requirement = await call("POST /api/requirements", "POST", "/api/requirements", json={
+        "title": f"Benchmark workflow {index}",
+        "description": "End-to-end workflow benchmark",
+        "category": "office supplies",
+        "quantity": 1000,
+        "unit": "units",
+        "required_certifications": ["ISO 9001"],
+    })
+    requirement_id = requirement["id"]
+    detail_url = f"/api/requirements/{requirement_id}"
+
+    scouting_began = time.perf_counter()
+    job = await call("POST /api/requirements/{id}/scout", "POST", f"{detail_url}/scout")
+    while job["status"] in ("queued", "running"):
+        await asyncio.sleep(job_poll_interval)
+        job = await call("GET /api/jobs/{id}", "GET", f"/api/jobs/{job['job_id']}")
+    recorder.latencies["scouting job (end to end)"].append(time.perf_counter() - scouting_began)
+    if job["status"] != "completed":
+        recorder.errors["scouting job (end to end)"] += 1
+        raise RuntimeError(f"Scouting job failed: {job.get('error')}")
+
+    detail = await call("GET /api/requirements/{id}", "GET", detail_url)
+    available = [s["id"] for s in detail["suppliers"] if s["availability_scope"]]
+    await call("POST /api/requirements/{id}/select-suppliers", "POST", f"{detail_url}/select-suppliers",
+               json={"supplier_ids": available})
+
+    detail = await call("GET /api/requirements/{id}", "GET", detail_url)
+    for supplier in detail["suppliers"]:
+        if supplier["selected_for_outreach"] and not supplier["sample"]:
+            await call("POST /api/samples", "POST", "/api/samples", json={
+                "supplier_id": supplier["id"], "quantity": 10, "address": "Benchmark warehouse",
+                "price_quoted": 25.0
+            })
+
+    detail = await call("GET /api/requirements/{id}", "GET", detail_url)
+    for supplier in detail["suppliers"]:
+        sample = supplier["sample"]
+        if sample and sample["quality_approved"] is None:
+            await call("POST /api/samples/{id}/quality-review", "POST", f"/api/samples/{sample['id']}/quality-review",
+                       json={"sample_id": sample["id"], "quality_approved": True,
+                             "quality_notes": "Meets specification", "reviewed_by": "benchmark"})
+
+    shortlist = await call("POST /api/requirements/{id}/shortlist", "POST", f"{detail_url}/shortlist")
+    if shortlist["shortlist"]:
+        top = shortlist["shortlist"][0]
+        await call("POST /api/suppliers/{id}/onboard", "POST", f"/api/suppliers/{top['supplier_id']}/onboard")
+    await call("GET /api/requirements/{id}", "GET", detail_url)
+
+
+async def drive(args, recorder: Recorder) -> dict:
+    import httpx
+    from main import app
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    failures = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=120) as client:
+        async def one(index: int):
+            async with semaphore:
+                try:
+                    await run_workflow(client, recorder, index, args.job_poll_interval)
+                except Exception as exc:
+                    failures.append(str(exc))
+
+        began = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(args.workflows)))
+        elapsed = time.perf_counter() - began
+    return {"elapsed_seconds": round(elapsed, 3), "failed_workflows": len(failures),
+            "workflows_per_second": round((args.workflows - len(failures)) / elapsed, 3),
+            "failures": failures[:10]}
+
+
+def git_revision() -> dict:
+    def git(*command):
+        try:
+            return subprocess.run(["git", *command], cwd=BACKEND_DIR, capture_output=True, text=True,
+                                  check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+    return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def print_results(results: dict, baseline: dict = None):
+    print(f"\n{results['run']['workflows']} workflows, concurrency {results['run']['concurrency']}, "
+          f"database size {results['run']['database_size']} ({results['run']['db_mode']} mode): "
+          f"{results['totals']['elapsed_seconds']:.2f}s, {results['totals']['workflows_per_second']:.2f} workflows/s, "
+          f"{results['totals']['failed_workflows']} failed")
+    header = f"{'endpoint':<46}{'calls':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'SQL/call':>10}"
+    if baseline:
+        header += f"{'p50 delta':>11}{'SQL delta':>11}"
+    print(header)
+    for step, stats in results["steps"].items():
+        sql = "-" if stats["sql_per_call"] is None else f"{stats['sql_per_call']:.1f}"
+        if stats["calls"] == 0:
+            sql = f"{stats['sql_statements']} total"
+        line = (f"{step:<46}{stats['calls']:>7}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}"
+                f"{stats['p99_ms']:>10.2f}{sql:>10}")
+        previous = (baseline or {}).get("steps", {}).get(step)
+        if previous:
+            if previous["p50_ms"]:
+                line += f"{(stats['p50_ms'] - previous['p50_ms']) / previous['p50_ms']:>+11.1%}"
+            else:
+                line += f"{'':>11}"
+            if stats["sql_per_call"] is not None and previous.get("sql_per_call") is not None:
+                line += f"{stats['sql_per_call'] - previous['sql_per_call']:>+11.1f}"
+        print(line)
+    if results["totals"]["failures"]:
+        print("\nFirst failures:")
+        for failure in results["totals"]["failures"]:
+            print(f"  {failure}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workflows", type=int, default=50, help="complete lifecycles to run")
+    parser.add_argument("--concurrency", type=int, default=8, help="workflows in flight at once")
+    parser.add_argument("--database-size", type=int, default=1000,
+                        help="completed requirements seeded before the run")
+    parser.add_argument("--warmup", type=int, default=2, help="workflows run (and discarded) before measuring")
+    parser.add_argument("--job-poll-interval", type=float, default=0.02)
+    parser.add_argument("--async-db", action="store_true", help="serve with ENABLE_ASYNC_DB=true")
+    parser.add_argument("--output", default="workflow_benchmark.json")
+    parser.add_argument("--compare", help="earlier results file to diff against")
+    args = parser.parse_args()
+
+    # The app reads its configuration at import time
+    workdir = tempfile.mkdtemp(prefix="workflow_benchmark_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'benchmark.db')}"
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    os.environ["ENABLE_ASYNC_DB"] = "true" if args.async_db else "false"
+    sys.path.insert(0, BACKEND_DIR)
+
+    from sqlalchemy import event
+    from models.database import engine, async_engine
+    from services.job_runner import job_runner
+    import main as app_module  # noqa: F401  (creates the schema)
+
+    began = time.perf_counter()
+    seed_database(args.database_size)
+    seed_seconds = time.perf_counter() - began
+    print(f"Seeded {args.database_size} requirements in {seed_seconds:.1f}s")
+
+    if args.warmup:
+        asyncio.run(drive(argparse.Namespace(**{**vars(args), "workflows": args.warmup}), Recorder()))
+
+    recorder = Recorder()
+    # Async mode serves requests from async_engine; pipeline jobs still use engine
+    engines = [engine] + ([async_engine.sync_engine] if async_engine is not None else [])
+    for counted in engines:
+        event.listen(counted, "before_cursor_execute", recorder.count_statement)
+    try:
+        totals = asyncio.run(drive(args, recorder))
+    finally:
+        for counted in engines:
+            event.remove(counted, "before_cursor_execute", recorder.count_statement)
+        job_runner.shutdown(wait=True)
+
+    results = {
+        "run": {
+            "workflows": args.workflows,
+            "concurrency": args.concurrency,
+            "database_size": args.database_size,
+            "db_mode": "async" if args.async_db else "sync",
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "python": platform.python_version(),
+            **git_revision(),
+        },
+        "totals": {**totals, "seed_seconds": round(seed_seconds, 3)},
+        "steps": recorder.summary(),
+    }
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
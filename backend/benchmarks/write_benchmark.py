@@ -0,0 +1,137 @@
+"""
+Write Benchmark
+Measures commit throughput against a fresh SQLite file for each engine profile
+("default" = driver defaults, "tuned" = WAL / synchronous=NORMAL / mmap / cache
+pragmas from models/database.py). Writer threads commit small transactions,
+similar to the per-step commits of the workflow endpoints, while reader
+threads keep querying the same tables.
+
+Usage (from the backend directory):
+    python -m benchmarks.write_benchmark --transactions 2000 --writers 4 --readers 2
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from models.database import Base, create_profiled_engine
+from models.procurement import ProcurementRequirement, Supplier, Sample, SupplierStatus
+
+PROFILES = ["default", "tuned"]
+
+
+def run_profile(profile: str, transactions: int, writers: int, readers: int) -> dict:
+    tmpdir = tempfile.mkdtemp(prefix=f"write-bench-{profile}-")
+    engine = create_profiled_engine(f"sqlite:///{os.path.join(tmpdir, 'bench.db')}", profile)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    with Session() as db:
+        requirement = ProcurementRequirement(title="Write benchmark", quantity=1)
+        db.add(requirement)
+        db.commit()
+        requirement_id = requirement.id
+
+    latencies, errors, reads = [], [0], [0]
+    lock = threading.Lock()
+    done = threading.Event()
+    per_writer = transactions // writers
+
+    def writer(worker: int):
+        with Session() as db:
+            for i in range(per_writer):
+                start = time.perf_counter()
+                try:
+                    supplier = Supplier(
+                        requirement_id=requirement_id,
+                        name=f"Supplier {worker}-{i}",
+                        status=SupplierStatus.CONTACTED
+                    )
+                    db.add(supplier)
+                    db.flush()
+                    db.add(Sample(supplier_id=supplier.id, quantity=1, price_quoted=10.0))
+                    db.commit()
+                except OperationalError:
+                    db.rollback()
+                    with lock:
+                        errors[0] += 1
+                    continue
+                elapsed = time.perf_counter() - start
+                with lock:
+                    latencies.append(elapsed)
+
+    def reader():
+        with Session() as db:
+            while not done.is_set():
+                try:
+                    db.execute(
+                        select(Supplier.status, func.count())
+                        .where(Supplier.requirement_id == requirement_id)
+                        .group_by(Supplier.status)
+                    ).all()
+                    db.rollback()
+                    reads[0] += 1
+                except OperationalError:
+                    db.rollback()
+                    with lock:
+                        errors[0] += 1
+
+    reader_threads = [threading.Thread(target=reader) for _ in range(readers)]
+    writer_threads = [threading.Thread(target=writer, args=(w,)) for w in range(writers)]
+    for thread in reader_threads:
+        thread.start()
+
+    started = time.perf_counter()
+    for thread in writer_threads:
+        thread.start()
+    for thread in writer_threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    done.set()
+    for thread in reader_threads:
+        thread.join()
+
+    with engine.connect() as conn:
+        journal_mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+        synchronous = conn.exec_driver_sql("PRAGMA synchronous").scalar()
+    engine.dispose()
+
+    latencies.sort()
+    return {
+        "profile": profile,
+        "journal_mode": journal_mode,
+        "synchronous": synchronous,
+        "commits": len(latencies),
+        "errors": errors[0],
+        "reads": reads[0],
+        "commits_per_second": len(latencies) / wall if wall else 0.0,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transactions", type=int, default=2000)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=2)
+    parser.add_argument("--profiles", nargs="+", choices=PROFILES, default=PROFILES)
+    args = parser.parse_args()
+
+    print(f"{args.transactions} transactions, {args.writers} writer(s), {args.readers} reader(s)\n")
+    print(f"{'profile':<10}{'journal':<10}{'sync':>5}{'commits/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'reads':>9}{'errors':>8}")
+    for profile in args.profiles:
+        r = run_profile(profile, args.transactions, args.writers, args.readers)
+        print(f"{r['profile']:<10}{r['journal_mode']:<10}{r['synchronous']:>5}{r['commits_per_second']:>12.1f}"
+              f"{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['reads']:>9}{r['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
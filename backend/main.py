@@ -3,16 +3,27 @@ Main FastAPI application for Procurement Demo
 Implements the fully autonomous sourcing agent workflow
 """
 import os
-from fastapi import FastAPI, HTTPException, Depends
+import asyncio
+import inspect
+from fastapi import FastAPI, HTTPException, Depends, Header, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from pydantic import BaseModel
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
 from datetime import datetime
 import json
 import random
+from functools import partial
 
-from models.database import engine, SessionLocal, Base
+from models.database import engine, async_engine, SessionLocal, Base, AsyncSessionLocal, ENABLE_ASYNC_DB
+from models.migrations import run_migrations
+from models.jobs import PipelineJob
+from models.blobs import decode_cache
+from models.certifications import replace_certifications, supplier_certifications
 from models.procurement import (
     ProcurementRequirement, Supplier, Sample, CostAnalysis, SupplierShortlist,
     NegotiationIteration, RequirementStatus, SupplierStatus
@@ -22,16 +33,44 @@ from agents.outreach_agent import OutreachAgent
 from agents.negotiation_agent import NegotiationAgent
 from services.cost_analysis import CostAnalysisService
 from services.shortlist_service import ShortlistService
+from services.shortlist_engine import ShortlistEngine
 from services.srm_service import SRMService
 from services.supplier_metrics import SupplierMetricsService
+from services.requirement_loader import load_requirement_graph
+from services.requirement_listing import list_requirements_page, InvalidCursor
+from services.certification_search import search_suppliers_by_certifications
+from services.job_runner import job_runner, JobContext, serialize_job
+from services.outreach_dispatcher import OutreachDispatcher
+from services.db_maintenance import MaintenanceScheduler
+from services.award_optimizer import allocate_award, AwardInfeasible, AwardTooLarge
+from services.supplier_snapshot import record_latest_samples
+from services.requirement_version import current_version, etag_matches, requirement_etag
+from services.payload_cache import payload_cache
+from services.requirement_events import event_bus, record_event
+from services.report_templates import pack, render_cache_info, report_payload
+from services.metrics import MetricsMiddleware, instrument, instrument_engine, registry
+from services.query_inspector import QueryInspectorMiddleware, inspect_engine
+from services.responses import FastJSONResponse, FastJSONRoute, dumps_as
+from services.offload import offload, on_event_loop, run_blocking
+from models.schemas import (
+    Message, RequirementCreated, Job, JobQueued, SupplierSelectionResult, OutreachResult, SamplingFollowup,
+    SampleReceived, QualityReviewResult, CostAnalysisResult, NegotiationResult, NegotiationHistory,
+    ShortlistResult, OnboardingResult, AwardPlan, RequirementDetail, CacheStats, RequirementPage,
+    CostPortfolio, CategoryShortlist, SupplierSearchPage
+)
 
 # Note: All AI agents and services use simulated AI responses for demo purposes
 # No real AI/OpenAI API calls are made
 
-# Create database tables
+# Create database tables and apply pending schema migrations
 Base.metadata.create_all(bind=engine)
+run_migrations(engine)
+
+db_maintenance = MaintenanceScheduler(engine)
 
-app = FastAPI(title="Procurement Demo API", version="1.0.0")
+app = FastAPI(title="Procurement Demo API", version="1.0.0", default_response_class=FastJSONResponse)
+# Endpoint return values are trimmed to their response model and written by orjson (no jsonable_encoder / response validation)
+app.router.route_class = FastJSONRoute
 
 # CORS middleware
 # Configure CORS origins with sensible defaults and optional overrides
@@ -59,8 +98,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Cross-origin clients need to read ETag to send If-None-Match
+    expose_headers=["ETag"],
 )
 
+# Per-route latency / size / SQL metrics, served at /metrics
+app.add_middleware(MetricsMiddleware)
+instrument_engine(engine)
+if async_engine is not None:
+    instrument_engine(async_engine.sync_engine)
+
+# Repeated-statement (N+1) and slow-query reports; off unless QUERY_INSPECTOR / SLOW_QUERY_MS are set
+app.add_middleware(QueryInspectorMiddleware)
+inspect_engine(engine)
+if async_engine is not None:
+    inspect_engine(async_engine.sync_engine)
+
 # Dependency to get DB session
 def get_db():
     db = SessionLocal()
@@ -70,6 +123,39 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def db_endpoint(handler):
+    """
+    Leaves `handler` as a sync threadpool endpoint by default. With
+    ENABLE_ASYNC_DB it becomes an async endpoint that receives an AsyncSession
+    and runs the handler body through AsyncSession.run_sync, so database I/O is
+    awaited on the event loop instead of holding a threadpool thread. The body
+    itself runs on the loop; agent / service calls and other blocking steps go
+    through services.offload to a worker thread.
+    """
+    if not ENABLE_ASYNC_DB:
+        return handler
+
+    signature = inspect.signature(handler)
+    parameters = [
+        param.replace(annotation=AsyncSession, default=Depends(get_async_db)) if name == "db" else param
+        for name, param in signature.parameters.items()
+    ]
+
+    async def async_handler(**kwargs):
+        db = kwargs.pop("db")
+        return await db.run_sync(lambda session: on_event_loop(handler, db=session, **kwargs))
+
+    async_handler.__name__ = handler.__name__
+    async_handler.__doc__ = handler.__doc__
+    async_handler.__signature__ = signature.replace(parameters=parameters)
+    return async_handler
+
+
 # Pydantic models for request/response
 class ProcurementRequirementCreate(BaseModel):
     title: str
@@ -99,74 +185,186 @@ class QualityReview(BaseModel):
     reviewed_by: str
 
 
-# Initialize agents and services
-scouting_agent = ScoutingAgent()
-outreach_agent = OutreachAgent()
-negotiation_agent = NegotiationAgent()
-cost_analysis_service = CostAnalysisService()
-shortlist_service = ShortlistService()
-srm_service = SRMService()
-supplier_metrics_service = SupplierMetricsService()
+class AwardAllocationRequest(BaseModel):
+    # Largest fraction of the quantity any one supplier may be awarded
+    max_share: float = Field(1.0, gt=0, le=1)
+    # Per-supplier capacity overrides, keyed by supplier id
+    supplier_capacities: Optional[Dict[int, float]] = None
+    # Quantity each warehouse must receive, keyed by warehouse id; when
+    # omitted the requirement quantity may be delivered to any warehouse
+    warehouse_demand: Optional[Dict[int, float]] = None
+
+
+# Initialize agents and services; instrument() times their public methods and
+# offload() runs them on a worker thread when called from the event loop (async mode).
+# shortlist_engine and outreach_dispatcher are not offloaded: the engine works on
+# the request's session, and the dispatcher awaits its own worker pool.
+scouting_agent = offload(instrument(ScoutingAgent()))
+outreach_agent = offload(instrument(OutreachAgent()))
+negotiation_agent = offload(instrument(NegotiationAgent()))
+cost_analysis_service = offload(instrument(CostAnalysisService()))
+shortlist_service = offload(instrument(ShortlistService()))
+shortlist_engine = instrument(ShortlistEngine(shortlist_service))
+srm_service = offload(instrument(SRMService()))
+supplier_metrics_service = offload(instrument(SupplierMetricsService()))
+outreach_dispatcher = instrument(OutreachDispatcher())
 
 
 # Helper functions
-def process_supplier_outreach(supplier: Supplier, requirement: ProcurementRequirement, db: Session) -> dict:
-    has_phone = bool(supplier.phone)
+def quote_sample_order(supplier: dict, requirement: dict) -> dict:
+    """Generates a sample order with realistic pricing"""
+    # Generate realistic sample quantity (10-20% of requirement quantity)
+    sample_quantity = round(requirement["quantity"] * random.uniform(0.10, 0.20), 2)
+    
+    # Generate realistic price per unit based on supplier's price competitiveness
+    base_price = 100.0  # Base price per unit
+    price_factor = (100 - supplier["price_competitiveness"]) / 100  # Lower competitiveness = higher price
+    price_per_unit = base_price * (1 + price_factor * 0.3)  # 0-30% variation
+    price_quoted = round(sample_quantity * price_per_unit, 2)
+    
+    return {
+        "quantity": sample_quantity,
+        "price_quoted": price_quoted,
+        "price_per_unit": round(price_per_unit, 2)
+    }
+
+
+def contact_supplier(supplier: dict, requirement: dict) -> dict:
+    """
+    Runs the outreach agents for one supplier snapshot. Touches no ORM state,
+    so it is safe to run on the outreach dispatcher's worker threads.
+    """
     contact_result = outreach_agent.handle_supplier_contact(
-        {
-            "id": supplier.id,
-            "name": supplier.name,
-            "email": supplier.email,
-            "phone": supplier.phone
-        },
-        requirement.description,
-        has_phone
+        supplier,
+        requirement["description"],
+        bool(supplier["phone"])
     )
 
     response_rate = 0.75
-    responded = random.random() < response_rate
-    sample_details = None
-
-    if responded:
-        supplier.status = SupplierStatus.RESPONDED
-        supplier.contact_method = contact_result["method"]
-        supplier.last_contacted = datetime.utcnow()
-        supplier.notes = contact_result.get("notes", "")
+    outcome = {
+        "contact_result": contact_result,
+        "responded": random.random() < response_rate,
+        "followup_result": None,
+        "sample_order": None
+    }
 
-        followup_result = outreach_agent.manage_sampling_followups(
+    if outcome["responded"]:
+        outcome["followup_result"] = outreach_agent.manage_sampling_followups(
             {
-                "id": supplier.id,
-                "name": supplier.name
+                "id": supplier["id"],
+                "name": supplier["name"]
             },
-            requirement.description
+            requirement["description"]
         )
-        supplier.status = SupplierStatus.SAMPLE_REQUESTED
-        supplier.notes = (supplier.notes or "") + f" | Sampling requested: {followup_result.get('inquiries', {})}"
-
         try:
-            sample_details = auto_place_sample_order(supplier, requirement, db)
-            if sample_details:
-                supplier.status = SupplierStatus.SAMPLE_RECEIVED
-                supplier.notes = (supplier.notes or "") + f" | Sample order placed: {sample_details.get('quantity')} units @ ${sample_details.get('price_quoted')}"
+            outcome["sample_order"] = quote_sample_order(supplier, requirement)
         except Exception as exc:
-            print(f"Error auto-placing sample order for supplier {supplier.id}: {exc}")
-            sample_details = None
-    else:
+            print(f"Error auto-placing sample order for supplier {supplier['id']}: {exc}")
+
+    return outcome
+
+
+def apply_outreach_outcome(supplier: Supplier, outcome: dict) -> Optional[dict]:
+    """Applies one supplier's outreach outcome and returns the sample row to insert, if any."""
+    contact_result = outcome["contact_result"]
+    supplier.contact_method = contact_result["method"]
+    supplier.last_contacted = datetime.utcnow()
+
+    if not outcome["responded"]:
         supplier.status = SupplierStatus.CONTACTED
-        supplier.contact_method = contact_result["method"]
-        supplier.last_contacted = datetime.utcnow()
         base_notes = contact_result.get("notes", "")
         supplier.notes = (base_notes or "Awaiting response") + " | No response yet"
+        return None
 
-    db.commit()
+    supplier.status = SupplierStatus.SAMPLE_REQUESTED
+    supplier.notes = contact_result.get("notes", "") + f" | Sampling requested: {outcome['followup_result'].get('inquiries', {})}"
+
+    sample_order = outcome["sample_order"]
+    if not sample_order:
+        return None
+
+    supplier.status = SupplierStatus.SAMPLE_RECEIVED
+    supplier.notes += f" | Sample order placed: {sample_order['quantity']} units @ ${sample_order['price_quoted']}"
+    return {
+        "supplier_id": supplier.id,
+        "received_date": datetime.utcnow(),
+        "quantity": sample_order["quantity"],
+        "address": "Main Warehouse, New York, NY",  # Default address
+        "price_quoted": sample_order["price_quoted"]
+    }
+
+
+def process_supplier_outreach(suppliers: List[Supplier], requirement: ProcurementRequirement, db: Session) -> List[dict]:
+    """
+    Contacts suppliers concurrently, within the per-channel limits of the
+    outreach dispatcher, then applies every outcome in a single flush.
+    The caller owns the commit.
+    """
+    requirement_data = {
+        "description": requirement.description,
+        "quantity": requirement.quantity
+    }
+    tasks = []
+    for supplier in suppliers:
+        snapshot = {
+            "id": supplier.id,
+            "name": supplier.name,
+            "email": supplier.email,
+            "phone": supplier.phone,
+            "price_competitiveness": supplier.price_competitiveness
+        }
+        channel = outreach_agent.contact_channel(snapshot, bool(supplier.phone))
+        tasks.append((supplier.id, channel, partial(contact_supplier, snapshot, requirement_data)))
+
+    outcomes = outreach_dispatcher.dispatch(tasks)
+
+    sample_rows = []
+    for supplier in suppliers:
+        sample_row = apply_outreach_outcome(supplier, outcomes[supplier.id])
+        if sample_row:
+            sample_rows.append(sample_row)
+
+    # One multi-row INSERT for every sample order; ids are matched back by supplier
+    sample_ids = {}
+    if sample_rows:
+        sample_ids = dict(db.execute(
+            insert(Sample).returning(Sample.supplier_id, Sample.id), sample_rows
+        ).all())
+        record_latest_samples({supplier.id: supplier for supplier in suppliers}, sample_ids)
+    db.flush()
+
+    results = []
+    for supplier in suppliers:
+        outcome = outcomes[supplier.id]
+        sample_id = sample_ids.get(supplier.id)
+        sample_details = {"sample_id": sample_id, **outcome["sample_order"]} if sample_id else None
+        results.append({
+            "id": supplier.id,
+            "name": supplier.name,
+            "responded": outcome["responded"],
+            "sample_ordered": sample_details is not None,
+            "sample_details": sample_details,
+            "status": supplier.status.value,
+            "contact_method": supplier.contact_method
+        })
+    return results
+
+
+# Supplier statuses that make a supplier eligible for the shortlist
+SHORTLIST_STATUSES = [SupplierStatus.COST_ANALYZED, SupplierStatus.SHORTLISTED]
+
+
+def shortlist_input(supplier: Supplier) -> dict:
+    """ShortlistService input for a supplier, built from its cached latest sample / cost analysis figures."""
     return {
         "id": supplier.id,
         "name": supplier.name,
-        "responded": responded,
-        "sample_ordered": sample_details is not None,
-        "sample_details": sample_details,
-        "status": supplier.status.value,
-        "contact_method": supplier.contact_method
+        "quality_approved": supplier.latest_quality_approved if supplier.latest_sample_id else False,
+        "certifications": supplier.certifications,
+        "total_cost": supplier.latest_total_cost if supplier.latest_cost_analysis_id else 0,
+        "savings": supplier.latest_savings if supplier.latest_cost_analysis_id else 0,
+        "savings_percentage": supplier.latest_savings_percentage if supplier.latest_cost_analysis_id else 0,
+        "response_received": supplier.status != SupplierStatus.DISCOVERED
     }
 
 
@@ -176,7 +374,7 @@ def initiate_onboarding(supplier: Supplier, requirement: ProcurementRequirement)
             "id": supplier.id,
             "name": supplier.name,
             "email": supplier.email,
-            "certifications": json.loads(supplier.certifications or "[]")
+            "certifications": supplier.certifications
         },
         {
             "id": requirement.id,
@@ -201,12 +399,40 @@ def initiate_onboarding(supplier: Supplier, requirement: ProcurementRequirement)
     return srm_result
 
 
-@app.get("/")
+@app.on_event("startup")
+def resume_pipeline_jobs():
+    resumed = job_runner.recover()
+    if resumed:
+        print(f"Resumed {len(resumed)} pipeline job(s): {resumed}")
+
+
+@app.on_event("startup")
+def start_db_maintenance():
+    db_maintenance.start()
+
+
+@app.on_event("shutdown")
+def stop_pipeline_jobs():
+    job_runner.shutdown(wait=False)
+
+
+@app.on_event("shutdown")
+def stop_db_maintenance():
+    db_maintenance.stop()
+
+
+@app.on_event("shutdown")
+def close_event_streams():
+    event_bus.close()
+
+
+@app.get("/", response_model=Message)
 def root():
     return {"message": "Procurement Demo API - Fully Autonomous Sourcing Agent"}
 
 
-@app.post("/api/requirements", response_model=dict)
+@app.post("/api/requirements", response_model=RequirementCreated)
+@db_endpoint
 def create_requirement(requirement: ProcurementRequirementCreate, db: Session = Depends(get_db)):
     """Step 1: Create procurement requirement (Manual)"""
     db_requirement = ProcurementRequirement(
@@ -215,7 +441,7 @@ def create_requirement(requirement: ProcurementRequirementCreate, db: Session =
         category=requirement.category,
         quantity=requirement.quantity,
         unit=requirement.unit,
-        required_certifications=json.dumps(requirement.required_certifications),
+        required_certifications=requirement.required_certifications,
         deadline=requirement.deadline,
         status=RequirementStatus.SCOUTING
     )
@@ -230,9 +456,10 @@ def create_requirement(requirement: ProcurementRequirementCreate, db: Session =
     }
 
 
-@app.post("/api/requirements/{requirement_id}/scout")
+@app.post("/api/requirements/{requirement_id}/scout", status_code=202, response_model=JobQueued)
+@db_endpoint
 def start_scouting(requirement_id: int, db: Session = Depends(get_db)):
-    """Step 2: Scouting Agent sources suppliers"""
+    """Step 2: Queue the scouting agent pipeline (scouting, ranking, outreach)"""
     requirement = db.query(ProcurementRequirement).filter(
         ProcurementRequirement.id == requirement_id
     ).first()
@@ -240,85 +467,139 @@ def start_scouting(requirement_id: int, db: Session = Depends(get_db)):
     if not requirement:
         raise HTTPException(status_code=404, detail="Requirement not found")
     
-    # Get suppliers from scouting agent
-    certifications = json.loads(requirement.required_certifications or "[]")
-    suppliers_data = scouting_agent.source_suppliers(
-        requirement.description,
-        certifications,
-        requirement.category
-    )
+    job = job_runner.enqueue(db, "scouting", requirement_id)
     
-    # Check availability scope and calculate metrics for each supplier
-    created_suppliers = []
-    for supplier_data in suppliers_data:
-        availability = scouting_agent.check_availability_scope(
-            supplier_data,
-            requirement.description
+    return {
+        **serialize_job(job),
+        "status_url": f"/api/jobs/{job.id}",
+        "message": "Scouting queued. Poll the job for progress."
+    }
+
+
+@job_runner.register("scouting", stages=["scouting", "ranking", "outreach"])
+def run_scouting_pipeline(ctx: JobContext, db: Session, requirement_id: int):
+    """Scouting Agent sources suppliers, ranks them and contacts the top 3"""
+    requirement = db.query(ProcurementRequirement).filter(
+        ProcurementRequirement.id == requirement_id
+    ).first()
+    
+    if not requirement:
+        raise ValueError(f"Requirement {requirement_id} not found")
+    
+    if not ctx.stage_done("scouting"):
+        # Get suppliers from scouting agent
+        suppliers_data = scouting_agent.source_suppliers(
+            requirement.description,
+            requirement.required_certifications,
+            requirement.category
         )
+        ctx.start_stage("scouting", total=len(suppliers_data))
+        
+        # Check availability scope and calculate metrics for each supplier
+        created_suppliers = []
+        supplier_rows = []
+        for supplier_data in suppliers_data:
+            availability = scouting_agent.check_availability_scope(
+                supplier_data,
+                requirement.description
+            )
+            
+            metrics = supplier_metrics_service.calculate_supplier_metrics(supplier_data)
+            
+            supplier_rows.append({
+                "requirement_id": requirement_id,
+                "name": supplier_data["name"],
+                "email": supplier_data.get("email"),
+                "phone": supplier_data.get("phone"),
+                "company": supplier_data.get("company", supplier_data["name"]),
+                "website": supplier_data.get("website"),
+                "availability_scope": availability,
+                "status": SupplierStatus.DISCOVERED if availability else SupplierStatus.REJECTED,
+                "experience_years": metrics["experience_years"],
+                "quality_rating": metrics["quality_rating"],
+                "delivery_reliability": metrics["delivery_reliability"],
+                "price_competitiveness": metrics["price_competitiveness"],
+                "overall_score": metrics["overall_score"]
+            })
+            created_suppliers.append(supplier_data)
         
-        metrics = supplier_metrics_service.calculate_supplier_metrics(supplier_data)
+        # One multi-row INSERT instead of an add/flush round trip per supplier
+        if supplier_rows:
+            supplier_ids = db.scalars(
+                insert(Supplier).returning(Supplier.id, sort_by_parameter_order=True), supplier_rows
+            ).all()
+            replace_certifications(db.connection(), supplier_certifications, {
+                supplier_id: supplier_data.get("certifications", [])
+                for supplier_id, supplier_data in zip(supplier_ids, suppliers_data)
+            }, existing=False)
+            record_event(db, requirement_id, {"type": "suppliers.discovered", "count": len(supplier_rows)})
         
-        db_supplier = Supplier(
-            requirement_id=requirement_id,
-            name=supplier_data["name"],
-            email=supplier_data.get("email"),
-            phone=supplier_data.get("phone"),
-            company=supplier_data.get("company", supplier_data["name"]),
-            website=supplier_data.get("website"),
-            certifications=json.dumps(supplier_data.get("certifications", [])),
-            availability_scope=availability,
-            status=SupplierStatus.DISCOVERED if availability else SupplierStatus.REJECTED,
-            experience_years=metrics["experience_years"],
-            quality_rating=metrics["quality_rating"],
-            delivery_reliability=metrics["delivery_reliability"],
-            price_competitiveness=metrics["price_competitiveness"],
-            overall_score=metrics["overall_score"]
-        )
-        db.add(db_supplier)
-        db.flush()
-        created_suppliers.append(supplier_data)
+        requirement.status = RequirementStatus.OUTREACH
+        ctx.complete_stage("scouting", suppliers_found=len(created_suppliers), suppliers=created_suppliers)
+    
+    if not ctx.stage_done("ranking"):
+        # Automatically select top suppliers based on overall score
+        available_suppliers = db.query(Supplier).filter(
+            Supplier.requirement_id == requirement_id,
+            Supplier.availability_scope == True,
+            Supplier.status == SupplierStatus.DISCOVERED
+        ).all()
+        ctx.start_stage("ranking", total=len(available_suppliers))
+        
+        ranked_suppliers = sorted(available_suppliers, key=lambda s: s.overall_score or 0, reverse=True)
+        max_auto = min(3, len(ranked_suppliers)) if ranked_suppliers else 0
+        auto_selected_ids = []
+        
+        for supplier in ranked_suppliers[:max_auto]:
+            supplier.selected_for_outreach = True
+            supplier.status = SupplierStatus.CONTACTED
+            auto_selected_ids.append(supplier.id)
+        
+        ctx.complete_stage("ranking", auto_selected=auto_selected_ids)
     
-    requirement.status = RequirementStatus.OUTREACH
+    # Scouting and ranking results become visible together, before outreach starts
+    auto_selected_ids = ctx.result.get("auto_selected", [])
+    outreach_results = ctx.result.get("outreach_results", [])
+    ctx.start_stage("outreach", total=len(auto_selected_ids))
     db.commit()
     
-    # Automatically select top suppliers based on overall score
-    available_suppliers = db.query(Supplier).filter(
-        Supplier.requirement_id == requirement_id,
-        Supplier.availability_scope == True,
-        Supplier.status == SupplierStatus.DISCOVERED
-    ).all()
-    
-    ranked_suppliers = sorted(available_suppliers, key=lambda s: s.overall_score or 0, reverse=True)
-    auto_selected_ids = []
-    outreach_results = []
-    max_auto = min(3, len(ranked_suppliers)) if ranked_suppliers else 0
+    # Suppliers without last_contacted have not been through outreach yet
+    # (relevant when an interrupted job resumes)
+    pending_suppliers = db.query(Supplier).filter(
+        Supplier.id.in_(auto_selected_ids),
+        Supplier.last_contacted.is_(None)
+    ).order_by(Supplier.overall_score.desc()).all()
     
-    for supplier in ranked_suppliers[:max_auto]:
-        supplier.selected_for_outreach = True
-        supplier.status = SupplierStatus.CONTACTED
-        db.commit()
-        auto_selected_ids.append(supplier.id)
-        result = process_supplier_outreach(supplier, requirement, db)
-        outreach_results.append(result)
+    outreach_results.extend(process_supplier_outreach(pending_suppliers, requirement, db))
     
     if any(result.get("sample_ordered") for result in outreach_results):
         requirement.status = RequirementStatus.SAMPLING
     elif outreach_results:
         requirement.status = RequirementStatus.OUTREACH
+    
+    ctx.complete_stage(
+        "outreach",
+        outreach_results=outreach_results,
+        status=requirement.status.value,
+        message=f"Scouting complete. Automatically selected {len(auto_selected_ids)} supplier(s) for outreach."
+    )
     db.commit()
+
+
+@app.get("/api/jobs/{job_id}", response_model=Job)
+@db_endpoint
+def get_job(job_id: int, db: Session = Depends(get_db)):
+    """Background job status with per-stage progress"""
+    job = db.query(PipelineJob).filter(PipelineJob.id == job_id).first()
     
-    return {
-        "requirement_id": requirement_id,
-        "suppliers_found": len(created_suppliers),
-        "suppliers": created_suppliers,
-        "auto_selected": auto_selected_ids,
-        "outreach_results": outreach_results,
-        "status": requirement.status.value,
-        "message": f"Scouting complete. Automatically selected {len(auto_selected_ids)} supplier(s) for outreach."
-    }
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return serialize_job(job)
 
 
-@app.post("/api/requirements/{requirement_id}/select-suppliers")
+@app.post("/api/requirements/{requirement_id}/select-suppliers", response_model=SupplierSelectionResult)
+@db_endpoint
 def select_suppliers_for_outreach(requirement_id: int, selection: SupplierSelection, db: Session = Depends(get_db)):
     """Select suppliers for outreach based on metrics"""
     requirement = db.query(ProcurementRequirement).filter(
@@ -328,25 +609,23 @@ def select_suppliers_for_outreach(requirement_id: int, selection: SupplierSelect
     if not requirement:
         raise HTTPException(status_code=404, detail="Requirement not found")
     
-    selected_suppliers = []
-    for supplier_id in selection.supplier_ids:
-        supplier = db.query(Supplier).filter(
-            Supplier.id == supplier_id,
+    # Single IN-list fetch, kept in the order the suppliers were selected
+    requested_ids = list(dict.fromkeys(selection.supplier_ids))
+    suppliers_by_id = {
+        supplier.id: supplier
+        for supplier in db.query(Supplier).filter(
+            Supplier.id.in_(requested_ids),
             Supplier.requirement_id == requirement_id
-        ).first()
-        if supplier:
-            supplier.selected_for_outreach = True
-            supplier.status = SupplierStatus.CONTACTED
-            selected_suppliers.append(supplier_id)
+        ).all()
+    }
+    suppliers_to_contact = [suppliers_by_id[sid] for sid in requested_ids if sid in suppliers_by_id]
+    selected_suppliers = [supplier.id for supplier in suppliers_to_contact]
     
-    db.commit()
+    for supplier in suppliers_to_contact:
+        supplier.selected_for_outreach = True
+        supplier.status = SupplierStatus.CONTACTED
     
-    contacted_suppliers = []
-    for supplier_id in selected_suppliers:
-        supplier = db.query(Supplier).filter(Supplier.id == supplier_id).first()
-        if supplier and supplier.selected_for_outreach:
-            result = process_supplier_outreach(supplier, requirement, db)
-            contacted_suppliers.append(result)
+    contacted_suppliers = process_supplier_outreach(suppliers_to_contact, requirement, db)
     
     if any(result.get("sample_ordered") for result in contacted_suppliers):
         requirement.status = RequirementStatus.SAMPLING
@@ -364,40 +643,8 @@ def select_suppliers_for_outreach(requirement_id: int, selection: SupplierSelect
     }
 
 
-def auto_place_sample_order(supplier: Supplier, requirement: ProcurementRequirement, db: Session) -> dict:
-    """Automatically places sample order with realistic pricing"""
-    import random
-    
-    # Generate realistic sample quantity (10-20% of requirement quantity)
-    sample_quantity = round(requirement.quantity * random.uniform(0.10, 0.20), 2)
-    
-    # Generate realistic price per unit based on supplier's price competitiveness
-    base_price = 100.0  # Base price per unit
-    price_factor = (100 - supplier.price_competitiveness) / 100  # Lower competitiveness = higher price
-    price_per_unit = base_price * (1 + price_factor * 0.3)  # 0-30% variation
-    price_quoted = round(sample_quantity * price_per_unit, 2)
-    
-    # Create sample record
-    db_sample = Sample(
-        supplier_id=supplier.id,
-        received_date=datetime.utcnow(),
-        quantity=sample_quantity,
-        address="Main Warehouse, New York, NY",  # Default address
-        price_quoted=price_quoted
-    )
-    db.add(db_sample)
-    db.commit()
-    db.refresh(db_sample)
-    
-    return {
-        "sample_id": db_sample.id,
-        "quantity": sample_quantity,
-        "price_quoted": price_quoted,
-        "price_per_unit": round(price_per_unit, 2)
-    }
-
-
-@app.post("/api/suppliers/{supplier_id}/outreach")
+@app.post("/api/suppliers/{supplier_id}/outreach", response_model=OutreachResult)
+@db_endpoint
 def outreach_supplier(supplier_id: int, db: Session = Depends(get_db)):
     """Step 4: Outreach Agent contacts supplier"""
     supplier = db.query(Supplier).filter(Supplier.id == supplier_id).first()
@@ -445,7 +692,8 @@ def outreach_supplier(supplier_id: int, db: Session = Depends(get_db)):
     }
 
 
-@app.post("/api/suppliers/{supplier_id}/sampling")
+@app.post("/api/suppliers/{supplier_id}/sampling", response_model=SamplingFollowup)
+@db_endpoint
 def request_sampling(supplier_id: int, db: Session = Depends(get_db)):
     """Step 5: Automated sampling follow-ups"""
     supplier = db.query(Supplier).filter(Supplier.id == supplier_id).first()
@@ -472,7 +720,8 @@ def request_sampling(supplier_id: int, db: Session = Depends(get_db)):
     }
 
 
-@app.post("/api/samples")
+@app.post("/api/samples", response_model=SampleReceived)
+@db_endpoint
 def create_sample(sample: SampleCreate, db: Session = Depends(get_db)):
     """Step 6: Sample received"""
     supplier = db.query(Supplier).filter(Supplier.id == sample.supplier_id).first()
@@ -501,7 +750,8 @@ def create_sample(sample: SampleCreate, db: Session = Depends(get_db)):
     }
 
 
-@app.post("/api/samples/{sample_id}/quality-review")
+@app.post("/api/samples/{sample_id}/quality-review", response_model=QualityReviewResult)
+@db_endpoint
 def review_quality(sample_id: int, review: QualityReview, db: Session = Depends(get_db)):
     """Step 7: Quality Team Analysis (Manual)"""
     sample = db.query(Sample).filter(Sample.id == sample_id).first()
@@ -541,7 +791,7 @@ def review_quality(sample_id: int, review: QualityReview, db: Session = Depends(
                 savings=cost_analysis_result["savings"],
                 savings_percentage=cost_analysis_result["savings_percentage"],
                 meets_expectations=cost_analysis_result["meets_expectations"],
-                analysis_notes=cost_analysis_result["analysis_notes"],
+                analysis_notes=pack(cost_analysis_result["analysis_notes"]),
                 warehouse_locations=json.dumps(cost_analysis_result["warehouse_locations"])
             )
             db.add(db_analysis)
@@ -566,68 +816,28 @@ def review_quality(sample_id: int, review: QualityReview, db: Session = Depends(
                     db_analysis.savings = db_analysis.current_supplier_cost - final_cost
                     db_analysis.savings_percentage = (db_analysis.savings / db_analysis.current_supplier_cost * 100) if db_analysis.current_supplier_cost > 0 else 0
                     db_analysis.meets_expectations = db_analysis.savings_percentage >= 5
-                    db_analysis.analysis_notes = db_analysis.analysis_notes + f"\n\nNegotiation completed after {len(negotiation_iterations)} iterations."
+                    notes = cost_analysis_result["analysis_notes"]
+                    notes["fields"]["negotiation_iterations"] = len(negotiation_iterations)
+                    db_analysis.analysis_notes = pack(notes)
                     
                     supplier.status = SupplierStatus.SHORTLISTED if db_analysis.meets_expectations else SupplierStatus.COST_ANALYZED
             else:
                 supplier.status = SupplierStatus.SHORTLISTED
             
-            # Check if we can create shortlist
-            all_suppliers = db.query(Supplier).filter(
-                Supplier.requirement_id == supplier.requirement_id,
-                Supplier.status.in_([SupplierStatus.COST_ANALYZED, SupplierStatus.SHORTLISTED])
-            ).all()
+            # Write the analysis so the supplier's status and cached cost figures are current
+            db.flush()
             
-            if len(all_suppliers) > 0:
-                # Automatically create shortlist if we have at least one analyzed supplier
-                suppliers_data_for_shortlist = []
-                for s in all_suppliers:
-                    cost_analysis = db.query(CostAnalysis).filter(
-                        CostAnalysis.supplier_id == s.id
-                    ).order_by(CostAnalysis.created_at.desc()).first()
-                    
-                    sample_data = db.query(Sample).filter(
-                        Sample.supplier_id == s.id
-                    ).order_by(Sample.received_date.desc()).first()
-                    
-                    suppliers_data_for_shortlist.append({
-                        "id": s.id,
-                        "name": s.name,
-                        "quality_approved": sample_data.quality_approved if sample_data else False,
-                        "certifications": json.loads(s.certifications or "[]"),
-                        "total_cost": cost_analysis.total_cost if cost_analysis else 0,
-                        "savings": cost_analysis.savings if cost_analysis else 0,
-                        "savings_percentage": cost_analysis.savings_percentage if cost_analysis else 0,
-                        "response_received": s.status != SupplierStatus.DISCOVERED
-                    })
-                
-                shortlist = shortlist_service.create_shortlist(suppliers_data_for_shortlist)
-                
-                # Save shortlist to database
-                for item in shortlist:
-                    existing = db.query(SupplierShortlist).filter(
-                        SupplierShortlist.requirement_id == supplier.requirement_id,
-                        SupplierShortlist.supplier_id == item["supplier_id"]
-                    ).first()
-                    if not existing:
-                        db_shortlist = SupplierShortlist(
-                            requirement_id=supplier.requirement_id,
-                            supplier_id=item["supplier_id"],
-                            rank=item["rank"],
-                            integrated_score=item["integrated_score"],
-                            cost_score=item["cost_score"],
-                            quality_score=item["quality_score"],
-                            recommendation=item["recommendation"]
-                        )
-                        db.add(db_shortlist)
-                
-                supplier.requirement.status = RequirementStatus.SHORTLISTED
+            # Place only this supplier in the persisted shortlist; the other
+            # entries keep their scores and just shift rank around it
+            shortlist_engine.upsert(db, supplier.requirement_id, shortlist_input(supplier))
+            supplier.requirement.status = RequirementStatus.SHORTLISTED
         except Exception as e:
             print(f"Error in auto cost analysis: {e}")
             # Continue even if auto-analysis fails
     else:
         supplier.status = SupplierStatus.QUALITY_REJECTED
         supplier.requirement.status = RequirementStatus.REJECTED
+        shortlist_engine.remove(db, supplier.requirement_id, supplier.id)
     
     db.commit()
     
@@ -664,12 +874,11 @@ def perform_negotiation_iterations(supplier: Supplier, initial_cost: float, db:
             iteration_number=iteration_num,
             proposed_cost=negotiation_result["negotiated_cost"],
             target_cost=target_cost,
-            negotiation_strategy=negotiation_result["negotiation_strategy"],
+            negotiation_strategy=pack(negotiation_result["negotiation_strategy"]),
             outcome=negotiation_result["outcome"],
             notes=negotiation_result["notes"]
         )
         db.add(db_iteration)
-        db.commit()
         
         iterations.append({
             "iteration": iteration_num,
@@ -688,8 +897,9 @@ def perform_negotiation_iterations(supplier: Supplier, initial_cost: float, db:
     return iterations
 
 
-@app.post("/api/suppliers/{supplier_id}/cost-analysis")
-def analyze_cost(supplier_id: int, db: Session = Depends(get_db)):
+@app.post("/api/suppliers/{supplier_id}/cost-analysis", response_model=CostAnalysisResult)
+@db_endpoint
+def analyze_cost(supplier_id: int, render: bool = False, db: Session = Depends(get_db)):
     """Step 8: Cost Analysis (GenAI)"""
     supplier = db.query(Supplier).filter(Supplier.id == supplier_id).first()
     
@@ -700,9 +910,7 @@ def analyze_cost(supplier_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail="Supplier must be quality approved first")
     
     # Get latest sample
-    sample = db.query(Sample).filter(
-        Sample.supplier_id == supplier_id
-    ).order_by(Sample.received_date.desc()).first()
+    sample = supplier.latest_sample
     
     if not sample:
         raise HTTPException(status_code=404, detail="Sample not found")
@@ -729,7 +937,7 @@ def analyze_cost(supplier_id: int, db: Session = Depends(get_db)):
         savings=analysis_result["savings"],
         savings_percentage=analysis_result["savings_percentage"],
         meets_expectations=analysis_result["meets_expectations"],
-        analysis_notes=analysis_result["analysis_notes"],
+        analysis_notes=pack(analysis_result["analysis_notes"]),
         warehouse_locations=json.dumps(analysis_result["warehouse_locations"])
     )
     db.add(db_analysis)
@@ -748,14 +956,18 @@ def analyze_cost(supplier_id: int, db: Session = Depends(get_db)):
     
     return {
         "supplier_id": supplier_id,
-        "cost_analysis": analysis_result,
+        "cost_analysis": dict(
+            analysis_result,
+            analysis_notes=report_payload(analysis_result["analysis_notes"], render)
+        ),
         "meets_expectations": analysis_result["meets_expectations"],
         "next_step": "shortlist" if analysis_result["meets_expectations"] else "negotiation"
     }
 
 
-@app.post("/api/suppliers/{supplier_id}/negotiate")
-def negotiate_with_supplier(supplier_id: int, db: Session = Depends(get_db)):
+@app.post("/api/suppliers/{supplier_id}/negotiate", response_model=NegotiationResult)
+@db_endpoint
+def negotiate_with_supplier(supplier_id: int, render: bool = False, db: Session = Depends(get_db)):
     """Step 10: Negotiation Agent with iterations"""
     supplier = db.query(Supplier).filter(Supplier.id == supplier_id).first()
     
@@ -763,9 +975,7 @@ def negotiate_with_supplier(supplier_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Supplier not found")
     
     # Get cost analysis
-    cost_analysis = db.query(CostAnalysis).filter(
-        CostAnalysis.supplier_id == supplier_id
-    ).order_by(CostAnalysis.created_at.desc()).first()
+    cost_analysis = supplier.latest_cost_analysis
     
     if not cost_analysis:
         raise HTTPException(status_code=404, detail="Cost analysis not found")
@@ -789,8 +999,13 @@ def negotiate_with_supplier(supplier_id: int, db: Session = Depends(get_db)):
         
         supplier.status = SupplierStatus.SHORTLISTED
         supplier.requirement.status = RequirementStatus.SHORTLISTED
+        db.flush()
+        shortlist_engine.upsert(db, supplier.requirement_id, shortlist_input(supplier))
         db.commit()
     
+    for iteration in negotiation_iterations:
+        iteration["strategy"] = report_payload(iteration["strategy"], render)
+    
     return {
         "supplier_id": supplier_id,
         "negotiation_iterations": negotiation_iterations,
@@ -804,8 +1019,9 @@ def negotiate_with_supplier(supplier_id: int, db: Session = Depends(get_db)):
     }
 
 
-@app.get("/api/suppliers/{supplier_id}/negotiation-iterations")
-def get_negotiation_iterations(supplier_id: int, db: Session = Depends(get_db)):
+@app.get("/api/suppliers/{supplier_id}/negotiation-iterations", response_model=NegotiationHistory)
+@db_endpoint
+def get_negotiation_iterations(supplier_id: int, render: bool = False, db: Session = Depends(get_db)):
     """Get all negotiation iterations for a supplier"""
     iterations = db.query(NegotiationIteration).filter(
         NegotiationIteration.supplier_id == supplier_id
@@ -819,13 +1035,14 @@ def get_negotiation_iterations(supplier_id: int, db: Session = Depends(get_db)):
             "target_cost": i.target_cost,
             "outcome": i.outcome,
             "notes": i.notes,
-            "strategy": i.negotiation_strategy,
+            "strategy": report_payload(i.negotiation_strategy, render),
             "created_at": i.created_at.isoformat()
         } for i in iterations]
     }
 
 
-@app.post("/api/requirements/{requirement_id}/shortlist")
+@app.post("/api/requirements/{requirement_id}/shortlist", response_model=ShortlistResult)
+@db_endpoint
 def create_shortlist(requirement_id: int, db: Session = Depends(get_db)):
     """Step 11: AI-curated supplier shortlist"""
     requirement = db.query(ProcurementRequirement).filter(
@@ -835,51 +1052,15 @@ def create_shortlist(requirement_id: int, db: Session = Depends(get_db)):
     if not requirement:
         raise HTTPException(status_code=404, detail="Requirement not found")
     
-    suppliers = db.query(Supplier).filter(
+    suppliers = db.query(Supplier).options(selectinload(Supplier.certification_entries)).filter(
         Supplier.requirement_id == requirement_id,
-        Supplier.status.in_([SupplierStatus.COST_ANALYZED, SupplierStatus.SHORTLISTED])
+        Supplier.status.in_(SHORTLIST_STATUSES)
     ).all()
     
-    suppliers_data = []
-    for supplier in suppliers:
-        cost_analysis = db.query(CostAnalysis).filter(
-            CostAnalysis.supplier_id == supplier.id
-        ).order_by(CostAnalysis.created_at.desc()).first()
-        
-        sample = db.query(Sample).filter(
-            Sample.supplier_id == supplier.id
-        ).order_by(Sample.received_date.desc()).first()
-        
-        suppliers_data.append({
-            "id": supplier.id,
-            "name": supplier.name,
-            "quality_approved": sample.quality_approved if sample else False,
-            "certifications": json.loads(supplier.certifications or "[]"),
-            "total_cost": cost_analysis.total_cost if cost_analysis else 0,
-            "savings": cost_analysis.savings if cost_analysis else 0,
-            "savings_percentage": cost_analysis.savings_percentage if cost_analysis else 0,
-            "response_received": supplier.status != SupplierStatus.DISCOVERED
-        })
-    
-    shortlist = shortlist_service.create_shortlist(suppliers_data)
-    
-    # Replace existing shortlist entries
-    db.query(SupplierShortlist).filter(
-        SupplierShortlist.requirement_id == requirement_id
-    ).delete()
-    db.commit()
+    suppliers_data = [shortlist_input(supplier) for supplier in suppliers]
     
-    for item in shortlist:
-        db_shortlist = SupplierShortlist(
-            requirement_id=requirement_id,
-            supplier_id=item["supplier_id"],
-            rank=item["rank"],
-            integrated_score=item["integrated_score"],
-            cost_score=item["cost_score"],
-            quality_score=item["quality_score"],
-            recommendation=item["recommendation"]
-        )
-        db.add(db_shortlist)
+    # Reconcile with the stored shortlist; unchanged entries are not rewritten
+    shortlist = shortlist_engine.sync(db, requirement_id, suppliers_data)
     
     requirement.status = RequirementStatus.SHORTLISTED
     db.commit()
@@ -892,8 +1073,9 @@ def create_shortlist(requirement_id: int, db: Session = Depends(get_db)):
     }
 
 
-@app.post("/api/suppliers/{supplier_id}/onboard")
-def start_onboarding(supplier_id: int, db: Session = Depends(get_db)):
+@app.post("/api/suppliers/{supplier_id}/onboard", response_model=OnboardingResult)
+@db_endpoint
+def start_onboarding(supplier_id: int, render: bool = False, db: Session = Depends(get_db)):
     """Step 12: On-boarding and SRM Analysis (GenAI)"""
     supplier = db.query(Supplier).filter(Supplier.id == supplier_id).first()
     
@@ -904,6 +1086,11 @@ def start_onboarding(supplier_id: int, db: Session = Depends(get_db)):
     onboarding_result = initiate_onboarding(supplier, requirement)
     db.commit()
     
+    if render:
+        onboarding_result["srm_analysis"] = report_payload(onboarding_result["srm_analysis"], True)
+        onboarding_result["relationship_strategy"] = report_payload(onboarding_result["relationship_strategy"], True)
+        onboarding_result["onboarding_plan"]["plan"] = report_payload(onboarding_result["onboarding_plan"]["plan"], True)
+    
     return {
         "supplier_id": supplier_id,
         "srm_analysis": onboarding_result,
@@ -912,9 +1099,10 @@ def start_onboarding(supplier_id: int, db: Session = Depends(get_db)):
     }
 
 
-@app.get("/api/requirements/{requirement_id}")
-def get_requirement(requirement_id: int, db: Session = Depends(get_db)):
-    """Get requirement with all related data"""
+@app.post("/api/requirements/{requirement_id}/award-allocation", response_model=AwardPlan)
+@db_endpoint
+def optimize_award_allocation(requirement_id: int, request: AwardAllocationRequest, db: Session = Depends(get_db)):
+    """Minimum-cost split of the requirement quantity across shortlisted suppliers and warehouses"""
     requirement = db.query(ProcurementRequirement).filter(
         ProcurementRequirement.id == requirement_id
     ).first()
@@ -922,25 +1110,132 @@ def get_requirement(requirement_id: int, db: Session = Depends(get_db)):
     if not requirement:
         raise HTTPException(status_code=404, detail="Requirement not found")
     
-    suppliers = db.query(Supplier).filter(
-        Supplier.requirement_id == requirement_id
+    candidates = db.execute(
+        select(Supplier.id, Supplier.name, Sample.price_quoted, Sample.quantity,
+               CostAnalysis.total_cost, CostAnalysis.transportation_cost)
+        .join(SupplierShortlist, SupplierShortlist.supplier_id == Supplier.id)
+        .join(Sample, Sample.id == Supplier.latest_sample_id)
+        .join(CostAnalysis, CostAnalysis.id == Supplier.latest_cost_analysis_id)
+        .where(
+            SupplierShortlist.requirement_id == requirement_id,
+            CostAnalysis.total_cost.is_not(None),
+            Sample.quantity > 0
+        )
+        .order_by(SupplierShortlist.rank)
     ).all()
     
+    if not candidates:
+        raise HTTPException(status_code=400, detail="No shortlisted suppliers with a cost analysis")
+    
+    warehouses = cost_analysis_service.warehouse_locations
+    quantity = requirement.quantity or 0
+    capacities = (request.supplier_capacities or {})
+    
+    warehouse_demand = None
+    if request.warehouse_demand is not None:
+        unknown = set(request.warehouse_demand) - {w["id"] for w in warehouses}
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown warehouse ids: {sorted(unknown)}")
+        warehouse_demand = [request.warehouse_demand.get(w["id"], 0.0) for w in warehouses]
+        quantity = sum(warehouse_demand)
+    # max_share applies to the quantity actually being awarded
+    default_capacity = quantity * request.max_share
+    
+    # Negotiated unit price: the sample's quoted unit price, discounted by the
+    # ratio negotiation applied to the analysed total (quote + freight)
+    unit_costs = []
+    for c in candidates:
+        quoted_total = c.price_quoted * c.quantity + (c.transportation_cost or 0)
+        unit_costs.append(c.price_quoted / c.quantity * (c.total_cost / quoted_total if quoted_total > 0 else 1))
+    
+    # Landed cost per warehouse as the cost analysis computes it for the whole
+    # quantity: goods plus freight scaled by the warehouse cost_factor, spread
+    # over the units delivered
+    landed = cost_analysis_service.analyze_cost_batch([{
+        "id": c.id,
+        "name": c.name,
+        "location": "Unknown",
+        "proposed_price": unit_cost,
+        "quantity": quantity
+    } for c, unit_cost in zip(candidates, unit_costs)], warehouses)
+    landed_unit_costs = landed["total_cost"] / quantity if quantity > 0 else landed["total_cost"]
+    try:
+        plan = run_blocking(
+            allocate_award,
+            landed_unit_costs,
+            [min(capacities.get(c.id, default_capacity), default_capacity) for c in candidates],
+            quantity=quantity,
+            warehouse_demand=warehouse_demand
+        )
+    except (AwardInfeasible, AwardTooLarge) as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    
+    allocations = []
+    for s, candidate in enumerate(candidates):
+        for w, warehouse in enumerate(warehouses):
+            awarded = float(plan["allocation"][s, w])
+            if awarded <= 0:
+                continue
+            landed_unit_cost = float(landed_unit_costs[s, w])
+            allocations.append({
+                "supplier_id": candidate.id,
+                "supplier_name": candidate.name,
+                "warehouse_id": warehouse["id"],
+                "warehouse_name": warehouse["name"],
+                "quantity": round(awarded, 4),
+                "unit_cost": round(unit_costs[s], 4),
+                "landed_unit_cost": round(landed_unit_cost, 4),
+                "cost": round(awarded * landed_unit_cost, 2)
+            })
+    
+    return {
+        "requirement_id": requirement_id,
+        "quantity": quantity,
+        "total_cost": round(plan["total_cost"], 2),
+        "suppliers_considered": len(candidates),
+        "allocations": allocations
+    }
+
+
+@app.get("/api/requirements/{requirement_id}", response_model=RequirementDetail)
+@db_endpoint
+def get_requirement(
+    requirement_id: int,
+    render: bool = False,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """
+    Get requirement with all related data; reports are structured unless
+    render=true. Sends a strong ETag and answers a matching If-None-Match with
+    304 after reading only the requirement's version; other unchanged reads
+    are served from the payload cache.
+    """
+    variant = "rendered" if render else ""
+    if if_none_match or payload_cache.enabled:
+        version = current_version(db, requirement_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Requirement not found")
+        etag = requirement_etag(requirement_id, version, variant)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        body = payload_cache.get(requirement_id, version, variant)
+        if body is not None:
+            return Response(content=body, media_type="application/json", headers=headers)
+    
+    graph = load_requirement_graph(db, requirement_id)
+    
+    if not graph:
+        raise HTTPException(status_code=404, detail="Requirement not found")
+    
+    requirement = graph.requirement
     suppliers_data = []
     supplier_lookup = {}
-    for supplier in suppliers:
-        sample = db.query(Sample).filter(
-            Sample.supplier_id == supplier.id
-        ).order_by(Sample.received_date.desc()).first()
-        
-        cost_analysis = db.query(CostAnalysis).filter(
-            CostAnalysis.supplier_id == supplier.id
-        ).order_by(CostAnalysis.created_at.desc()).first()
-        
-        # Get negotiation iterations
-        negotiation_iterations = db.query(NegotiationIteration).filter(
-            NegotiationIteration.supplier_id == supplier.id
-        ).order_by(NegotiationIteration.iteration_number).all()
+    for supplier in graph.suppliers:
+        sample = graph.samples.get(supplier.id)
+        cost_analysis = graph.cost_analyses.get(supplier.id)
+        negotiation_iterations = graph.iterations.get(supplier.id, [])
         
         supplier_payload = {
             "id": supplier.id,
@@ -960,7 +1255,7 @@ def get_requirement(requirement_id: int, db: Session = Depends(get_db)):
             "phone": supplier.phone,
             "company": supplier.company,
             "website": supplier.website,
-            "certifications": json.loads(supplier.certifications or "[]"),
+            "certifications": supplier.certifications,
             "sample": {
                 "id": sample.id,
                 "quantity": sample.quantity,
@@ -984,16 +1279,12 @@ def get_requirement(requirement_id: int, db: Session = Depends(get_db)):
                 "target_cost": ni.target_cost,
                 "outcome": ni.outcome,
                 "notes": ni.notes,
-                "strategy": ni.negotiation_strategy
+                "strategy": report_payload(ni.negotiation_strategy, render)
             } for ni in negotiation_iterations] if negotiation_iterations else []
         }
         suppliers_data.append(supplier_payload)
         supplier_lookup[supplier.id] = supplier_payload
 
-    shortlist_entries = db.query(SupplierShortlist).filter(
-        SupplierShortlist.requirement_id == requirement_id
-    ).order_by(SupplierShortlist.rank).all()
-
     shortlist_data = [{
         "supplier_id": entry.supplier_id,
         "rank": entry.rank,
@@ -1003,32 +1294,258 @@ def get_requirement(requirement_id: int, db: Session = Depends(get_db)):
         "recommendation": entry.recommendation,
         "created_at": entry.created_at.isoformat() if entry.created_at else None,
         "supplier": supplier_lookup.get(entry.supplier_id)
-    } for entry in shortlist_entries]
+    } for entry in graph.shortlist]
     
-    return {
+    body = run_blocking(dumps_as, RequirementDetail, {
         "id": requirement.id,
         "title": requirement.title,
         "description": requirement.description,
         "category": requirement.category,
         "quantity": requirement.quantity,
         "unit": requirement.unit,
-        "required_certifications": json.loads(requirement.required_certifications or "[]"),
+        "required_certifications": requirement.required_certifications,
         "status": requirement.status.value,
         "suppliers": suppliers_data,
         "shortlist": shortlist_data
+    })
+    payload_cache.set(requirement_id, requirement.version, body, variant)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": requirement_etag(requirement_id, requirement.version, variant), "Cache-Control": "no-cache"}
+    )
+
+
+# Comment frame sent on idle event streams so proxies keep the connection open
+EVENT_HEARTBEAT_SECONDS = float(os.getenv("REQUIREMENT_EVENTS_HEARTBEAT_SECONDS", "15"))
+
+
+async def requirement_snapshot(requirement_id: int) -> Optional[dict]:
+    """Status and version of a requirement, or None if it does not exist."""
+    def read(db: Session):
+        row = db.execute(
+            select(ProcurementRequirement.status, ProcurementRequirement.version)
+            .where(ProcurementRequirement.id == requirement_id)
+        ).first()
+        return {"type": "snapshot", "requirement_id": requirement_id,
+                "status": row.status.value, "version": row.version} if row else None
+
+    if ENABLE_ASYNC_DB:
+        async with AsyncSessionLocal() as db:
+            return await db.run_sync(read)
+
+    def read_sync():
+        with SessionLocal() as db:
+            return read(db)
+    return await run_in_threadpool(read_sync)
+
+
+@app.get("/api/requirements/{requirement_id}/events")
+async def stream_requirement_events(requirement_id: int, last_event_id: Optional[str] = Header(None)):
+    """
+    Server-Sent Events stream of delta events for one requirement. Opens with
+    a snapshot (status and version) read once per connection; after that,
+    events come from the in-process bus without touching the database.
+    """
+    subscription = event_bus.subscribe(requirement_id, last_event_id)
+    try:
+        snapshot = await requirement_snapshot(requirement_id)
+    except BaseException:
+        event_bus.unsubscribe(subscription)
+        raise
+    if snapshot is None:
+        event_bus.unsubscribe(subscription)
+        raise HTTPException(status_code=404, detail="Requirement not found")
+
+    async def stream():
+        try:
+            yield f"retry: 3000\ndata: {json.dumps(snapshot)}\n\n".encode("utf-8")
+            while True:
+                try:
+                    frame = await asyncio.wait_for(subscription.queue.get(), EVENT_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@registry.collector
+def cache_and_stream_metrics():
+    """Counters kept by the caches and the event bus, read at scrape time."""
+    payload = payload_cache.stats()
+    blobs = decode_cache.info()
+    renders = render_cache_info()
+    events = event_bus.stats()
+    return [
+        ("payload_cache_hits_total", "counter", "Requirement payload cache hits", [({}, payload.get("hits"))]),
+        ("payload_cache_misses_total", "counter", "Requirement payload cache misses", [({}, payload.get("misses"))]),
+        ("payload_cache_evictions_total", "counter", "Requirement payload cache evictions",
+         [({}, payload.get("evictions"))]),
+        ("payload_cache_bytes", "gauge", "Bytes held by the local payload cache", [({}, payload.get("bytes"))]),
+        ("blob_decode_cache_hits_total", "counter", "Blob decode cache hits", [({}, blobs["hits"])]),
+        ("blob_decode_cache_misses_total", "counter", "Blob decode cache misses", [({}, blobs["misses"])]),
+        ("report_render_cache_hits_total", "counter", "Report render cache hits", [({}, renders.hits)]),
+        ("report_render_cache_misses_total", "counter", "Report render cache misses", [({}, renders.misses)]),
+        ("requirement_event_subscribers", "gauge", "Open requirement event streams", [({}, events["subscribers"])]),
+        ("requirement_events_published_total", "counter", "Requirement events published",
+         [({}, events["published"])]),
+    ]
+
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """Prometheus text exposition of the request, SQL, component and cache metrics"""
+    return PlainTextResponse(registry.expose(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/api/cache/stats", response_model=CacheStats)
+def get_cache_stats():
+    """Hit rate, eviction and size counters of the requirement payload cache"""
+    return {"payload_cache": payload_cache.stats()}
+
+
+@app.get("/api/requirements", response_model=RequirementPage)
+@db_endpoint
+def list_requirements(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    status: Optional[RequirementStatus] = None,
+    category: Optional[str] = None,
+    deadline_from: Optional[datetime] = None,
+    deadline_to: Optional[datetime] = None,
+    db: Session = Depends(get_db)
+):
+    """List requirements newest first, one keyset page at a time; status_counts are unfiltered totals"""
+    try:
+        return list_requirements_page(
+            db,
+            limit=limit,
+            cursor=cursor,
+            status=status,
+            category=category,
+            deadline_from=deadline_from,
+            deadline_to=deadline_to
+        )
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@app.get("/api/suppliers/search", response_model=SupplierSearchPage)
+@db_endpoint
+def search_suppliers(
+    certification: List[str] = Query([]),
+    requirement_id: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Suppliers holding every requested certification (?certification=A&certification=B), by id"""
+    if not certification:
+        raise HTTPException(status_code=400, detail="At least one certification is required")
+    try:
+        return search_suppliers_by_certifications(
+            db,
+            certification,
+            requirement_id=requirement_id,
+            limit=limit,
+            cursor=cursor
+        )
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@app.get("/api/requirements/{requirement_id}/cost-analysis/portfolio", response_model=CostPortfolio)
+@db_endpoint
+def get_cost_portfolio(requirement_id: int, db: Session = Depends(get_db)):
+    """Cost of every sampled supplier at every warehouse, with the cheapest warehouse per supplier"""
+    requirement = db.query(ProcurementRequirement).filter(
+        ProcurementRequirement.id == requirement_id
+    ).first()
+    
+    if not requirement:
+        raise HTTPException(status_code=404, detail="Requirement not found")
+    
+    rows = db.execute(
+        select(Supplier.id, Supplier.name, Sample.price_quoted, Sample.quantity)
+        .join(Sample, Sample.id == Supplier.latest_sample_id)
+        .where(
+            Supplier.requirement_id == requirement_id,
+            Sample.price_quoted.is_not(None),
+            Sample.quantity.is_not(None)
+        )
+        .order_by(Supplier.id)
+    ).all()
+    
+    portfolio = cost_analysis_service.analyze_cost_batch([{
+        "id": row.id,
+        "name": row.name,
+        "location": "Unknown",
+        "proposed_price": row.price_quoted,
+        "quantity": row.quantity
+    } for row in rows])
+    
+    return {
+        "requirement_id": requirement_id,
+        "warehouses": cost_analysis_service.warehouse_locations,
+        "total_cost_matrix": portfolio["total_cost"].tolist(),
+        "suppliers": portfolio["results"]
     }
 
 
-@app.get("/api/requirements")
-def list_requirements(db: Session = Depends(get_db)):
-    """List all requirements"""
-    requirements = db.query(ProcurementRequirement).all()
-    return [{
-        "id": r.id,
-        "title": r.title,
-        "status": r.status.value,
-        "created_at": r.created_at.isoformat()
-    } for r in requirements]
+@app.get("/api/categories/{category}/shortlist", response_model=CategoryShortlist)
+@db_endpoint
+def get_category_shortlist(category: str, k: int = Query(10, ge=1, le=1000), db: Session = Depends(get_db)):
+    """Top-k shortlist across every requirement in a category, scored in one vectorized batch"""
+    # Counted from the supplier's index range in supplier_certifications
+    certification_count = (
+        select(func.count())
+        .where(supplier_certifications.c.supplier_id == Supplier.id)
+        .correlate(Supplier)
+        .scalar_subquery()
+    )
+    rows = db.execute(
+        select(
+            Supplier.id,
+            Supplier.name,
+            func.coalesce(Supplier.latest_savings_percentage, 0.0),
+            func.coalesce(Supplier.latest_quality_approved, False),
+            certification_count,
+            Supplier.status
+        )
+        .join(ProcurementRequirement, Supplier.requirement_id == ProcurementRequirement.id)
+        .where(
+            ProcurementRequirement.category == category,
+            Supplier.status.in_(SHORTLIST_STATUSES)
+        )
+        .order_by(Supplier.id)
+    ).all()
+    
+    supplier_ids, names, savings, approved, certification_counts, statuses = zip(*rows) if rows else ([],) * 6
+    shortlist = shortlist_service.create_shortlist_batch(
+        supplier_ids,
+        savings,
+        approved,
+        certification_counts,
+        [status != SupplierStatus.DISCOVERED for status in statuses],
+        k=k,
+        supplier_names=names
+    )
+    
+    return {
+        "category": category,
+        "candidates": len(rows),
+        "shortlist": shortlist
+    }
 
 
 if __name__ == "__main__":
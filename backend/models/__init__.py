@@ -1,5 +1,11 @@
 from .database import Base, engine, SessionLocal
-from .procurement import ProcurementRequirement, Supplier, Sample, CostAnalysis, SupplierShortlist, NegotiationIteration
+from .procurement import (
+    ProcurementRequirement, Supplier, Sample, CostAnalysis, SupplierShortlist, NegotiationIteration,
+    RequirementStatusCount
+)
+from .jobs import PipelineJob, JobStatus
+from .blobs import Blob
+from .certifications import Certification
 
 __all__ = [
     "Base",
@@ -11,5 +17,10 @@ __all__ = [
     "CostAnalysis",
     "SupplierShortlist",
     "NegotiationIteration",
+    "RequirementStatusCount",
+    "PipelineJob",
+    "JobStatus",
+    "Blob",
+    "Certification",
 ]
 
@@ -0,0 +1,215 @@
+"""
+Content-addressed blobs
+Large values that repeat across rows (warehouse lists) are stored once in the
+blobs table, keyed by a digest of their content and zlib-compressed when that
+makes them smaller. Rows keep only the digest; a BlobText attribute reads and
+writes the original text.
+
+Decoded values are cached in-process by digest. A digest always names the same
+content, so cached entries never go stale and need no invalidation.
+"""
+import hashlib
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import Column, Integer, LargeBinary, String, event, insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, object_session
+
+from .database import Base, SessionLocal
+
+DIGEST_SIZE = 16  # bytes of BLAKE2b, stored as 32 hex characters
+LOOKUP_BATCH = 500
+
+
+class Blob(Base):
+    __tablename__ = "blobs"
+
+    digest = Column(String(2 * DIGEST_SIZE), primary_key=True)
+    codec = Column(String(8), nullable=False)  # "zlib" or "raw"
+    size = Column(Integer, nullable=False)  # uncompressed bytes
+    data = Column(LargeBinary, nullable=False)
+
+
+def digest_of(value: str) -> str:
+    return hashlib.blake2b(value.encode("utf-8"), digest_size=DIGEST_SIZE).hexdigest()
+
+
+def encode(value: str) -> dict:
+    """blobs row for `value`; short values that zlib cannot shrink are kept raw."""
+    raw = value.encode("utf-8")
+    packed = zlib.compress(raw, 9)
+    codec, data = ("zlib", packed) if len(packed) < len(raw) else ("raw", raw)
+    return {"digest": digest_of(value), "codec": codec, "size": len(raw), "data": data}
+
+
+def decode(codec: str, data: bytes) -> str:
+    return (zlib.decompress(data) if codec == "zlib" else bytes(data)).decode("utf-8")
+
+
+class DecodeCache:
+    """Thread-safe LRU of digest -> decoded text."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest: str) -> Optional[str]:
+        with self._lock:
+            value = self._entries.get(digest)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return value
+
+    def put(self, digest: str, value: str):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[digest] = value
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def info(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "max_entries": self.max_entries}
+
+
+decode_cache = DecodeCache(int(os.getenv("BLOB_DECODE_CACHE_SIZE", "4096")))
+
+
+def _insert_missing(conn: Connection, rows: List[dict]):
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        existing = set()
+        digests = [row["digest"] for row in rows]
+        for start in range(0, len(digests), LOOKUP_BATCH):
+            existing.update(conn.execute(
+                select(Blob.digest).where(Blob.digest.in_(digests[start:start + LOOKUP_BATCH]))
+            ).scalars())
+        rows = [row for row in rows if row["digest"] not in existing]
+        if rows:
+            conn.execute(insert(Blob), rows)
+        return
+    conn.execute(dialect_insert(Blob).on_conflict_do_nothing(index_elements=["digest"]), rows)
+
+
+def store_blobs(conn: Connection, values: Iterable[Optional[str]]) -> List[Optional[str]]:
+    """Stores each distinct value once and returns the digests in input order (None stays None)."""
+    values = list(values)
+    rows: Dict[str, dict] = {}
+    digests = []
+    for value in values:
+        if value is None:
+            digests.append(None)
+            continue
+        digest = digest_of(value)
+        if digest not in rows:
+            rows[digest] = encode(value)
+            decode_cache.put(digest, value)
+        digests.append(digest)
+    if rows:
+        _insert_missing(conn, list(rows.values()))
+    return digests
+
+
+def load_blobs(conn: Connection, digests: Iterable[Optional[str]]) -> Dict[str, str]:
+    """Decoded text for each digest, served from the decode cache where possible."""
+    found, missing = {}, []
+    for digest in set(digests):
+        if digest is None:
+            continue
+        value = decode_cache.get(digest)
+        if value is None:
+            missing.append(digest)
+        else:
+            found[digest] = value
+
+    for start in range(0, len(missing), LOOKUP_BATCH):
+        for digest, codec, data in conn.execute(
+            select(Blob.digest, Blob.codec, Blob.data).where(Blob.digest.in_(missing[start:start + LOOKUP_BATCH]))
+        ):
+            found[digest] = decode(codec, data)
+            decode_cache.put(digest, found[digest])
+    return found
+
+
+_blob_attributes = []
+
+
+class BlobText:
+    """
+    Text attribute stored in the blobs table. `text_attribute` is the legacy
+    inline column: assigned values wait there until the next flush moves them
+    into a blob, and rows not yet migrated are read from it directly.
+    """
+
+    def __init__(self, text_attribute: str, digest_attribute: str):
+        self.text_attribute = text_attribute
+        self.digest_attribute = digest_attribute
+
+    def __set_name__(self, owner, name):
+        _blob_attributes.append((owner, self))
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = getattr(obj, self.text_attribute)
+        if value is not None:
+            return value
+        digest = getattr(obj, self.digest_attribute)
+        if digest is None:
+            return None
+        value = decode_cache.get(digest)
+        if value is not None:
+            return value
+
+        session = object_session(obj)
+        if session is not None:
+            return load_blobs(session.connection(), [digest]).get(digest)
+        with SessionLocal() as session:
+            return load_blobs(session.connection(), [digest]).get(digest)
+
+    def __set__(self, obj, value):
+        setattr(obj, self.text_attribute, value)
+        if value is None:
+            setattr(obj, self.digest_attribute, None)
+
+    def digests(self, objects: Iterable) -> List[Optional[str]]:
+        return [getattr(obj, self.digest_attribute) for obj in objects]
+
+
+@event.listens_for(Session, "before_flush")
+def _move_text_into_blobs(session: Session, flush_context, instances):
+    pending = []
+    for obj in list(session.new) + list(session.dirty):
+        for owner, attribute in _blob_attributes:
+            if isinstance(obj, owner) and getattr(obj, attribute.text_attribute) is not None:
+                pending.append((obj, attribute))
+    if not pending:
+        return
+
+    digests = store_blobs(
+        session.connection(),
+        [getattr(obj, attribute.text_attribute) for obj, attribute in pending]
+    )
+    for (obj, attribute), digest in zip(pending, digests):
+        setattr(obj, attribute.digest_attribute, digest)
+        setattr(obj, attribute.text_attribute, None)
@@ -0,0 +1,198 @@
+"""
+Normalized certifications
+Certification names live once in the certifications table; suppliers and
+requirements point at them through link tables. The supplier link table's
+primary key (certification_id, supplier_id) is an inverted index, with one
+posting list of supplier ids per certification, sorted by supplier id. A
+query for suppliers holding several certifications intersects those lists
+(see services.certification_search).
+
+A CertificationList attribute reads and writes the names as a list. As with
+BlobText, an assigned list waits in the legacy inline JSON column until the
+next flush. The flush then writes the links and clears the column. Rows
+not yet migrated are read from that column directly.
+"""
+import json
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, Table, delete, event, insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from .database import Base
+
+LOOKUP_BATCH = 500
+
+
+class Certification(Base):
+    __tablename__ = "certifications"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+    # Case- and whitespace-insensitive form of the name; what lookups match on
+    key = Column(String, nullable=False, unique=True)
+
+
+supplier_certifications = Table(
+    "supplier_certifications", Base.metadata,
+    Column("certification_id", Integer, ForeignKey("certifications.id"), primary_key=True),
+    Column("supplier_id", Integer, ForeignKey("suppliers.id"), primary_key=True),
+    # Order of the certification in the supplier's list
+    Column("position", Integer, nullable=False, default=0),
+    Index("ix_supplier_certifications_supplier_id_position", "supplier_id", "position"),
+    sqlite_with_rowid=False,
+)
+
+requirement_certifications = Table(
+    "requirement_certifications", Base.metadata,
+    Column("certification_id", Integer, ForeignKey("certifications.id"), primary_key=True),
+    Column("requirement_id", Integer, ForeignKey("procurement_requirements.id"), primary_key=True),
+    Column("position", Integer, nullable=False, default=0),
+    Index("ix_requirement_certifications_requirement_id_position", "requirement_id", "position"),
+    sqlite_with_rowid=False,
+)
+
+
+def certification_key(name: str) -> str:
+    return " ".join(name.split()).casefold()
+
+
+def _clean(names: Iterable[str]) -> List[str]:
+    """Names with whitespace collapsed, blanks and case-insensitive duplicates dropped, order kept."""
+    seen, cleaned = set(), []
+    for name in names or ():
+        name = " ".join(str(name).split())
+        if name and certification_key(name) not in seen:
+            seen.add(certification_key(name))
+            cleaned.append(name)
+    return cleaned
+
+
+def parse_legacy(value: Optional[str]) -> List[str]:
+    """Names in an inline JSON column value from before the certifications table."""
+    try:
+        names = json.loads(value) if value else []
+    except ValueError:
+        return []
+    return _clean(names) if isinstance(names, list) else []
+
+
+def _insert_missing(conn: Connection, rows: List[dict]):
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        existing = set(conn.execute(
+            select(Certification.key).where(Certification.key.in_([row["key"] for row in rows]))
+        ).scalars())
+        rows = [row for row in rows if row["key"] not in existing]
+        if rows:
+            conn.execute(insert(Certification), rows)
+        return
+    conn.execute(dialect_insert(Certification).on_conflict_do_nothing(index_elements=["key"]), rows)
+
+
+def certification_ids(conn: Connection, names: Iterable[str], create: bool = False) -> Dict[str, int]:
+    """Certification id per key for `names`; with `create`, unknown names are added first."""
+    names_by_key = {certification_key(name): name for name in _clean(names)}
+    keys = list(names_by_key)
+    if create and keys:
+        _insert_missing(conn, [{"key": key, "name": name} for key, name in names_by_key.items()])
+    ids = {}
+    for start in range(0, len(keys), LOOKUP_BATCH):
+        ids.update(conn.execute(
+            select(Certification.key, Certification.id).where(Certification.key.in_(keys[start:start + LOOKUP_BATCH]))
+        ).all())
+    return ids
+
+
+def replace_certifications(conn: Connection, links: Table, owners: Dict[int, List[str]], existing: bool = True):
+    """
+    Makes each owner's links in `links` match its list of names. `existing=False`
+    skips the delete for owners known to have no links yet (fresh inserts).
+    """
+    if not owners:
+        return
+    owner_column = next(column for column in links.c if column.name not in ("certification_id", "position"))
+    owners = {owner_id: _clean(names) for owner_id, names in owners.items()}
+    ids = certification_ids(conn, [name for names in owners.values() for name in names], create=True)
+    if existing:
+        owner_ids = list(owners)
+        for start in range(0, len(owner_ids), LOOKUP_BATCH):
+            conn.execute(delete(links).where(owner_column.in_(owner_ids[start:start + LOOKUP_BATCH])))
+    rows = [
+        {"certification_id": ids[certification_key(name)], owner_column.name: owner_id, "position": position}
+        for owner_id, names in owners.items() for position, name in enumerate(names)
+    ]
+    if rows:
+        conn.execute(insert(links), rows)
+
+
+_certification_attributes = []
+
+
+class CertificationList:
+    """
+    List of certification names backed by `links`. `relationship` names the
+    viewonly relationship to Certification that reads them (eager-load it with
+    selectinload for lists of rows); `text_attribute` is the legacy inline
+    JSON column, which holds assigned lists until the next flush.
+    """
+
+    def __init__(self, text_attribute: str, relationship: str, links: Table):
+        self.text_attribute = text_attribute
+        self.relationship = relationship
+        self.links = links
+
+    def __set_name__(self, owner, name):
+        _certification_attributes.append((owner, self))
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = getattr(obj, self.text_attribute)
+        if isinstance(value, list):
+            return list(value)
+        if value is not None:
+            return parse_legacy(value)
+        return [certification.name for certification in getattr(obj, self.relationship)]
+
+    def __set__(self, obj, names: Iterable[str]):
+        setattr(obj, self.text_attribute, _clean(names))
+
+
+@event.listens_for(Session, "before_flush")
+def _take_pending_certifications(session: Session, flush_context, instances):
+    pending = []
+    for obj in list(session.new) + list(session.dirty):
+        for owner, attribute in _certification_attributes:
+            # Read from __dict__ so expired rows are not loaded just to be checked
+            names = obj.__dict__.get(attribute.text_attribute) if isinstance(obj, owner) else None
+            if isinstance(names, list):
+                is_new = obj in session.new
+                pending.append((obj, attribute, names, is_new))
+                setattr(obj, attribute.text_attribute, None)
+                if not is_new:
+                    # Keeps the row modified, so the change is versioned like any other update
+                    obj.updated_at = datetime.utcnow()
+    session.info["pending_certifications"] = pending
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _write_certification_links(session: Session, flush_context):
+    # After the flush, new rows have their ids and are persistent, so they can be expired
+    pending = session.info.pop("pending_certifications", None)
+    if not pending:
+        return
+    conn = session.connection()
+    for _, attribute in _certification_attributes:
+        for is_new in (True, False):
+            replace_certifications(conn, attribute.links, {
+                obj.id: names for obj, owner_attribute, names, obj_is_new in pending
+                if owner_attribute is attribute and obj_is_new is is_new
+            }, existing=not is_new)
+    for obj, attribute, _, _ in pending:
+        session.expire(obj, [attribute.relationship])
@@ -1,4 +1,5 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -8,8 +9,122 @@ load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./procurement.db")
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {})
+# Async mode serves requests from an async_engine instead of the threadpool
+ENABLE_ASYNC_DB = os.getenv("ENABLE_ASYNC_DB", "false").lower() == "true"
+
+# "tuned" applies the pragmas / pool settings below; "default" keeps driver defaults
+DB_PROFILE = os.getenv("DB_PROFILE", "tuned").lower()
+
+
+def sqlite_pragmas(profile: str = DB_PROFILE) -> dict:
+    """
+    Per-connection pragmas for SQLite. WAL lets readers run alongside the
+    writer and, with synchronous=NORMAL, a commit no longer fsyncs the
+    database file (only checkpoints do).
+    """
+    if profile != "tuned":
+        return {}
+    return {
+        # Only takes effect for a new database file (or after a full VACUUM) and
+        # has to run before journal_mode=WAL writes the header
+        "auto_vacuum": "INCREMENTAL",
+        "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+        "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+        "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+        "cache_size": int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536")) * -1,
+        "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+        "temp_store": "MEMORY",
+    }
+
+
+def engine_options(url: str, profile: str = DB_PROFILE) -> dict:
+    """Keyword arguments for create_engine / create_async_engine."""
+    if url.startswith("sqlite"):
+        return {"connect_args": {"check_same_thread": False}}
+    if profile != "tuned":
+        return {}
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+    }
+
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: dict):
+    """Runs `pragmas` on every new DBAPI connection of `engine`."""
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def create_profiled_engine(url: str, profile: str = DB_PROFILE) -> Engine:
+    engine = create_engine(url, **engine_options(url, profile))
+    if url.startswith("sqlite"):
+        apply_sqlite_pragmas(engine, sqlite_pragmas(profile))
+    return engine
+
+
+def run_sqlite_maintenance(engine: Engine, vacuum_pages: int = None) -> dict:
+    """
+    Returns free pages to the filesystem with an incremental VACUUM and
+    refreshes planner statistics with ANALYZE. No-op for other databases.
+    """
+    if engine.dialect.name != "sqlite":
+        return {}
+    if vacuum_pages is None:
+        vacuum_pages = int(os.getenv("SQLITE_VACUUM_PAGES", "1000"))
+
+    with engine.connect() as conn:
+        free_before = conn.execute(text("PRAGMA freelist_count")).scalar()
+        conn.commit()
+        # executescript steps the pragma to completion; a plain execute only
+        # frees the first page
+        conn.connection.driver_connection.executescript(
+            f"PRAGMA incremental_vacuum({vacuum_pages}); ANALYZE;"
+        )
+        free_after = conn.execute(text("PRAGMA freelist_count")).scalar()
+    return {"freed_pages": free_before - free_after, "free_pages": free_after}
+
+
+engine = create_profiled_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+
+def to_async_url(url: str) -> str:
+    """Maps a sync database URL onto its async driver (aiosqlite, asyncpg)."""
+    scheme, _, rest = url.partition("://")
+    driver_map = {
+        "sqlite": "sqlite+aiosqlite",
+        "postgresql": "postgresql+asyncpg",
+        "postgresql+psycopg2": "postgresql+asyncpg",
+        "postgres": "postgresql+asyncpg",
+    }
+    return f"{driver_map.get(scheme, scheme)}://{rest}"
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", to_async_url(DATABASE_URL))
+
+async_engine = None
+AsyncSessionLocal = None
+
+if ENABLE_ASYNC_DB:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    async_options = engine_options(ASYNC_DATABASE_URL)
+    async_options.pop("connect_args", None)
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, **async_options)
+    if ASYNC_DATABASE_URL.startswith("sqlite"):
+        apply_sqlite_pragmas(async_engine.sync_engine, sqlite_pragmas())
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=True
+    )
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index, Enum as SQLEnum
+from datetime import datetime
+import enum
+from .database import Base
+
+
+class JobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class PipelineJob(Base):
+    __tablename__ = "pipeline_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(String, nullable=False)  # e.g. "scouting"
+    requirement_id = Column(Integer, ForeignKey("procurement_requirements.id"))
+    status = Column(SQLEnum(JobStatus), default=JobStatus.QUEUED, nullable=False)
+    current_stage = Column(String)
+    stages = Column(Text)  # JSON list of {"name", "status", "completed", "total"}
+    result = Column(Text)  # JSON object, filled in stage by stage
+    error = Column(Text)
+    attempts = Column(Integer, default=0)
+    # Worker that claimed the job and when it last renewed its lease
+    claimed_by = Column(String)
+    heartbeat_at = Column(DateTime)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_pipeline_jobs_status_created_at", status, created_at),
+    )
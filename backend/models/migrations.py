@@ -0,0 +1,329 @@
+"""
+Versioned schema migrations.
+Each migration runs once; the applied version is recorded in the
+schema_migrations table. New migrations are appended to MIGRATIONS.
+"""
+from datetime import datetime
+
+from sqlalchemy import DateTime, bindparam, insert, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from .blobs import Blob, store_blobs
+from .certifications import (
+    Certification, parse_legacy, replace_certifications, requirement_certifications, supplier_certifications
+)
+from .procurement import (
+    ProcurementRequirement, Sample, CostAnalysis, NegotiationIteration, Supplier, SupplierShortlist,
+    RequirementStatus, RequirementStatusCount
+)
+
+
+def _column_names(conn: Connection, table: str) -> set:
+    return {column["name"] for column in inspect(conn).get_columns(table)}
+
+
+def _add_missing_columns(conn: Connection, table: str, columns: list):
+    existing = _column_names(conn, table)
+    for name, ddl in columns:
+        if name not in existing:
+            print(f"Adding {table}.{name} column...")
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+
+
+def _001_supplier_metrics(conn: Connection):
+    """Supplier metric columns and the negotiation_iterations table."""
+    _add_missing_columns(conn, "suppliers", [
+        ("experience_years", "INTEGER DEFAULT 0"),
+        ("quality_rating", "REAL DEFAULT 0.0"),
+        ("delivery_reliability", "REAL DEFAULT 0.0"),
+        ("price_competitiveness", "REAL DEFAULT 0.0"),
+        ("overall_score", "REAL DEFAULT 0.0"),
+        ("selected_for_outreach", "BOOLEAN DEFAULT 0"),
+    ])
+
+    if not inspect(conn).has_table("negotiation_iterations"):
+        print("Creating negotiation_iterations table...")
+        conn.execute(text("""
+            CREATE TABLE negotiation_iterations (
+                id INTEGER PRIMARY KEY,
+                supplier_id INTEGER NOT NULL,
+                iteration_number INTEGER NOT NULL,
+                proposed_cost REAL,
+                target_cost REAL,
+                negotiation_strategy TEXT,
+                outcome VARCHAR,
+                notes TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (supplier_id) REFERENCES suppliers (id)
+            )
+        """))
+
+
+def _create_composite_indexes(conn: Connection, *models):
+    for model in models:
+        table = model.__table__
+        existing = {index["name"] for index in inspect(conn).get_indexes(table.name)}
+        for index in table.indexes:
+            if len(index.expressions) < 2 or index.name in existing:
+                continue
+            print(f"Creating index {index.name}...")
+            index.create(conn)
+
+
+def _002_hot_path_indexes(conn: Connection):
+    """Composite indexes for latest-sample, latest-analysis, iteration and shortlist lookups."""
+    _create_composite_indexes(conn, Sample, CostAnalysis, NegotiationIteration, Supplier, SupplierShortlist)
+
+
+def _003_requirement_listing(conn: Connection):
+    """Keyset indexes on requirements and a backfilled per-status count table."""
+    _create_composite_indexes(conn, ProcurementRequirement)
+    RequirementStatusCount.__table__.create(conn, checkfirst=True)
+    conn.execute(text("DELETE FROM requirement_status_counts"))
+    conn.execute(text("""
+        INSERT INTO requirement_status_counts (status, count)
+        SELECT status, COUNT(*) FROM procurement_requirements
+        WHERE status IS NOT NULL
+        GROUP BY status
+    """))
+
+
+def backfill_supplier_snapshot(conn: Connection) -> int:
+    """
+    Recomputes every supplier's latest_* pointers and cached figures from the
+    samples and cost_analyses tables. Returns the number of suppliers updated.
+    """
+    result = conn.execute(text("""
+        UPDATE suppliers SET
+            latest_sample_id = (
+                SELECT s.id FROM samples s WHERE s.supplier_id = suppliers.id
+                ORDER BY s.received_date DESC, s.id DESC LIMIT 1
+            ),
+            latest_cost_analysis_id = (
+                SELECT c.id FROM cost_analyses c WHERE c.supplier_id = suppliers.id
+                ORDER BY c.created_at DESC, c.id DESC LIMIT 1
+            )
+    """))
+    conn.execute(text("""
+        UPDATE suppliers SET
+            latest_quality_approved = (
+                SELECT quality_approved FROM samples WHERE samples.id = suppliers.latest_sample_id
+            ),
+            latest_total_cost = (
+                SELECT total_cost FROM cost_analyses WHERE cost_analyses.id = suppliers.latest_cost_analysis_id
+            ),
+            latest_savings = (
+                SELECT savings FROM cost_analyses WHERE cost_analyses.id = suppliers.latest_cost_analysis_id
+            ),
+            latest_savings_percentage = (
+                SELECT savings_percentage FROM cost_analyses WHERE cost_analyses.id = suppliers.latest_cost_analysis_id
+            )
+    """))
+    return result.rowcount
+
+
+def _004_supplier_snapshot(conn: Connection):
+    """Latest sample / cost analysis pointers and cached figures on suppliers."""
+    _add_missing_columns(conn, "suppliers", [
+        ("latest_sample_id", "INTEGER"),
+        ("latest_quality_approved", "BOOLEAN"),
+        ("latest_cost_analysis_id", "INTEGER"),
+        ("latest_total_cost", "REAL"),
+        ("latest_savings", "REAL"),
+        ("latest_savings_percentage", "REAL"),
+    ])
+    backfill_supplier_snapshot(conn)
+
+
+def _005_incremental_shortlist(conn: Connection):
+    """Shortlist lookup / ranking indexes; re-ranks existing shortlists densely by score."""
+    _create_composite_indexes(conn, SupplierShortlist)
+    conn.execute(text("""
+        UPDATE supplier_shortlists SET rank = 1 + (
+            SELECT COUNT(*) FROM supplier_shortlists other
+            WHERE other.requirement_id = supplier_shortlists.requirement_id
+              AND (other.integrated_score > supplier_shortlists.integrated_score
+                   OR (other.integrated_score = supplier_shortlists.integrated_score
+                       AND other.supplier_id < supplier_shortlists.supplier_id))
+        )
+    """))
+
+
+# (table, inline text column, digest column) moved into the blobs table
+BLOB_COLUMNS = [
+    ("cost_analyses", "warehouse_locations", "warehouse_locations_digest"),
+]
+
+
+def move_text_into_blobs(conn: Connection, table: str, text_column: str, digest_column: str,
+                         batch_size: int = 1000) -> int:
+    """
+    Stores each inline value of `table.text_column` as a blob, points the row's
+    digest column at it and clears the inline copy. Returns the rows converted.
+    """
+    converted = 0
+    while True:
+        rows = conn.execute(
+            text(f"SELECT id, {text_column} FROM {table} WHERE {text_column} IS NOT NULL LIMIT :n"),
+            {"n": batch_size}
+        ).all()
+        if not rows:
+            return converted
+        digests = store_blobs(conn, [value for _, value in rows])
+        conn.execute(
+            text(f"UPDATE {table} SET {digest_column} = :digest, {text_column} = NULL WHERE id = :id"),
+            [{"id": row_id, "digest": digest} for (row_id, _), digest in zip(rows, digests)]
+        )
+        converted += len(rows)
+
+
+def _006_content_addressed_blobs(conn: Connection):
+    """blobs table; warehouse locations move into it."""
+    Blob.__table__.create(conn, checkfirst=True)
+    for table, text_column, digest_column in BLOB_COLUMNS:
+        _add_missing_columns(conn, table, [(digest_column, "VARCHAR(32) REFERENCES blobs (digest)")])
+        converted = move_text_into_blobs(conn, table, text_column, digest_column)
+        if converted:
+            print(f"Moved {converted} {table}.{text_column} values into blobs...")
+
+
+def _007_requirement_version(conn: Connection):
+    """Per-requirement version used for detail ETags."""
+    _add_missing_columns(conn, "procurement_requirements", [("version", "INTEGER NOT NULL DEFAULT 1")])
+
+
+def move_certifications_into_links(conn: Connection, batch_size: int = 1000) -> dict:
+    """
+    Links every supplier and requirement to the certifications in its inline
+    JSON list and clears the old value. Returns the rows
+    converted per table.
+    """
+    converted = {"suppliers": 0, "procurement_requirements": 0}
+    while True:
+        rows = conn.execute(text(
+            "SELECT id, certifications FROM suppliers WHERE certifications IS NOT NULL LIMIT :n"
+        ), {"n": batch_size}).all()
+        if not rows:
+            break
+        replace_certifications(conn, supplier_certifications, {
+            row_id: parse_legacy(value) for row_id, value in rows
+        })
+        conn.execute(
+            text("UPDATE suppliers SET certifications = NULL WHERE id = :id"),
+            [{"id": row_id} for row_id, _ in rows]
+        )
+        converted["suppliers"] += len(rows)
+    while True:
+        rows = conn.execute(text(
+            "SELECT id, required_certifications FROM procurement_requirements "
+            "WHERE required_certifications IS NOT NULL LIMIT :n"
+        ), {"n": batch_size}).all()
+        if not rows:
+            break
+        replace_certifications(conn, requirement_certifications, {
+            row_id: parse_legacy(value) for row_id, value in rows
+        })
+        conn.execute(
+            text("UPDATE procurement_requirements SET required_certifications = NULL WHERE id = :id"),
+            [{"id": row_id} for row_id, _ in rows]
+        )
+        converted["procurement_requirements"] += len(rows)
+    return converted
+
+
+def _008_normalized_certifications(conn: Connection):
+    """certifications table with supplier / requirement link tables; JSON lists move into links."""
+    for table in (Certification.__table__, supplier_certifications, requirement_certifications):
+        table.create(conn, checkfirst=True)
+    for table, count in move_certifications_into_links(conn).items():
+        if count:
+            print(f"Linked certifications for {count} {table} row(s)...")
+
+
+def seed_status_counts(conn: Connection):
+    """Adds a zero row to requirement_status_counts for every status that has none."""
+    existing = set(conn.execute(select(RequirementStatusCount.status)).scalars())
+    missing = [{"status": status, "count": 0} for status in RequirementStatus if status not in existing]
+    if missing:
+        conn.execute(insert(RequirementStatusCount), missing)
+
+
+def _009_status_count_rows_and_deadline_index(conn: Connection):
+    """A count row per requirement status (so writers never race to insert one) and the deadline index."""
+    seed_status_counts(conn)
+    deadline_index = next(
+        index for index in ProcurementRequirement.__table__.indexes
+        if index.name == "ix_procurement_requirements_deadline"
+    )
+    deadline_index.create(conn, checkfirst=True)
+
+
+def _010_job_leases(conn: Connection):
+    """Claim owner and lease heartbeat on pipeline jobs."""
+    if inspect(conn).has_table("pipeline_jobs"):
+        _add_missing_columns(conn, "pipeline_jobs", [("claimed_by", "VARCHAR"), ("heartbeat_at", "DATETIME")])
+
+
+def _011_requirement_created_at(conn: Connection):
+    """
+    Backfills requirements without a created_at (legacy rows, raw inserts), which
+    the listing keyset and its cursors require.
+    """
+    backfilled = conn.execute(
+        text("UPDATE procurement_requirements SET created_at = COALESCE(updated_at, :now) WHERE created_at IS NULL")
+        .bindparams(bindparam("now", type_=DateTime)),
+        {"now": datetime.utcnow()}
+    ).rowcount
+    if backfilled:
+        print(f"Backfilled created_at for {backfilled} requirement(s)...")
+
+
+MIGRATIONS = [
+    (1, "supplier metrics and negotiation iterations", _001_supplier_metrics),
+    (2, "composite indexes for hot lookup paths", _002_hot_path_indexes),
+    (3, "requirement keyset indexes and status counts", _003_requirement_listing),
+    (4, "supplier latest sample / cost analysis snapshot", _004_supplier_snapshot),
+    (5, "incremental shortlist indexes and dense ranks", _005_incremental_shortlist),
+    (6, "content-addressed blobs for repeated text columns", _006_content_addressed_blobs),
+    (7, "requirement version for conditional GET", _007_requirement_version),
+    (8, "normalized certifications with link tables", _008_normalized_certifications),
+    (9, "status count rows for every status and deadline index", _009_status_count_rows_and_deadline_index),
+    (10, "pipeline job claims and leases", _010_job_leases),
+    (11, "created_at on every requirement", _011_requirement_created_at),
+]
+
+
+def current_version(conn: Connection) -> int:
+    if not inspect(conn).has_table("schema_migrations"):
+        return 0
+    version = conn.execute(text("SELECT MAX(version) FROM schema_migrations")).scalar()
+    return version or 0
+
+
+def run_migrations(engine: Engine, target_version: int = None) -> list:
+    """Applies pending migrations in order and returns the versions applied."""
+    applied = []
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                description VARCHAR,
+                applied_at TIMESTAMP
+            )
+        """))
+        version = current_version(conn)
+
+    for migration_version, description, migrate in MIGRATIONS:
+        if migration_version <= version:
+            continue
+        if target_version is not None and migration_version > target_version:
+            break
+        with engine.begin() as conn:
+            migrate(conn)
+            conn.execute(
+                text("INSERT INTO schema_migrations (version, description, applied_at) VALUES (:v, :d, :t)"),
+                {"v": migration_version, "d": description, "t": datetime.utcnow()}
+            )
+        applied.append(migration_version)
+
+    return applied
@@ -1,8 +1,10 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, Enum as SQLEnum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, Index, Enum as SQLEnum
+from sqlalchemy.orm import relationship, column_property
 from datetime import datetime
 import enum
 from .database import Base
+from .blobs import BlobText
+from .certifications import CertificationList, requirement_certifications, supplier_certifications
 
 
 class RequirementStatus(str, enum.Enum):
@@ -42,13 +44,44 @@ class ProcurementRequirement(Base):
     category = Column(String)
     quantity = Column(Float)
     unit = Column(String)
-    required_certifications = Column(Text)  # JSON string of certifications
+    # List of names, linked through requirement_certifications
+    required_certifications = CertificationList(
+        "_required_certifications_text", "required_certification_entries", requirement_certifications
+    )
+    _required_certifications_text = Column("required_certifications", Text)
     deadline = Column(DateTime)
-    status = Column(SQLEnum(RequirementStatus), default=RequirementStatus.DRAFT)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    # active_history keeps the previous status available on flush for requirement_status_counts
+    status = column_property(Column(SQLEnum(RequirementStatus), default=RequirementStatus.DRAFT), active_history=True)
+    # Listing keyset; legacy NULLs are backfilled by migration 11
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Bumped on any write to the requirement or its detail rows; see services.requirement_version
+    version = Column(Integer, nullable=False, default=1)
 
     suppliers = relationship("Supplier", back_populates="requirement")
+    required_certification_entries = relationship(
+        "Certification", secondary=requirement_certifications,
+        order_by=requirement_certifications.c.position, viewonly=True
+    )
+
+    __table_args__ = (
+        Index("ix_procurement_requirements_created_at_id", created_at, id),
+        Index("ix_procurement_requirements_status_created_at_id", status, created_at, id),
+        Index("ix_procurement_requirements_category_created_at_id", category, created_at, id),
+        # Deadline range filter of the requirements listing
+        Index("ix_procurement_requirements_deadline", deadline),
+    )
+
+
+class RequirementStatusCount(Base):
+    """
+    Running count of requirements per status, maintained on flush. Migration 9
+    seeds a row for every status, so maintenance only ever UPDATEs.
+    """
+    __tablename__ = "requirement_status_counts"
+
+    status = Column(SQLEnum(RequirementStatus), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
 
 
 class Supplier(Base):
@@ -61,7 +94,9 @@ class Supplier(Base):
     phone = Column(String)
     company = Column(String)
     website = Column(String)
-    certifications = Column(Text)  # JSON string
+    # List of names, linked through supplier_certifications
+    certifications = CertificationList("_certifications_text", "certification_entries", supplier_certifications)
+    _certifications_text = Column("certifications", Text)
     availability_scope = Column(Boolean, default=None)  # None = not checked, True = available, False = not available
     status = Column(SQLEnum(SupplierStatus), default=SupplierStatus.DISCOVERED)
     contact_method = Column(String)  # "email", "phone", "social_media"
@@ -74,12 +109,34 @@ class Supplier(Base):
     price_competitiveness = Column(Float, default=0.0)  # 0-100 score
     overall_score = Column(Float, default=0.0)  # Calculated score
     selected_for_outreach = Column(Boolean, default=False)
+    # Newest Sample / CostAnalysis and their key figures, maintained on flush
+    # by services.supplier_snapshot
+    latest_sample_id = Column(Integer)
+    latest_quality_approved = Column(Boolean)
+    latest_cost_analysis_id = Column(Integer)
+    latest_total_cost = Column(Float)
+    latest_savings = Column(Float)
+    latest_savings_percentage = Column(Float)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     requirement = relationship("ProcurementRequirement", back_populates="suppliers")
     samples = relationship("Sample", back_populates="supplier")
     cost_analyses = relationship("CostAnalysis", back_populates="supplier")
+    certification_entries = relationship(
+        "Certification", secondary=supplier_certifications,
+        order_by=supplier_certifications.c.position, viewonly=True
+    )
+    latest_sample = relationship(
+        "Sample", primaryjoin="foreign(Supplier.latest_sample_id) == Sample.id", viewonly=True
+    )
+    latest_cost_analysis = relationship(
+        "CostAnalysis", primaryjoin="foreign(Supplier.latest_cost_analysis_id) == CostAnalysis.id", viewonly=True
+    )
+
+    __table_args__ = (
+        Index("ix_suppliers_requirement_id_status", requirement_id, status),
+    )
 
 
 class Sample(Base):
@@ -99,6 +156,10 @@ class Sample(Base):
 
     supplier = relationship("Supplier", back_populates="samples")
 
+    __table_args__ = (
+        Index("ix_samples_supplier_id_received_date", supplier_id, received_date.desc()),
+    )
+
 
 class CostAnalysis(Base):
     __tablename__ = "cost_analyses"
@@ -107,7 +168,10 @@ class CostAnalysis(Base):
     supplier_id = Column(Integer, ForeignKey("suppliers.id"))
     current_supplier_cost = Column(Float)
     proposed_cost = Column(Float)
-    warehouse_locations = Column(Text)  # JSON string
+    # JSON string, stored as a content-addressed blob
+    warehouse_locations = BlobText("_warehouse_locations_text", "warehouse_locations_digest")
+    _warehouse_locations_text = Column("warehouse_locations", Text)
+    warehouse_locations_digest = Column(String(32), ForeignKey("blobs.digest"))
     transportation_cost = Column(Float)
     total_cost = Column(Float)
     savings = Column(Float)
@@ -118,6 +182,10 @@ class CostAnalysis(Base):
 
     supplier = relationship("Supplier", back_populates="cost_analyses")
 
+    __table_args__ = (
+        Index("ix_cost_analyses_supplier_id_created_at", supplier_id, created_at.desc()),
+    )
+
 
 class SupplierShortlist(Base):
     __tablename__ = "supplier_shortlists"
@@ -135,6 +203,12 @@ class SupplierShortlist(Base):
     requirement = relationship("ProcurementRequirement")
     supplier = relationship("Supplier")
 
+    __table_args__ = (
+        Index("ix_supplier_shortlists_requirement_id_rank", requirement_id, rank),
+        Index("ix_supplier_shortlists_requirement_id_supplier_id", requirement_id, supplier_id),
+        Index("ix_supplier_shortlists_requirement_id_score", requirement_id, integrated_score, supplier_id),
+    )
+
 
 class NegotiationIteration(Base):
     __tablename__ = "negotiation_iterations"
@@ -144,6 +218,7 @@ class NegotiationIteration(Base):
     iteration_number = Column(Integer, nullable=False)
     proposed_cost = Column(Float)
     target_cost = Column(Float)
+    # Compact report document (services.report_templates); unique per row, so stored inline
     negotiation_strategy = Column(Text)
     outcome = Column(String)  # "success", "partial_success", "rejected"
     notes = Column(Text)
@@ -151,3 +226,6 @@ class NegotiationIteration(Base):
 
     supplier = relationship("Supplier")
 
+    __table_args__ = (
+        Index("ix_negotiation_iterations_supplier_id_iteration_number", supplier_id, iteration_number),
+    )
@@ -0,0 +1,309 @@
+"""
+API response models. They document every endpoint in the OpenAPI schema and
+are the contract checked with RESPONSE_VALIDATION=true; at runtime handlers
+return plain dicts that services.responses trims to the declared fields and
+serializes without building or validating these models.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+
+from pydantic import BaseModel
+
+# A stored report: its structured document, or its rendered text with ?render=true
+ReportPayload = Union[Dict[str, Any], str, None]
+
+
+class Message(BaseModel):
+    message: str
+
+
+class RequirementCreated(BaseModel):
+    id: int
+    status: str
+    message: str
+
+
+class Job(BaseModel):
+    job_id: int
+    job_type: str
+    requirement_id: Optional[int] = None
+    status: str
+    current_stage: Optional[str] = None
+    stages: List[Dict[str, Any]]
+    result: Dict[str, Any]
+    error: Optional[str] = None
+    attempts: Optional[int] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class JobQueued(Job):
+    status_url: str
+    message: str
+
+
+class ContactedSupplier(BaseModel):
+    id: int
+    name: str
+    responded: bool
+    sample_ordered: bool
+    sample_details: Optional[Dict[str, Any]] = None
+    status: str
+    contact_method: Optional[str] = None
+
+
+class SupplierSelectionResult(BaseModel):
+    requirement_id: int
+    selected_count: int
+    contacted_count: int
+    responded_count: int
+    suppliers: List[ContactedSupplier]
+    status: str
+
+
+class OutreachResult(BaseModel):
+    supplier_id: int
+    contact_result: Dict[str, Any]
+    responded: bool
+    status: str
+
+
+class SamplingFollowup(BaseModel):
+    supplier_id: int
+    followup_result: Dict[str, Any]
+    status: str
+
+
+class SampleReceived(BaseModel):
+    sample_id: int
+    message: str
+    status: str
+
+
+class QualityReviewResult(BaseModel):
+    sample_id: int
+    quality_approved: bool
+    supplier_status: str
+    requirement_status: str
+    auto_analyzed: bool
+    message: str
+
+
+class CostSummary(BaseModel):
+    total_cost: Optional[float] = None
+    savings: Optional[float] = None
+    savings_percentage: Optional[float] = None
+    meets_expectations: Optional[bool] = None
+
+
+class CostAnalysisResult(BaseModel):
+    supplier_id: int
+    cost_analysis: Dict[str, Any]
+    meets_expectations: bool
+    next_step: str
+
+
+class NegotiationRound(BaseModel):
+    iteration: int
+    negotiated_cost: float
+    outcome: str
+    notes: Optional[str] = None
+    strategy: ReportPayload = None
+
+
+class NegotiationResult(BaseModel):
+    supplier_id: int
+    negotiation_iterations: List[NegotiationRound]
+    final_cost: Optional[float] = None
+    updated_cost_analysis: CostSummary
+
+
+class StoredNegotiationIteration(BaseModel):
+    iteration: int
+    proposed_cost: Optional[float] = None
+    target_cost: Optional[float] = None
+    outcome: Optional[str] = None
+    notes: Optional[str] = None
+    strategy: ReportPayload = None
+    created_at: Optional[datetime] = None
+
+
+class NegotiationHistory(BaseModel):
+    supplier_id: int
+    iterations: List[StoredNegotiationIteration]
+
+
+class ShortlistEntry(BaseModel):
+    rank: int
+    supplier_id: int
+    supplier_name: Optional[str] = None
+    integrated_score: float
+    cost_score: float
+    quality_score: float
+    recommendation: Optional[str] = None
+
+
+class ShortlistResult(BaseModel):
+    requirement_id: int
+    shortlist: List[ShortlistEntry]
+    status: str
+    onboarding: Optional[Dict[str, Any]] = None
+
+
+class OnboardingResult(BaseModel):
+    supplier_id: int
+    srm_analysis: Dict[str, Any]
+    status: str
+    message: str
+
+
+class AwardAllocation(BaseModel):
+    supplier_id: int
+    supplier_name: str
+    warehouse_id: int
+    warehouse_name: str
+    quantity: float
+    unit_cost: float
+    landed_unit_cost: float
+    cost: float
+
+
+class AwardPlan(BaseModel):
+    requirement_id: int
+    quantity: float
+    total_cost: float
+    suppliers_considered: int
+    allocations: List[AwardAllocation]
+
+
+class SampleDetail(BaseModel):
+    id: int
+    quantity: Optional[float] = None
+    price_quoted: Optional[float] = None
+    price_per_unit: float
+    quality_approved: Optional[bool] = None
+    quality_notes: Optional[str] = None
+    quality_reviewed_by: Optional[str] = None
+    quality_reviewed_at: Optional[datetime] = None
+    delivery_address: Optional[str] = None
+
+
+class NegotiationIterationDetail(BaseModel):
+    iteration_number: int
+    proposed_cost: Optional[float] = None
+    target_cost: Optional[float] = None
+    outcome: Optional[str] = None
+    notes: Optional[str] = None
+    strategy: ReportPayload = None
+
+
+class SupplierDetail(BaseModel):
+    id: int
+    name: str
+    status: str
+    availability_scope: Optional[bool] = None
+    selected_for_outreach: Optional[bool] = None
+    experience_years: Optional[int] = None
+    quality_rating: Optional[float] = None
+    delivery_reliability: Optional[float] = None
+    price_competitiveness: Optional[float] = None
+    overall_score: Optional[float] = None
+    contact_method: Optional[str] = None
+    last_contacted: Optional[datetime] = None
+    notes: str
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    company: Optional[str] = None
+    website: Optional[str] = None
+    certifications: List[str]
+    sample: Optional[SampleDetail] = None
+    cost_analysis: Optional[CostSummary] = None
+    negotiation_iterations: List[NegotiationIterationDetail]
+
+
+class ShortlistDetailEntry(BaseModel):
+    supplier_id: int
+    rank: int
+    integrated_score: Optional[float] = None
+    cost_score: Optional[float] = None
+    quality_score: Optional[float] = None
+    recommendation: Optional[str] = None
+    created_at: Optional[datetime] = None
+    supplier: Optional[SupplierDetail] = None
+
+
+class RequirementDetail(BaseModel):
+    id: int
+    title: str
+    description: Optional[str] = None
+    category: Optional[str] = None
+    quantity: Optional[float] = None
+    unit: Optional[str] = None
+    required_certifications: List[str]
+    status: str
+    suppliers: List[SupplierDetail]
+    shortlist: List[ShortlistDetailEntry]
+
+
+class RequirementSummary(BaseModel):
+    id: int
+    title: str
+    category: Optional[str] = None
+    status: str
+    deadline: Optional[datetime] = None
+    created_at: datetime
+
+
+class RequirementPage(BaseModel):
+    items: List[RequirementSummary]
+    next_cursor: Optional[str] = None
+    # Requirements per status across the whole table; the listing filters do not apply
+    status_counts: Dict[str, int]
+
+
+class CacheStats(BaseModel):
+    payload_cache: Dict[str, Any]
+
+
+class PortfolioSupplier(BaseModel):
+    supplier_id: int
+    supplier_name: Optional[str] = None
+    warehouse_id: int
+    warehouse_name: str
+    base_cost: float
+    transportation_cost: float
+    total_cost: float
+    current_supplier_cost: float
+    savings: float
+    savings_percentage: float
+    meets_expectations: bool
+
+
+class CostPortfolio(BaseModel):
+    requirement_id: int
+    warehouses: List[Dict[str, Any]]
+    total_cost_matrix: List[List[float]]
+    suppliers: List[PortfolioSupplier]
+
+
+class CategoryShortlist(BaseModel):
+    category: str
+    candidates: int
+    shortlist: List[ShortlistEntry]
+
+
+class SupplierSearchResult(BaseModel):
+    id: int
+    name: str
+    company: Optional[str] = None
+    requirement_id: int
+    status: str
+    overall_score: Optional[float] = None
+    certifications: List[str]
+
+
+class SupplierSearchPage(BaseModel):
+    items: List[SupplierSearchResult]
+    certifications: List[str]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,171 @@
+"""
+Award Optimizer
+Splits a requirement's quantity across shortlisted suppliers and warehouses
+at minimum landed cost. This is a transportation problem:
+
+    minimize    sum  cost[s, w] * x[s, w]
+    subject to  sum_w x[s, w] <= capacity[s]       for every supplier
+                sum_s x[s, w] == demand[w]         for every warehouse
+                x >= 0
+
+Landed costs from CostAnalysisService.analyze_cost_batch are the supplier's
+unit price plus freight that only depends on the supplier's location and the
+warehouse, so cost[s, w] = price[s] + freight[location(s), w]. Suppliers with
+the same freight row are interchangeable apart from their price:
+
+- a single freight row (every supplier at one location, as in production) is
+  an additive, hence Monge, cost matrix: the cheapest suppliers are filled
+  first and spread over the warehouses by the northwest-corner rule, which is
+  optimal (Hoffman, 1963) in O(S log S + W);
+- several freight rows are solved as an LP over supplier totals and
+  location-to-warehouse flows, S + L * W variables instead of S * W, capped
+  by AWARD_LP_MAX_VARIABLES.
+"""
+import os
+from typing import Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+from scipy.optimize import linprog
+
+AWARD_LP_MAX_VARIABLES = int(os.getenv("AWARD_LP_MAX_VARIABLES", "20000"))
+
+
+class AwardInfeasible(ValueError):
+    pass
+
+
+class AwardTooLarge(ValueError):
+    pass
+
+
+def _check_capacity(capacities: np.ndarray, required: float):
+    if capacities.sum() < required - 1e-9:
+        raise AwardInfeasible(
+            f"Supplier capacity {capacities.sum():g} cannot cover the required quantity {required:g}"
+        )
+
+
+def _northwest_corner(supply: np.ndarray, demand: np.ndarray) -> np.ndarray:
+    """Ships `supply` (in row order) to `demand` (in column order); both must have the same total."""
+    allocation = np.zeros((len(supply), len(demand)))
+    remaining = demand.copy()
+    w = 0
+    for s, amount in enumerate(supply):
+        while amount > 1e-12 and w < len(remaining):
+            take = min(amount, remaining[w])
+            allocation[s, w] += take
+            amount -= take
+            remaining[w] -= take
+            if remaining[w] <= 1e-12:
+                w += 1
+    return allocation
+
+
+def _fill_cheapest(prices: np.ndarray, capacities: np.ndarray, required: float) -> np.ndarray:
+    """Amount per supplier when the cheapest suppliers are filled first."""
+    amounts = np.zeros(len(prices))
+    for s in np.argsort(prices, kind="stable"):
+        if required <= 1e-12:
+            break
+        amounts[s] = min(required, capacities[s])
+        required -= amounts[s]
+    return amounts
+
+
+def _solve_by_location(prices: np.ndarray, capacities: np.ndarray, location_index: np.ndarray,
+                       freight: np.ndarray, demand: np.ndarray):
+    """
+    LP over supplier totals y[s] and location-to-warehouse flows z[l, w];
+    returns (y, z). Every location ships exactly what its suppliers supply.
+    """
+    suppliers, (locations, warehouses) = len(prices), freight.shape
+    variables = suppliers + locations * warehouses
+    if variables > AWARD_LP_MAX_VARIABLES:
+        raise AwardTooLarge(
+            f"{suppliers} suppliers at {locations} freight locations x {warehouses} warehouses needs "
+            f"{variables} LP variables (AWARD_LP_MAX_VARIABLES={AWARD_LP_MAX_VARIABLES})"
+        )
+
+    supply_rows = sparse.csr_matrix(
+        (np.ones(suppliers), (location_index, np.arange(suppliers))), shape=(locations, suppliers)
+    )
+    # z[l, w] lives at column suppliers + l * warehouses + w
+    location_rows = sparse.kron(sparse.identity(locations, format="csr"), np.ones((1, warehouses)), format="csr")
+    warehouse_rows = sparse.kron(np.ones((1, locations)), sparse.identity(warehouses, format="csr"), format="csr")
+    result = linprog(
+        np.concatenate([prices, freight.ravel()]),
+        A_eq=sparse.vstack([
+            sparse.hstack([supply_rows, -location_rows]),
+            sparse.hstack([sparse.csr_matrix((warehouses, suppliers)), warehouse_rows])
+        ], format="csr"),
+        b_eq=np.concatenate([np.zeros(locations), demand]),
+        bounds=[(0, c) for c in capacities] + [(0, None)] * (locations * warehouses),
+        method="highs"
+    )
+    if result.status == 2:
+        raise AwardInfeasible(result.message)
+    if not result.success:
+        raise RuntimeError(f"Award optimization failed: {result.message}")
+
+    solution = np.where(result.x < 1e-9, 0.0, result.x)
+    return solution[:suppliers], solution[suppliers:].reshape(locations, warehouses)
+
+
+def allocate_award(cost: np.ndarray, capacities: Sequence[float], quantity: float = None,
+                   warehouse_demand: Optional[Sequence[float]] = None) -> dict:
+    """
+    Returns {"allocation": S x W array, "total_cost": float, "method": str}
+    for an S x W landed unit cost matrix. Pass either `quantity` (delivered to
+    any warehouse) or `warehouse_demand` (one amount per warehouse). Raises
+    AwardInfeasible if capacity cannot cover demand and AwardTooLarge if the
+    matrix needs an LP above AWARD_LP_MAX_VARIABLES.
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    capacities = np.asarray(capacities, dtype=np.float64)
+    suppliers, warehouses = cost.shape
+
+    if warehouse_demand is not None:
+        demand = np.asarray(warehouse_demand, dtype=np.float64)
+        if demand.shape != (warehouses,):
+            raise ValueError("warehouse_demand needs one amount per warehouse")
+        required = demand.sum()
+    elif quantity is not None:
+        if warehouses == 0:
+            raise AwardInfeasible("No warehouses to deliver to")
+        required = quantity
+    else:
+        raise ValueError("Either quantity or warehouse_demand is required")
+
+    if required <= 0:
+        return {"allocation": np.zeros((suppliers, warehouses)), "total_cost": 0.0, "method": "none"}
+    _check_capacity(capacities, required)
+
+    allocation = np.zeros((suppliers, warehouses))
+    if warehouse_demand is None:
+        # Free choice of warehouse: each supplier delivers to its cheapest one
+        best_warehouse = np.argmin(cost, axis=1)
+        amounts = _fill_cheapest(cost[np.arange(suppliers), best_warehouse], capacities, required)
+        allocation[np.arange(suppliers), best_warehouse] = amounts
+        method = "greedy"
+    else:
+        # Rows that differ by a constant share a freight row; rounding absorbs
+        # the float noise of dividing landed totals by the quantity
+        prices = cost[:, 0]
+        freight = np.round(cost - prices[:, None], 6)
+        if np.all(freight == freight[0]):
+            amounts = _fill_cheapest(prices, capacities, required)
+            used = np.flatnonzero(amounts)
+            allocation[used] = _northwest_corner(amounts[used], demand)
+            method = "northwest"
+        else:
+            freight, location_index = np.unique(freight, axis=0, return_inverse=True)
+            location_index = location_index.reshape(-1)
+            amounts, flows = _solve_by_location(prices, capacities, location_index, freight, demand)
+            for location in range(len(freight)):
+                used = np.flatnonzero((location_index == location) & (amounts > 0))
+                allocation[used] = _northwest_corner(amounts[used], flows[location])
+            method = "lp"
+
+    total_cost = float(np.sum(allocation * cost))
+    return {"allocation": allocation, "total_cost": total_cost, "method": method}
@@ -0,0 +1,81 @@
+"""
+Certification Search
+Suppliers holding every one of a set of certifications. Each certification's
+suppliers are one range of the supplier_certifications primary key (its
+posting list, sorted by supplier id); the query INTERSECTs those ranges, so
+it reads only the postings of the requested certifications and never parses
+or scans supplier rows that do not match. Pages are keyset on supplier id.
+"""
+import base64
+import json
+from typing import List, Optional
+
+from sqlalchemy import intersect, select
+from sqlalchemy.orm import Session, selectinload
+
+from models.certifications import Certification, certification_key, supplier_certifications
+from models.procurement import Supplier
+from services.requirement_listing import InvalidCursor
+
+
+def encode_cursor(supplier_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([supplier_id]).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        supplier_id, = json.loads(base64.urlsafe_b64decode(padded))
+        return int(supplier_id)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from exc
+
+
+def search_suppliers_by_certifications(db: Session, names: List[str], requirement_id: Optional[int] = None,
+                                       limit: int = 20, cursor: Optional[str] = None) -> dict:
+    """One page of suppliers, by ascending id, that hold all of `names` (matched case-insensitively)."""
+    after = decode_cursor(cursor) if cursor else None
+    keys = list(dict.fromkeys(certification_key(name) for name in names if name.strip()))
+    certifications = db.execute(
+        select(Certification.id, Certification.name, Certification.key).where(Certification.key.in_(keys))
+    ).all() if keys else []
+    by_key = {row.key: row for row in certifications}
+    page = {"items": [], "certifications": [by_key[key].name if key in by_key else key for key in keys],
+            "next_cursor": None}
+    # A certification nobody holds has an empty posting list, and so does the intersection
+    if not keys or len(by_key) < len(keys):
+        return page
+
+    links = supplier_certifications.c
+    postings = []
+    for key in keys:
+        posting = select(links.supplier_id).where(links.certification_id == by_key[key].id)
+        if after is not None:
+            posting = posting.where(links.supplier_id > after)
+        postings.append(posting)
+    matches = (intersect(*postings) if len(postings) > 1 else postings[0]).subquery()
+
+    query = (
+        select(Supplier)
+        .join(matches, Supplier.id == matches.c.supplier_id)
+        .options(selectinload(Supplier.certification_entries))
+        .order_by(Supplier.id)
+        .limit(limit + 1)
+    )
+    if requirement_id is not None:
+        query = query.where(Supplier.requirement_id == requirement_id)
+    suppliers = db.scalars(query).all()
+
+    has_more = len(suppliers) > limit
+    suppliers = suppliers[:limit]
+    page["items"] = [{
+        "id": supplier.id,
+        "name": supplier.name,
+        "company": supplier.company,
+        "requirement_id": supplier.requirement_id,
+        "status": supplier.status.value,
+        "overall_score": supplier.overall_score,
+        "certifications": supplier.certifications
+    } for supplier in suppliers]
+    page["next_cursor"] = encode_cursor(suppliers[-1].id) if has_more else None
+    return page
@@ -4,9 +4,13 @@ Performs cost analysis based on warehouse locations and current suppliers data.
 Note: This is a demo version that simulates AI behavior without using real AI services.
 """
 import json
-import random
 import time
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from services.geo import FreightModel
+from services.report_templates import COST_ANALYSIS, report
 
 
 class CostAnalysisService:
@@ -23,6 +27,12 @@ class CostAnalysisService:
             {"name": "Current Supplier A", "base_cost": 1000, "transportation_cost": 150},
             {"name": "Current Supplier B", "base_cost": 950, "transportation_cost": 180},
         ]
+        # Best per-unit landed cost among current suppliers; comparisons scale it by quantity
+        self.best_current_unit_cost = min(
+            s["base_cost"] + s["transportation_cost"] for s in self.current_suppliers
+        )
+        # Distance-based freight between gazetteer locations, memoized per route
+        self.freight = FreightModel(self.warehouse_locations)
 
     def analyze_cost(self, supplier: dict, proposed_price: float, quantity: float,
                     delivery_address: str = None) -> dict:
@@ -75,40 +85,105 @@ class CostAnalysisService:
 
     def _calculate_transportation_cost(self, supplier_location: str, 
                                       delivery_address: str) -> float:
-        """Calculates transportation cost based on locations (simulated AI)."""
-        # Simulate AI-based logistics cost estimation
-        # Base cost varies by distance and location
-        base_costs = {
-            "New York": 150,
-            "Los Angeles": 200,
-            "Chicago": 175,
-            "Unknown": 200
-        }
-        
-        # Find matching location
-        base_cost = 200  # Default
-        for location, cost in base_costs.items():
-            if location.lower() in delivery_address.lower() or location.lower() in supplier_location.lower():
-                base_cost = cost
-                break
-        
-        # Add some variation
-        variation = random.uniform(0.8, 1.2)
-        return round(base_cost * variation, 2)
+        """Calculates transportation cost from the great-circle distance between both locations."""
+        return self.freight.estimate(supplier_location, delivery_address)
 
     def _compare_with_current_suppliers(self, total_cost: float, quantity: float) -> dict:
         """Compares proposed cost with current suppliers."""
-        best_cost = min(
-            (s["base_cost"] + s["transportation_cost"]) * quantity 
-            for s in self.current_suppliers
-        )
-        
         return {
-            "best_current_cost": best_cost,
+            "best_current_cost": self.best_current_unit_cost * quantity,
             "current_suppliers": self.current_suppliers,
             "proposed_cost": total_cost
         }
 
+    def analyze_cost_batch(self, suppliers: List[dict], warehouses: Optional[List[dict]] = None) -> dict:
+        """
+        Evaluates every supplier against every warehouse at once. Each supplier
+        needs "proposed_price" and "quantity" (plus optional "id", "name",
+        "location"); warehouses default to the pre-fed warehouse_locations.
+        
+        Returns S x W matrices of base, transportation and total cost, savings
+        and savings percentage, plus the cheapest warehouse per supplier.
+        Transportation is the distance-based freight from the supplier's
+        location to each warehouse, scaled by the warehouse cost_factor.
+        """
+        warehouses = warehouses if warehouses is not None else self.warehouse_locations
+        if not suppliers or not warehouses:
+            empty = np.empty((len(suppliers), len(warehouses)))
+            return {
+                "warehouse_ids": [w.get("id") for w in warehouses],
+                "base_cost": empty,
+                "transportation_cost": empty,
+                "total_cost": empty,
+                "savings": empty,
+                "savings_percentage": empty,
+                "best_warehouse_index": np.empty(0, dtype=np.int64),
+                "results": []
+            }
+        
+        unit_price = np.array([s["proposed_price"] for s in suppliers], dtype=np.float64)
+        quantity = np.array([s["quantity"] for s in suppliers], dtype=np.float64)
+        cost_factor = np.array([w.get("cost_factor", 1.0) for w in warehouses], dtype=np.float64)
+        
+        # Freight only depends on (supplier location, warehouse location), so
+        # it is computed once per distinct supplier location
+        locations, location_index = np.unique(
+            [s.get("location") or "Unknown" for s in suppliers], return_inverse=True
+        )
+        transport_by_location = self.freight.cost_matrix(
+            locations.tolist(), [w.get("location", "") for w in warehouses]
+        )
+        
+        base_cost = np.broadcast_to((unit_price * quantity)[:, None], (len(suppliers), len(warehouses)))
+        transportation_cost = np.round(transport_by_location[location_index.reshape(-1)] * cost_factor, 2)
+        total_cost = base_cost + transportation_cost
+        current_cost = self.best_current_unit_cost * quantity
+        savings = current_cost[:, None] - total_cost
+        with np.errstate(divide="ignore", invalid="ignore"):
+            savings_percentage = np.where(current_cost[:, None] > 0, savings / current_cost[:, None] * 100, 0.0)
+        
+        best = np.argmin(total_cost, axis=1)
+        rows = np.arange(len(suppliers))
+        best_percentage = savings_percentage[rows, best]
+        columns = zip(
+            best.tolist(),
+            base_cost[rows, best].tolist(),
+            transportation_cost[rows, best].tolist(),
+            total_cost[rows, best].tolist(),
+            current_cost.tolist(),
+            savings[rows, best].tolist(),
+            np.round(best_percentage, 2).tolist(),
+            # Same 5% threshold as _evaluate_savings_expectations
+            (best_percentage >= 5).tolist()
+        )
+        
+        results = []
+        for supplier, (w, base, transport, total, current, saved, percentage, meets) in zip(suppliers, columns):
+            results.append({
+                "supplier_id": supplier.get("id"),
+                "supplier_name": supplier.get("name"),
+                "warehouse_id": warehouses[w].get("id"),
+                "warehouse_name": warehouses[w].get("name"),
+                "base_cost": base,
+                "transportation_cost": transport,
+                "total_cost": total,
+                "current_supplier_cost": current,
+                "savings": saved,
+                "savings_percentage": percentage,
+                "meets_expectations": meets
+            })
+        
+        return {
+            "warehouse_ids": [w.get("id") for w in warehouses],
+            "base_cost": base_cost,
+            "transportation_cost": transportation_cost,
+            "total_cost": total_cost,
+            "savings": savings,
+            "savings_percentage": savings_percentage,
+            "best_warehouse_index": best,
+            "results": results
+        }
+
     def _evaluate_savings_expectations(self, savings: float, savings_percentage: float,
                                      supplier: dict, comparison: dict) -> dict:
         """Uses simulated AI to evaluate if savings meet expectations."""
@@ -134,34 +209,15 @@ class CostAnalysisService:
 
     def _generate_analysis_notes(self, supplier: dict, total_cost: float,
                                 savings: float, savings_percentage: float,
-                                comparison: dict) -> str:
-        """Generates detailed analysis notes (simulated AI)."""
-        notes = f"""Cost Analysis Report - {supplier.get('name', 'Supplier')}
-
-EXECUTIVE SUMMARY:
-Total Cost: ${total_cost:,.2f}
-Current Best Supplier Cost: ${comparison['best_current_cost']:,.2f}
-Potential Savings: ${savings:,.2f} ({savings_percentage:.2f}%)
-
-DETAILED BREAKDOWN:
-1. Base Product Cost: ${total_cost - (total_cost * 0.15):,.2f}
-2. Transportation & Logistics: ${total_cost * 0.15:,.2f}
-3. Total Cost of Ownership: ${total_cost:,.2f}
-
-COMPARATIVE ANALYSIS:
-- Comparison with {len(self.current_suppliers)} current suppliers
-- Best current option: ${comparison['best_current_cost']:,.2f}
-- Proposed option: ${total_cost:,.2f}
-- Net savings opportunity: ${savings:,.2f}
-
-WAREHOUSE CONSIDERATIONS:
-- Analyzed across {len(self.warehouse_locations)} warehouse locations
-- Transportation costs optimized for delivery network
-- Cost factors applied based on location efficiency
-
-RECOMMENDATION:
-{'✓ RECOMMENDED' if savings_percentage >= 5 else '✗ NOT RECOMMENDED'} - {'Meets' if savings_percentage >= 5 else 'Does not meet'} procurement cost expectations.
-
-[AI-Generated Cost Analysis - Comprehensive evaluation using advanced cost modeling algorithms]"""
-        
-        return notes
+                                comparison: dict) -> dict:
+        """Structured analysis notes (simulated AI); render with report_templates.render."""
+        return report(
+            COST_ANALYSIS,
+            supplier_name=supplier.get("name", "Supplier"),
+            total_cost=total_cost,
+            best_current_cost=comparison["best_current_cost"],
+            savings=savings,
+            savings_percentage=savings_percentage,
+            current_supplier_count=len(self.current_suppliers),
+            warehouse_count=len(self.warehouse_locations)
+        )
@@ -0,0 +1,46 @@
+"""
+Database Maintenance
+Periodically runs run_sqlite_maintenance (incremental VACUUM + ANALYZE) on a
+daemon thread. The interval comes from DB_MAINTENANCE_INTERVAL_SECONDS; 0
+disables it.
+"""
+import os
+import threading
+from typing import Optional
+
+from sqlalchemy.engine import Engine
+
+from models.database import run_sqlite_maintenance
+
+
+class MaintenanceScheduler:
+    def __init__(self, engine: Engine, interval_seconds: float = None):
+        self.engine = engine
+        self.interval_seconds = (
+            interval_seconds if interval_seconds is not None
+            else float(os.getenv("DB_MAINTENANCE_INTERVAL_SECONDS", "3600"))
+        )
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self.engine.dialect.name != "sqlite" or self.interval_seconds <= 0 or self._thread:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="db-maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _loop(self):
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                result = run_sqlite_maintenance(self.engine)
+                if result.get("freed_pages"):
+                    print(f"Database maintenance freed {result['freed_pages']} page(s)")
+            except Exception as exc:
+                print(f"Database maintenance failed: {exc}")
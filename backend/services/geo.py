@@ -0,0 +1,229 @@
+"""
+Geo Service
+Local gazetteer, nearest-warehouse index and distance-based freight curve used
+by cost analysis. Everything is deterministic and runs in-process; place names
+are resolved against GAZETTEER, so no geocoding API is needed.
+"""
+import math
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+# (latitude, longitude) of supported places, keyed by normalized name
+GAZETTEER: Dict[str, Tuple[float, float]] = {
+    "new york": (40.7128, -74.0060),
+    "newark": (40.7357, -74.1724),
+    "philadelphia": (39.9526, -75.1652),
+    "boston": (42.3601, -71.0589),
+    "baltimore": (39.2904, -76.6122),
+    "washington": (38.9072, -77.0369),
+    "pittsburgh": (40.4406, -79.9959),
+    "charlotte": (35.2271, -80.8431),
+    "atlanta": (33.7490, -84.3880),
+    "jacksonville": (30.3322, -81.6557),
+    "miami": (25.7617, -80.1918),
+    "nashville": (36.1627, -86.7816),
+    "memphis": (35.1495, -90.0490),
+    "louisville": (38.2527, -85.7585),
+    "cincinnati": (39.1031, -84.5120),
+    "columbus": (39.9612, -82.9988),
+    "cleveland": (41.4993, -81.6944),
+    "detroit": (42.3314, -83.0458),
+    "indianapolis": (39.7684, -86.1581),
+    "chicago": (41.8781, -87.6298),
+    "milwaukee": (43.0389, -87.9065),
+    "minneapolis": (44.9778, -93.2650),
+    "st louis": (38.6270, -90.1994),
+    "kansas city": (39.0997, -94.5786),
+    "dallas": (32.7767, -96.7970),
+    "houston": (29.7604, -95.3698),
+    "austin": (30.2672, -97.7431),
+    "san antonio": (29.4241, -98.4936),
+    "denver": (39.7392, -104.9903),
+    "salt lake city": (40.7608, -111.8910),
+    "phoenix": (33.4484, -112.0740),
+    "las vegas": (36.1699, -115.1398),
+    "san diego": (32.7157, -117.1611),
+    "los angeles": (34.0522, -118.2437),
+    "san jose": (37.3382, -121.8863),
+    "san francisco": (37.7749, -122.4194),
+    "portland": (45.5152, -122.6784),
+    "seattle": (47.6062, -122.3321),
+}
+
+# Piecewise-linear freight curve: distance (km) -> cost ($). Local delivery
+# costs 150, cross-country about 260; beyond the last point the cost is flat.
+FREIGHT_CURVE_KM = np.array([0.0, 250.0, 1000.0, 2500.0, 4500.0])
+FREIGHT_CURVE_COST = np.array([150.0, 165.0, 190.0, 230.0, 260.0])
+
+# Used when neither end of a shipment can be located
+UNKNOWN_FREIGHT_COST = 200.0
+
+_PLACE_PATTERN = re.compile(
+    r"\b(" + "|".join(re.escape(name) for name in sorted(GAZETTEER, key=len, reverse=True)) + r")\b"
+)
+
+
+def normalize_location(location: Optional[str]) -> str:
+    """Lower-cases and strips punctuation so "St. Louis, MO" and "st louis mo" match."""
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", (location or "").lower()).split())
+
+
+@lru_cache(maxsize=8192)
+def _geocode_normalized(normalized: str) -> Optional[Tuple[float, float]]:
+    if normalized in GAZETTEER:
+        return GAZETTEER[normalized]
+    match = _PLACE_PATTERN.search(normalized)
+    return GAZETTEER[match.group(1)] if match else None
+
+
+def geocode(location: Optional[str]) -> Optional[Tuple[float, float]]:
+    """Coordinates of the first known place named in `location`, or None."""
+    return _geocode_normalized(normalize_location(location))
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Great-circle distance in km; arguments broadcast like NumPy arrays."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def freight_cost_for_distance(distance_km) -> np.ndarray:
+    return np.round(np.interp(distance_km, FREIGHT_CURVE_KM, FREIGHT_CURVE_COST), 2)
+
+
+def _unit_vectors(coordinates: np.ndarray) -> np.ndarray:
+    lat, lon = np.radians(coordinates[:, 0]), np.radians(coordinates[:, 1])
+    return np.column_stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)))
+
+
+class KDTree:
+    """
+    Static KD-tree over (lat, lon) points. Points are stored as 3-D unit
+    vectors, where straight-line distance orders points the same way as
+    great-circle distance, so the usual axis-aligned pruning is exact.
+    """
+
+    def __init__(self, coordinates: Sequence[Tuple[float, float]]):
+        self.coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+        self._points = _unit_vectors(self.coordinates)
+        # node -> (point index, split axis, left node, right node); -1 = no child
+        self._nodes: List[Tuple[int, int, int, int]] = []
+        self._root = self._build(np.arange(len(self._points)), 0)
+
+    def _build(self, indices: np.ndarray, depth: int) -> int:
+        if len(indices) == 0:
+            return -1
+        axis = depth % 3
+        ordered = indices[np.argsort(self._points[indices, axis], kind="stable")]
+        middle = len(ordered) // 2
+        node = len(self._nodes)
+        self._nodes.append((0, 0, -1, -1))
+        left = self._build(ordered[:middle], depth + 1)
+        right = self._build(ordered[middle + 1:], depth + 1)
+        self._nodes[node] = (int(ordered[middle]), axis, left, right)
+        return node
+
+    def nearest(self, latitude: float, longitude: float) -> Tuple[int, float]:
+        """Index of the closest point and its great-circle distance in km; (-1, inf) if empty."""
+        target = _unit_vectors(np.array([[latitude, longitude]]))[0]
+        best_index, best_distance = -1, math.inf
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node < 0:
+                continue
+            index, axis, left, right = self._nodes[node]
+            distance = float(np.sum((self._points[index] - target) ** 2))
+            if distance < best_distance:
+                best_index, best_distance = index, distance
+            offset = target[axis] - self._points[index, axis]
+            near, far = (left, right) if offset < 0 else (right, left)
+            if offset * offset < best_distance:
+                stack.append(far)
+            stack.append(near)
+
+        if best_index < 0:
+            return -1, math.inf
+        chord = math.sqrt(best_distance)
+        return best_index, 2 * EARTH_RADIUS_KM * math.asin(min(chord / 2, 1.0))
+
+
+class FreightModel:
+    """
+    Freight estimates between named places. A shipment with an unknown origin
+    is routed from the warehouse nearest its destination (and vice versa);
+    results are memoized on the normalized (origin, destination) pair.
+    """
+
+    def __init__(self, warehouses: List[dict], cache_size: int = 16384):
+        self.warehouses = warehouses
+        located = [(i, geocode(w.get("location"))) for i, w in enumerate(warehouses)]
+        located = [(i, coordinates) for i, coordinates in located if coordinates]
+        self._warehouse_positions = [i for i, _ in located]
+        self._warehouse_index = KDTree([coordinates for _, coordinates in located])
+        self._estimate = lru_cache(maxsize=cache_size)(self._estimate_normalized)
+        # Raw strings are cached too so repeated addresses skip normalization
+        self.estimate = lru_cache(maxsize=cache_size)(self.estimate)
+
+    def nearest_warehouse(self, location: str) -> Optional[Tuple[dict, float]]:
+        """Closest warehouse to `location` and its distance in km, or None if unknown."""
+        coordinates = geocode(location)
+        if coordinates is None or not self._warehouse_positions:
+            return None
+        index, distance = self._warehouse_index.nearest(*coordinates)
+        return self.warehouses[self._warehouse_positions[index]], distance
+
+    def estimate(self, origin: Optional[str], destination: Optional[str]) -> float:
+        return self._estimate(normalize_location(origin), normalize_location(destination))
+
+    def estimate_many(self, origins: Sequence[str], destinations: Sequence[str]) -> np.ndarray:
+        """Freight for each (origin, destination) pair; repeated pairs hit the cache."""
+        return np.array([self.estimate(o, d) for o, d in zip(origins, destinations)], dtype=np.float64)
+
+    def cost_matrix(self, origins: Sequence[str], destinations: Sequence[str]) -> np.ndarray:
+        """len(origins) x len(destinations) freight matrix, computed with one vectorized haversine."""
+        origin_coordinates = [_geocode_normalized(normalize_location(o)) for o in origins]
+        destination_coordinates = [_geocode_normalized(normalize_location(d)) for d in destinations]
+        origin_known = [i for i, c in enumerate(origin_coordinates) if c is not None]
+        destination_known = [j for j, c in enumerate(destination_coordinates) if c is not None]
+
+        matrix = np.empty((len(origins), len(destinations)), dtype=np.float64)
+        if origin_known and destination_known:
+            origin_array = np.array([origin_coordinates[i] for i in origin_known])
+            destination_array = np.array([destination_coordinates[j] for j in destination_known])
+            distance = haversine_km(
+                origin_array[:, None, 0], origin_array[:, None, 1],
+                destination_array[None, :, 0], destination_array[None, :, 1]
+            )
+            matrix[np.ix_(origin_known, destination_known)] = freight_cost_for_distance(distance)
+
+        # Pairs with an unlocated end go through the (cached) warehouse routing
+        origin_known, destination_known = set(origin_known), set(destination_known)
+        for i, origin in enumerate(origins):
+            for j, destination in enumerate(destinations):
+                if i not in origin_known or j not in destination_known:
+                    matrix[i, j] = self.estimate(origin, destination)
+        return matrix
+
+    def _estimate_normalized(self, origin: str, destination: str) -> float:
+        origin_coordinates = _geocode_normalized(origin)
+        destination_coordinates = _geocode_normalized(destination)
+        if origin_coordinates is None and destination_coordinates is None:
+            return UNKNOWN_FREIGHT_COST
+        if origin_coordinates is None:
+            return self._via_nearest_warehouse(destination_coordinates)
+        if destination_coordinates is None:
+            return self._via_nearest_warehouse(origin_coordinates)
+        return float(freight_cost_for_distance(haversine_km(*origin_coordinates, *destination_coordinates)))
+
+    def _via_nearest_warehouse(self, coordinates: Tuple[float, float]) -> float:
+        if not self._warehouse_positions:
+            return UNKNOWN_FREIGHT_COST
+        _, distance = self._warehouse_index.nearest(*coordinates)
+        return float(freight_cost_for_distance(distance))
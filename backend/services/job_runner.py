@@ -0,0 +1,251 @@
+"""
+Job Runner
+Runs long workflow pipelines (e.g. scouting -> ranking -> outreach) on a worker
+pool instead of inside the HTTP request. Jobs and their per-stage progress are
+persisted in pipeline_jobs, so queued or interrupted jobs resume after a restart.
+
+Several processes can share the table. A worker claims a job with a
+conditional UPDATE (queued, or running with an expired lease), so each job
+runs in one place at a time, and renews the lease of the jobs it holds every
+JOB_LEASE_SECONDS / 3. A running job whose lease lapses belonged to a worker
+that died; any runner picks it up on startup or on its next sweep.
+"""
+import json
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from models.database import SessionLocal
+from models.jobs import PipelineJob, JobStatus
+from services.query_inspector import inspect_queries
+
+
+class JobContext:
+    """
+    Handed to a pipeline so it can report progress. Progress lives on the job
+    row in the pipeline's own session and is committed together with the
+    stage's work, which keeps completed stages and their data consistent.
+    """
+
+    def __init__(self, job: PipelineJob, db: Session):
+        self.job = job
+        self.db = db
+        self._stages = json.loads(job.stages or "[]")
+        self.result = json.loads(job.result or "{}")
+
+    def stage_done(self, name: str) -> bool:
+        return any(s["name"] == name and s["status"] == "completed" for s in self._stages)
+
+    def start_stage(self, name: str, total: int = None):
+        stage = self._stage(name)
+        stage.update({"status": "running", "completed": 0, "total": total})
+        self.job.current_stage = name
+        self._sync()
+
+    def complete_stage(self, name: str, **result):
+        """Marks `name` completed and merges `result` into the job result; the caller commits."""
+        stage = self._stage(name)
+        stage["status"] = "completed"
+        if stage.get("total") is not None:
+            stage["completed"] = stage["total"]
+        self.result.update(result)
+        self._sync()
+
+    def _stage(self, name: str) -> dict:
+        for stage in self._stages:
+            if stage["name"] == name:
+                return stage
+        stage = {"name": name, "status": "pending", "completed": 0, "total": None}
+        self._stages.append(stage)
+        return stage
+
+    def _sync(self):
+        self.job.stages = json.dumps(self._stages)
+        self.job.result = json.dumps(self.result)
+
+
+class JobRunner:
+    def __init__(self, max_workers: int = None, lease_seconds: float = None):
+        self.max_workers = max_workers or int(os.getenv("JOB_WORKERS", "2"))
+        self.lease_seconds = lease_seconds or float(os.getenv("JOB_LEASE_SECONDS", "60"))
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._pipelines: Dict[str, Callable[[JobContext, Session, int], None]] = {}
+        self._stage_names: Dict[str, List[str]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        # Jobs submitted to this runner's pool and not started yet, and jobs it
+        # has claimed and not finished (their leases are renewed)
+        self._pending: set = set()
+        self._held: set = set()
+        self._stop = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+
+    def register(self, job_type: str, stages: List[str]):
+        """Decorator registering a pipeline function `(ctx, db, requirement_id)` for `job_type`."""
+        def decorator(pipeline):
+            self._pipelines[job_type] = pipeline
+            self._stage_names[job_type] = stages
+            return pipeline
+        return decorator
+
+    def enqueue(self, db: Session, job_type: str, requirement_id: int) -> PipelineJob:
+        """Persists a queued job and hands it to the worker pool once committed."""
+        job = PipelineJob(
+            job_type=job_type,
+            requirement_id=requirement_id,
+            status=JobStatus.QUEUED,
+            stages=json.dumps([
+                {"name": name, "status": "pending", "completed": 0, "total": None}
+                for name in self._stage_names[job_type]
+            ]),
+            result="{}"
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        self._submit(job.id)
+        return job
+
+    def _claimable(self, now: datetime):
+        """Queued jobs, and running jobs whose worker stopped renewing its lease."""
+        expired = now - timedelta(seconds=self.lease_seconds)
+        return or_(
+            PipelineJob.status == JobStatus.QUEUED,
+            and_(
+                PipelineJob.status == JobStatus.RUNNING,
+                or_(PipelineJob.heartbeat_at.is_(None), PipelineJob.heartbeat_at < expired)
+            )
+        )
+
+    def recover(self) -> List[int]:
+        """
+        Submits queued jobs and running jobs with an expired lease. Jobs other
+        live workers hold are left alone; if several runners submit the same
+        queued job, only one claims it.
+        """
+        with SessionLocal() as db:
+            job_ids = list(db.scalars(
+                select(PipelineJob.id)
+                .where(self._claimable(datetime.utcnow()))
+                .order_by(PipelineJob.created_at)
+            ))
+        for job_id in job_ids:
+            self._submit(job_id)
+        return job_ids
+
+    def shutdown(self, wait: bool = True):
+        self._stop.set()
+        with self._lock:
+            if self._executor:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+    def _submit(self, job_id: int):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pipeline-job")
+            if job_id in self._pending:
+                return
+            self._pending.add(job_id)
+            if self._heartbeat is None or not self._heartbeat.is_alive():
+                self._stop.clear()
+                self._heartbeat = threading.Thread(target=self._renew_leases, name="pipeline-job-heartbeat",
+                                                   daemon=True)
+                self._heartbeat.start()
+            self._executor.submit(self._run, job_id)
+
+    def _claim(self, db: Session, job_id: int) -> bool:
+        """Atomically moves the job to RUNNING under this worker; False if it is finished or held elsewhere."""
+        now = datetime.utcnow()
+        result = db.execute(
+            update(PipelineJob)
+            .where(PipelineJob.id == job_id, self._claimable(now))
+            .values(
+                status=JobStatus.RUNNING,
+                claimed_by=self.worker_id,
+                heartbeat_at=now,
+                started_at=func.coalesce(PipelineJob.started_at, now),
+                attempts=func.coalesce(PipelineJob.attempts, 0) + 1,
+                updated_at=now
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount == 1
+
+    def _renew_leases(self):
+        interval = self.lease_seconds / 3
+        while not self._stop.wait(interval):
+            try:
+                with SessionLocal() as db:
+                    held = list(self._held)
+                    if held:
+                        db.execute(
+                            update(PipelineJob)
+                            .where(PipelineJob.id.in_(held), PipelineJob.claimed_by == self.worker_id)
+                            .values(heartbeat_at=datetime.utcnow())
+                            .execution_options(synchronize_session=False)
+                        )
+                        db.commit()
+                # Pick up jobs left behind by workers that died since startup
+                self.recover()
+            except Exception as exc:
+                print(f"Job lease renewal failed: {exc}")
+
+    def _run(self, job_id: int):
+        self._pending.discard(job_id)
+        db = SessionLocal()
+        try:
+            if not self._claim(db, job_id):
+                return
+            self._held.add(job_id)
+            job = db.query(PipelineJob).filter(PipelineJob.id == job_id).first()
+
+            ctx = JobContext(job, db)
+            try:
+                with inspect_queries(f"job {job.job_type}"):
+                    self._pipelines[job.job_type](ctx, db, job.requirement_id)
+            except Exception as exc:
+                db.rollback()
+                job = db.query(PipelineJob).filter(PipelineJob.id == job_id).first()
+                job.status = JobStatus.FAILED
+                job.error = str(exc)
+                job.finished_at = datetime.utcnow()
+                db.commit()
+                print(f"Job {job_id} ({job.job_type}) failed: {exc}")
+                return
+
+            job.status = JobStatus.COMPLETED
+            job.current_stage = None
+            job.finished_at = datetime.utcnow()
+            db.commit()
+        finally:
+            self._held.discard(job_id)
+            db.close()
+
+
+def serialize_job(job: PipelineJob) -> dict:
+    return {
+        "job_id": job.id,
+        "job_type": job.job_type,
+        "requirement_id": job.requirement_id,
+        "status": job.status.value,
+        "current_stage": job.current_stage,
+        "stages": json.loads(job.stages or "[]"),
+        "result": json.loads(job.result or "{}"),
+        "error": job.error,
+        "attempts": job.attempts,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None
+    }
+
+
+job_runner = JobRunner()
@@ -0,0 +1,295 @@
+"""
+Metrics
+In-process request, SQL and agent/service metrics, exposed in the Prometheus
+text format at /metrics.
+
+- MetricsMiddleware (pure ASGI) records per-route latency and response size
+  histograms and in-flight requests, labelled with the route template.
+- Engine hooks count SQL statements and time them per route and statement
+  type; statements from background job threads are labelled "(background)".
+- instrument() wraps an agent or service instance so each public method call
+  is timed.
+
+Recording is a perf_counter pair, a bisect into fixed buckets and a short
+lock per sample, so it can stay on in production. Values are per process.
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+UNMATCHED_ROUTE = "(unmatched)"
+BACKGROUND_ROUTE = "(background)"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def expose(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}" for labels, value in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last is +Inf), sum, count]
+        self._series: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *labels) -> int:
+        series = self._series.get(labels)
+        return series[2] if series else 0
+
+    def samples(self):
+        with self._lock:
+            items = sorted((labels, [list(series[0]), series[1], series[2]]) for labels, series in self._series.items())
+        lines = []
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[Metric] = []
+        # Called at scrape time; each returns (name, type, help, [(labels dict, value)])
+        self._collectors: List[Callable[[], Iterable[tuple]]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, callback: Callable[[], Iterable[tuple]]):
+        self._collectors.append(callback)
+        return callback
+
+    def expose(self) -> str:
+        blocks = [metric.expose() for metric in self._metrics]
+        for callback in self._collectors:
+            for name, kind, documentation, samples in callback():
+                lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+                for labels, value in samples:
+                    if value is None:
+                        continue
+                    names, values = tuple(labels), tuple(labels.values())
+                    lines.append(f"{name}{_labels(names, values)} {_number(value)}")
+                blocks.append("\n".join(lines))
+        return "\n".join(blocks) + "\n"
+
+
+registry = Registry()
+
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "Requests currently being served", ["method"]))
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "Time from request start to the last response byte",
+    ["method", "route", "status"], LATENCY_BUCKETS))
+http_response_size = registry.register(Histogram(
+    "http_response_size_bytes", "Response body size", ["method", "route"], SIZE_BUCKETS))
+http_request_sql_statements = registry.register(Histogram(
+    "http_request_sql_statements", "SQL statements executed per request", ["method", "route"], COUNT_BUCKETS))
+sql_statement_duration = registry.register(Histogram(
+    "sql_statement_duration_seconds", "SQL statement execution time", ["route", "operation"], SQL_BUCKETS))
+component_call_duration = registry.register(Histogram(
+    "component_call_duration_seconds", "Agent and service call time", ["component", "method"], LATENCY_BUCKETS))
+component_call_errors = registry.register(Counter(
+    "component_call_errors_total", "Agent and service calls that raised", ["component", "method"]))
+
+
+class RequestStats:
+    """Per-request accumulator; shared by reference with threadpool workers through the context."""
+    __slots__ = ("scope", "sql_statements")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.sql_statements = 0
+
+    @property
+    def route(self) -> str:
+        # The router stores the matched route in the (shared) scope before calling the endpoint
+        return getattr(self.scope.get("route"), "path", UNMATCHED_ROUTE)
+
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so streamed responses are measured to their last byte."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        stats = RequestStats(scope)
+        token = current_request.set(stats)
+        status, size = [500], [0]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            elif message["type"] == "http.response.body":
+                size[0] += len(message.get("body", b""))
+            await send(message)
+
+        http_requests_in_flight.inc(method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_requests_in_flight.dec(method)
+            route = stats.route
+            http_request_duration.observe(elapsed, method, route, str(status[0]))
+            http_response_size.observe(size[0], method, route)
+            http_request_sql_statements.observe(stats.sql_statements, method, route)
+            current_request.reset(token)
+
+
+def _operation(statement: str) -> str:
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return keyword if keyword in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "PRAGMA") else "OTHER"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("metrics_query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    stats = current_request.get()
+    if stats is None:
+        route = BACKGROUND_ROUTE
+    else:
+        stats.sql_statements += 1
+        route = stats.route
+    sql_statement_duration.observe(elapsed, route, _operation(statement))
+
+
+def instrument_engine(engine: Engine):
+    """Times every statement `engine` executes (for an AsyncEngine, pass its sync_engine)."""
+    if not METRICS_ENABLED:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _timed(component: str, name: str, method):
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        except Exception:
+            component_call_errors.inc(component, name)
+            raise
+        finally:
+            component_call_duration.observe(time.perf_counter() - start, component, name)
+    return wrapper
+
+
+def instrument(instance, component: str = None):
+    """Times the public methods of `instance` and returns it."""
+    if not METRICS_ENABLED:
+        return instance
+    component = component or type(instance).__name__
+    for name in dir(type(instance)):
+        if name.startswith("_"):
+            continue
+        method = getattr(instance, name)
+        if callable(method):
+            setattr(instance, name, _timed(component, name, method))
+    return instance
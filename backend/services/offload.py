@@ -0,0 +1,84 @@
+"""
+Offload
+Keeps blocking work off the event loop in async mode. With ENABLE_ASYNC_DB a
+db_endpoint body runs through AsyncSession.run_sync: it executes on the
+event-loop thread, and its database calls are awaited through SQLAlchemy's
+greenlet bridge. Agent and service calls, the outreach fan-out and other
+CPU-bound steps would otherwise run on that thread too and stall every
+other connection.
+
+run_blocking() uses the same bridge (await_only) to await the call on a
+worker thread, so only database I/O happens on the loop. Anywhere else
+(sync mode, pipeline worker threads, the worker thread itself) it simply
+calls the function.
+"""
+import asyncio
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from functools import partial, wraps
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from greenlet import getcurrent
+from sqlalchemy.util import await_only
+
+from models.database import ENABLE_ASYNC_DB
+
+T = TypeVar("T")
+
+# Threads for work moved off the event loop; the default matches Starlette's sync-endpoint threadpool
+OFFLOAD_WORKERS = int(os.getenv("OFFLOAD_WORKERS", "40"))
+
+_executor = ThreadPoolExecutor(max_workers=OFFLOAD_WORKERS, thread_name_prefix="offload") if ENABLE_ASYNC_DB else None
+
+# Greenlet running the current db_endpoint body on the event loop, if any
+_loop_greenlet: ContextVar[Optional[object]] = ContextVar("offload_loop_greenlet", default=None)
+
+
+def on_event_loop(fn: Callable[..., T], *args, **kwargs) -> T:
+    """Calls `fn` (a handler body inside AsyncSession.run_sync) marked as running on the event loop."""
+    token = _loop_greenlet.set(getcurrent())
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _loop_greenlet.reset(token)
+
+
+def on_loop() -> bool:
+    # Worker threads inherit the context variable but run in a different greenlet
+    return _loop_greenlet.get() is getcurrent()
+
+
+def wait_for(awaitable: Awaitable[T]) -> T:
+    """Awaits `awaitable` from a handler body running on the event loop."""
+    return await_only(awaitable)
+
+
+def run_blocking(fn: Callable[..., T], *args, **kwargs) -> T:
+    """Runs `fn` on a worker thread when called from the event loop; calls it directly otherwise."""
+    if not on_loop():
+        return fn(*args, **kwargs)
+    # The worker sees the request's context (metrics, query inspection)
+    call = partial(contextvars.copy_context().run, fn, *args, **kwargs)
+    return wait_for(asyncio.get_running_loop().run_in_executor(_executor, call))
+
+
+def offload(instance, enabled: bool = ENABLE_ASYNC_DB):
+    """Makes the public methods of `instance` run through run_blocking and returns it."""
+    if not enabled:
+        return instance
+    for name in dir(type(instance)):
+        if name.startswith("_"):
+            continue
+        method = getattr(instance, name)
+        if callable(method):
+            setattr(instance, name, _offloaded(method))
+    return instance
+
+
+def _offloaded(method):
+    @wraps(method)
+    def call(*args, **kwargs):
+        return run_blocking(method, *args, **kwargs)
+    return call
@@ -0,0 +1,65 @@
+"""
+Outreach Dispatcher
+Fans supplier contact out across a worker pool while capping how many contacts
+run at once on each channel (email, phone, social_media).
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Tuple
+
+from services.offload import on_loop, wait_for
+
+DEFAULT_CHANNEL_LIMITS = {
+    "email": 20,
+    "phone": 5,
+    "social_media": 10,
+}
+
+
+def channel_limits_from_env() -> Dict[str, int]:
+    """Reads OUTREACH_LIMIT_EMAIL, OUTREACH_LIMIT_PHONE and OUTREACH_LIMIT_SOCIAL_MEDIA."""
+    return {
+        channel: int(os.getenv(f"OUTREACH_LIMIT_{channel.upper()}", default))
+        for channel, default in DEFAULT_CHANNEL_LIMITS.items()
+    }
+
+
+class OutreachDispatcher:
+    def __init__(self, channel_limits: Dict[str, int] = None):
+        self.channel_limits = channel_limits or channel_limits_from_env()
+        self._semaphores = {
+            channel: threading.BoundedSemaphore(limit)
+            for channel, limit in self.channel_limits.items()
+        }
+        self._executor = ThreadPoolExecutor(
+            max_workers=sum(self.channel_limits.values()),
+            thread_name_prefix="outreach"
+        )
+
+    def dispatch(self, tasks: Iterable[Tuple[object, str, Callable[[], dict]]]) -> Dict[object, dict]:
+        """
+        Runs each `(key, channel, fn)` task under its channel's limit and returns
+        `{key: result}` once all have finished. Called from the event loop
+        (async mode) the wait is awaited, so other requests keep being served.
+        Exceptions raised by a task are re-raised here.
+        """
+        futures = {
+            key: self._executor.submit(self._run_limited, channel, fn)
+            for key, channel, fn in tasks
+        }
+        if on_loop():
+            wait_for(_all_done(futures.values()))
+        else:
+            wait(futures.values())
+        return {key: future.result() for key, future in futures.items()}
+
+    def _run_limited(self, channel: str, fn: Callable[[], dict]) -> dict:
+        semaphore = self._semaphores.get(channel) or self._semaphores["email"]
+        with semaphore:
+            return fn()
+
+
+async def _all_done(futures):
+    await asyncio.gather(*(asyncio.wrap_future(future) for future in futures), return_exceptions=True)
@@ -0,0 +1,230 @@
+"""
+Payload Cache
+Serialized `GET /api/requirements/{id}` bodies, keyed by requirement id,
+version and representation. A version is never reused, so a hit is always
+current; on top of that every flush that bumps a requirement's version drops
+its cached bodies, which keeps superseded payloads from occupying the cache
+until they age out.
+
+Backends:
+- "local": in-process LRU bounded by requirement count, total bytes and TTL.
+- "redis": any Redis-compatible server (Redis, Valkey, KeyDB, ...) so
+  workers share one cache; needs the `redis` package.
+- "none": caching disabled.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from services.requirement_version import on_requirements_changed
+
+
+class LocalBackend:
+    """
+    LRU of requirement slots, each holding that requirement's cached
+    representations. Bounded by the number of requirements (max_entries),
+    the total body bytes and a per-body TTL.
+    """
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 64 * 1024 * 1024, ttl_seconds: float = 300):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._slots: "OrderedDict[str, Dict[str, tuple]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    def get(self, key: str, field: str) -> Optional[bytes]:
+        with self._lock:
+            slot = self._slots.get(key)
+            entry = slot.get(field) if slot else None
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._drop_field(key, field)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._slots.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, field: str, value: bytes):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._slots[key] = {}
+            elif field in slot:
+                self._bytes -= len(slot[field][0])
+            slot[field] = (value, time.monotonic() + self.ttl_seconds)
+            self._bytes += len(value)
+            self._slots.move_to_end(key)
+            while len(self._slots) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._slots.popitem(last=False)
+                self._bytes -= sum(len(v) for v, _ in evicted.values())
+                self.evictions += len(evicted)
+
+    def delete(self, keys: Set[str]):
+        with self._lock:
+            for key in keys:
+                slot = self._slots.pop(key, None)
+                if slot:
+                    self._bytes -= sum(len(v) for v, _ in slot.values())
+                    self.invalidations += len(slot)
+
+    def clear(self):
+        with self._lock:
+            self._slots.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "local",
+                "requirements": len(self._slots),
+                "entries": sum(len(slot) for slot in self._slots.values()),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    def _drop_field(self, key: str, field: str):
+        slot = self._slots[key]
+        self._bytes -= len(slot.pop(field)[0])
+        if not slot:
+            del self._slots[key]
+
+
+class RedisBackend:
+    """
+    One Redis hash per requirement (field = representation), expiring after
+    the TTL. Size bounds and LRU eviction are the server's maxmemory /
+    maxmemory-policy; hits and misses are counted per process, evictions are
+    read from the server's INFO stats.
+    """
+
+    def __init__(self, url: str, ttl_seconds: float = 300, prefix: str = "payload:", client=None):
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.url = url
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self.hits = self.misses = self.invalidations = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str, field: str) -> Optional[bytes]:
+        value = self.client.hget(self.prefix + key, field)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, field: str, value: bytes):
+        pipe = self.client.pipeline()
+        pipe.hset(self.prefix + key, field, value)
+        pipe.expire(self.prefix + key, max(int(self.ttl_seconds), 1))
+        pipe.execute()
+
+    def delete(self, keys: Set[str]):
+        if keys:
+            deleted = self.client.delete(*(self.prefix + key for key in keys))
+            with self._lock:
+                self.invalidations += deleted or 0
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def stats(self) -> dict:
+        server = self.client.info("stats")
+        return {
+            "backend": "redis",
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": server.get("evicted_keys"),
+            "expirations": server.get("expired_keys"),
+            "invalidations": self.invalidations,
+        }
+
+
+class PayloadCache:
+    def __init__(self, backend=None):
+        self.backend = backend
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    @staticmethod
+    def _key(requirement_id: int) -> str:
+        return f"requirement:{requirement_id}"
+
+    @staticmethod
+    def _field(version: int, variant: str) -> str:
+        return f"v{version}:{variant}"
+
+    def get(self, requirement_id: int, version: int, variant: str = "") -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        return self.backend.get(self._key(requirement_id), self._field(version, variant))
+
+    def set(self, requirement_id: int, version: int, body: bytes, variant: str = ""):
+        if self.enabled:
+            self.backend.set(self._key(requirement_id), self._field(version, variant), body)
+
+    def invalidate(self, requirement_ids: Set[int]):
+        if self.enabled and requirement_ids:
+            self.backend.delete({self._key(requirement_id) for requirement_id in requirement_ids})
+
+    def stats(self) -> dict:
+        if not self.enabled:
+            return {"backend": "none"}
+        stats = self.backend.stats()
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else None
+        return stats
+
+
+def create_backend(name: str = None):
+    name = (name or os.getenv("PAYLOAD_CACHE_BACKEND", "local")).lower()
+    ttl_seconds = float(os.getenv("PAYLOAD_CACHE_TTL_SECONDS", "300"))
+    if name == "none":
+        return None
+    if name == "redis":
+        return RedisBackend(os.getenv("PAYLOAD_CACHE_REDIS_URL", "redis://localhost:6379/0"), ttl_seconds)
+    if name == "local":
+        return LocalBackend(
+            max_entries=int(os.getenv("PAYLOAD_CACHE_MAX_ENTRIES", "512")),
+            max_bytes=int(os.getenv("PAYLOAD_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+            ttl_seconds=ttl_seconds
+        )
+    raise ValueError(f"Unknown PAYLOAD_CACHE_BACKEND: {name}")
+
+
+payload_cache = PayloadCache(create_backend())
+
+
+@on_requirements_changed
+def _invalidate_changed_requirements(session: Session, requirement_ids: Set[int]):
+    payload_cache.invalidate(requirement_ids)
@@ -0,0 +1,233 @@
+"""
+Query Inspector
+Debug / CI checks for per-row queries issued in loops and for slow statements.
+
+- Repeated statements: within a request (or a pipeline job) every statement is
+  reduced to a fingerprint (placeholders, literals and IN / VALUES lists
+  collapsed) and counted. A shape executed more than QUERY_REPEAT_THRESHOLD
+  times is reported with the application frames that issued it.
+  QUERY_INSPECTOR=log prints one report per request when it finishes;
+  QUERY_INSPECTOR=raise fails the offending statement with RepeatedQueryError,
+  so a CI run turns the N+1 into a 500 (or a failed job).
+- Slow statements: anything slower than SLOW_QUERY_MS is printed with its
+  parameters and the database's plan (EXPLAIN QUERY PLAN on SQLite, EXPLAIN
+  elsewhere), from requests and background threads alike.
+
+Both are off by default; the call site is only resolved when a shape first
+crosses the threshold, so counting costs a cached fingerprint lookup and a
+dict increment per statement.
+"""
+import os
+import re
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+QUERY_INSPECTOR = os.getenv("QUERY_INSPECTOR", "off").lower()
+QUERY_REPEAT_THRESHOLD = int(os.getenv("QUERY_REPEAT_THRESHOLD", "10"))
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "0"))
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+
+MAX_PARAMETERS_LENGTH = 500
+CALL_SITE_DEPTH = 3
+
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_THIS_FILE = os.path.abspath(__file__)
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<![:\w]):\w+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_ROWS = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+_SPACE = re.compile(r"\s+")
+
+
+class RepeatedQueryError(RuntimeError):
+    """Raised in QUERY_INSPECTOR=raise mode when a statement shape exceeds the threshold."""
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """The statement's shape: `IN (?, ?, ?)` and `IN (?)` share a fingerprint."""
+    shape = _PLACEHOLDER.sub("?", statement)
+    shape = _STRING.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    shape = _LIST.sub("(?)", shape)
+    shape = _ROWS.sub("(?)", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+def call_site(depth: int = CALL_SITE_DEPTH) -> str:
+    """The innermost application frames (outside SQLAlchemy and this module), innermost first."""
+    frames: List[str] = []
+    frame = sys._getframe(1)
+    while frame is not None and len(frames) < depth:
+        filename = frame.f_code.co_filename
+        # "<string>" frames are SQLAlchemy's generated functions
+        if not filename.startswith("<"):
+            filename = os.path.abspath(filename)
+        if (filename != _THIS_FILE and filename.startswith(_APP_ROOT)
+                and "site-packages" not in filename):
+            frames.append(f"{os.path.relpath(filename, _APP_ROOT)}:{frame.f_lineno} in {frame.f_code.co_name}")
+        frame = frame.f_back
+    return " <- ".join(frames) or "(unknown)"
+
+
+class Inspection:
+    """Statement counts for one request or job; shared with threadpool workers through the context."""
+
+    def __init__(self, label: str, scope: dict = None):
+        self._label = label
+        self.scope = scope
+        self.counts: Dict[str, int] = {}
+        self.sites: Dict[str, str] = {}
+        self.statements = 0
+
+    @property
+    def label(self) -> str:
+        route = getattr((self.scope or {}).get("route"), "path", None)
+        return f"{self._label} {route}" if route else self._label
+
+    def record(self, statement: str):
+        shape = fingerprint(statement)
+        count = self.counts.get(shape, 0) + 1
+        self.counts[shape] = count
+        self.statements += 1
+        if count == QUERY_REPEAT_THRESHOLD + 1:
+            self.sites[shape] = call_site()
+            if QUERY_INSPECTOR == "raise":
+                raise RepeatedQueryError(
+                    f"{self.label}: statement executed more than {QUERY_REPEAT_THRESHOLD} times "
+                    f"at {self.sites[shape]}: {shape}"
+                )
+
+    def repeated(self) -> List[dict]:
+        return sorted(
+            ({"statement": shape, "count": self.counts[shape], "call_site": site}
+             for shape, site in self.sites.items()),
+            key=lambda entry: -entry["count"],
+        )
+
+    def report(self) -> Optional[str]:
+        repeated = self.repeated()
+        if not repeated:
+            return None
+        lines = [f"Repeated queries in {self.label} ({self.statements} statement(s)):"]
+        for entry in repeated:
+            lines.append(f"  {entry['count']}x {entry['statement']}")
+            lines.append(f"      at {entry['call_site']}")
+        return "\n".join(lines)
+
+
+current_inspection: ContextVar[Optional[Inspection]] = ContextVar("current_inspection", default=None)
+
+
+@contextmanager
+def inspect_queries(label: str, scope: dict = None):
+    """Counts the statements issued inside the block and prints repeated shapes when it exits."""
+    if QUERY_INSPECTOR not in ("log", "raise"):
+        yield None
+        return
+    inspection = Inspection(label, scope)
+    token = current_inspection.set(inspection)
+    try:
+        yield inspection
+    finally:
+        current_inspection.reset(token)
+        report = inspection.report()
+        if report:
+            print(report)
+
+
+class QueryInspectorMiddleware:
+    """Pure ASGI middleware, so statements issued while a response streams are still attributed to it."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or QUERY_INSPECTOR not in ("log", "raise"):
+            await self.app(scope, receive, send)
+            return
+        with inspect_queries(scope["method"], scope):
+            await self.app(scope, receive, send)
+
+
+def _format_parameters(parameters) -> str:
+    text = repr(parameters)
+    return text if len(text) <= MAX_PARAMETERS_LENGTH else text[:MAX_PARAMETERS_LENGTH] + "..."
+
+
+def explain(conn, statement: str, parameters) -> List[str]:
+    """
+    The plan for `statement`, read through a separate DBAPI cursor on the same
+    connection so no engine events fire and the caller's cursor is untouched.
+    """
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    if keyword not in _EXPLAINABLE:
+        return []
+    if isinstance(parameters, list):
+        # executemany: the first parameter set stands in for the rest
+        parameters = parameters[0] if parameters else ()
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    # SQLite: (id, parent, notused, detail); others: one text column per line
+    return [str(row[-1]) for row in rows]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    inspection = current_inspection.get()
+    if inspection is not None:
+        inspection.record(statement)
+    if SLOW_QUERY_MS > 0:
+        conn.info.setdefault("inspector_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("inspector_query_start")
+    if not starts:
+        return
+    elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+    if elapsed_ms < SLOW_QUERY_MS:
+        return
+    inspection = current_inspection.get()
+    lines = [
+        f"Slow query ({elapsed_ms:.1f} ms) in {inspection.label if inspection else '(background)'}: "
+        f"{_SPACE.sub(' ', statement).strip()}",
+        f"  parameters: {_format_parameters(parameters)}",
+        f"  at {call_site()}",
+    ]
+    if SLOW_QUERY_EXPLAIN:
+        try:
+            lines.extend(f"  plan: {line}" for line in explain(conn, statement, parameters))
+        except Exception as exc:
+            lines.append(f"  plan unavailable: {exc}")
+    print("\n".join(lines))
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    starts = exception_context.connection.info.get("inspector_query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def inspect_engine(engine: Engine):
+    """Counts / times every statement `engine` executes (for an AsyncEngine, pass its sync_engine)."""
+    if QUERY_INSPECTOR not in ("log", "raise") and SLOW_QUERY_MS <= 0:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
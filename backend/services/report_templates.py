@@ -0,0 +1,303 @@
+"""
+Report Templates
+The simulated GenAI services describe their results as a template id plus a
+few structured fields instead of a finished multi-kilobyte text. That compact
+document is what gets persisted (CostAnalysis.analysis_notes,
+NegotiationIteration.negotiation_strategy) and shipped to clients; the text is
+rendered only on request, from templates parsed once at import, and rendered
+output is kept in an LRU cache keyed by the stored document.
+"""
+import json
+import os
+from functools import lru_cache
+from string import Formatter
+from typing import Callable, Dict, Optional, Union
+
+import orjson
+
+COST_ANALYSIS = "cost_analysis.v1"
+NEGOTIATION_PARTNERSHIP = "negotiation.partnership.v1"
+NEGOTIATION_LEVERAGE = "negotiation.leverage.v1"
+SRM_ANALYSIS = "srm.analysis.v1"
+SRM_ONBOARDING = "srm.onboarding.v1"
+SRM_RELATIONSHIP = "srm.relationship.v1"
+
+RENDER_CACHE_SIZE = int(os.getenv("REPORT_RENDER_CACHE_SIZE", "2048"))
+
+
+class ReportTemplate:
+    """
+    A str.format template split into (literal, field, format spec) segments
+    once, so rendering is a single join. `derive` adds display-only values
+    (verdicts, breakdowns) computed from the stored fields.
+    """
+
+    def __init__(self, source: str, derive: Optional[Callable[[Dict], Dict]] = None):
+        self.derive = derive
+        self.segments = tuple(
+            (literal, field, spec or "")
+            for literal, field, spec, _ in Formatter().parse(source)
+        )
+
+    def render(self, fields: Dict) -> str:
+        values = dict(fields, **self.derive(fields)) if self.derive else fields
+        return "".join(
+            literal + (format(values[field], spec) if field is not None else "")
+            for literal, field, spec in self.segments
+        )
+
+
+def _cost_analysis_display(fields: Dict) -> Dict:
+    total_cost, recommended = fields["total_cost"], fields["savings_percentage"] >= 5
+    iterations = fields.get("negotiation_iterations")
+    return {
+        "base_cost": total_cost - (total_cost * 0.15),
+        "logistics_cost": total_cost * 0.15,
+        "verdict": "✓ RECOMMENDED" if recommended else "✗ NOT RECOMMENDED",
+        "meets": "Meets" if recommended else "Does not meet",
+        "negotiation_note": f"\n\nNegotiation completed after {iterations} iterations." if iterations else "",
+    }
+
+
+def _certification_list(fields: Dict) -> Dict:
+    certifications = fields.get("certifications") or []
+    return {"certification_list": ", ".join(certifications) if certifications else "Pending"}
+
+
+TEMPLATES: Dict[str, ReportTemplate] = {
+    COST_ANALYSIS: ReportTemplate("""Cost Analysis Report - {supplier_name}
+
+EXECUTIVE SUMMARY:
+Total Cost: ${total_cost:,.2f}
+Current Best Supplier Cost: ${best_current_cost:,.2f}
+Potential Savings: ${savings:,.2f} ({savings_percentage:.2f}%)
+
+DETAILED BREAKDOWN:
+1. Base Product Cost: ${base_cost:,.2f}
+2. Transportation & Logistics: ${logistics_cost:,.2f}
+3. Total Cost of Ownership: ${total_cost:,.2f}
+
+COMPARATIVE ANALYSIS:
+- Comparison with {current_supplier_count} current suppliers
+- Best current option: ${best_current_cost:,.2f}
+- Proposed option: ${total_cost:,.2f}
+- Net savings opportunity: ${savings:,.2f}
+
+WAREHOUSE CONSIDERATIONS:
+- Analyzed across {warehouse_count} warehouse locations
+- Transportation costs optimized for delivery network
+- Cost factors applied based on location efficiency
+
+RECOMMENDATION:
+{verdict} - {meets} procurement cost expectations.
+
+[AI-Generated Cost Analysis - Comprehensive evaluation using advanced cost modeling algorithms]{negotiation_note}""",
+                                  derive=_cost_analysis_display),
+
+    NEGOTIATION_PARTNERSHIP: ReportTemplate("""Negotiation Strategy for {supplier_name}:
+
+Market Analysis:
+- Current market trend: {market_trend}
+- Supply availability: {supply_availability}
+- Competitive landscape: {competitor_pricing}
+
+Strategy Approach:
+1. Volume Commitment: Propose long-term partnership with volume guarantees
+2. Payment Terms: Offer favorable payment terms in exchange for better pricing
+3. Market Benchmarking: Reference competitive pricing in the market
+4. Partnership Value: Emphasize strategic partnership benefits beyond pricing
+
+Target: Achieve {savings_needed:.1f}% cost reduction to meet procurement expectations.
+
+[AI-Generated Negotiation Strategy - Based on market analysis and supplier profile]"""),
+
+    NEGOTIATION_LEVERAGE: ReportTemplate("""Strategic Negotiation Plan:
+
+Key Leverage Points:
+- Market conditions favor buyer (supply availability: {supply_availability})
+- Opportunity for long-term contract with guaranteed volumes
+- Potential for expanded business relationship
+
+Negotiation Tactics:
+1. Open with partnership value proposition
+2. Present market data and competitive benchmarks
+3. Propose win-win scenarios (volume discounts, extended contracts)
+4. Emphasize quality and service alignment
+
+Expected Outcome: {savings_needed:.1f}% reduction through strategic negotiation.
+
+[AI-Powered Negotiation Framework - Optimized for mutual value creation]"""),
+
+    SRM_ANALYSIS: ReportTemplate("""SUPPLIER RELATIONSHIP MANAGEMENT ANALYSIS
+Generated by AI-Powered SRM System
+
+SUPPLIER PROFILE:
+Name: {supplier_name}
+Certifications: {certification_list}
+Requirement: {requirement_title}
+
+CAPABILITY ASSESSMENT:
+✓ Supplier demonstrates strong alignment with procurement requirements
+✓ Certifications indicate compliance with industry standards
+✓ Communication and responsiveness meet expectations
+✓ Cost competitiveness positions supplier favorably
+
+STRATEGIC VALUE:
+- Potential for long-term strategic partnership
+- Alignment with organizational procurement objectives
+- Opportunity for volume-based relationship development
+- Innovation and continuous improvement potential
+
+PERFORMANCE EXPECTATIONS:
+- Quality standards: High (based on certification profile)
+- Delivery reliability: Expected to meet or exceed targets
+- Cost management: Competitive pricing with potential for optimization
+- Service level: Professional engagement expected
+
+COLLABORATION OPPORTUNITIES:
+- Regular performance reviews and feedback sessions
+- Joint process improvement initiatives
+- Technology integration for streamlined operations
+- Knowledge sharing and best practice exchange
+
+LONG-TERM PARTNERSHIP CONSIDERATIONS:
+- Scalability of supplier capabilities
+- Financial stability and business continuity
+- Innovation capacity and adaptability
+- Cultural and strategic alignment
+
+[AI-Generated SRM Analysis - Comprehensive supplier relationship evaluation]""",
+                                 derive=_certification_list),
+
+    SRM_ONBOARDING: ReportTemplate("""SUPPLIER ONBOARDING PLAN
+For: {supplier_name}
+Requirement: {requirement_title}
+
+PHASE 1: DOCUMENTATION & COMPLIANCE (Week 1-2)
+- Collect and verify all required certifications
+- Complete supplier registration forms
+- Sign master service agreement
+- Establish payment terms and conditions
+- Set up tax and compliance documentation
+
+PHASE 2: SYSTEM INTEGRATION (Week 2-3)
+- Provide access to procurement portal
+- Integrate with ERP and ordering systems
+- Set up communication channels
+- Configure approval workflows
+- Establish reporting mechanisms
+
+PHASE 3: TRAINING & KNOWLEDGE TRANSFER (Week 3-4)
+- Conduct orientation session on procurement processes
+- Train on system usage and requirements
+- Share quality standards and expectations
+- Review delivery and logistics procedures
+- Establish escalation procedures
+
+PHASE 4: PILOT TESTING (Week 4-5)
+- Execute small pilot order
+- Monitor quality and delivery performance
+- Gather feedback and address issues
+- Refine processes and procedures
+- Validate system integrations
+
+PHASE 5: FULL ONBOARDING (Week 5-6)
+- Scale up to full operational capacity
+- Establish regular review cadence
+- Implement performance monitoring
+- Begin strategic relationship development
+- Transition to business-as-usual operations
+
+[AI-Generated Onboarding Plan - Optimized for efficient supplier integration]"""),
+
+    SRM_RELATIONSHIP: ReportTemplate("""SUPPLIER RELATIONSHIP MANAGEMENT STRATEGY
+For: {supplier_name}
+
+COMMUNICATION APPROACH:
+- Establish regular cadence: Monthly business reviews
+- Multi-channel communication: Email, phone, portal, meetings
+- Proactive engagement: Quarterly strategic planning sessions
+- Issue escalation: Defined escalation matrix with response SLAs
+
+PERFORMANCE MANAGEMENT:
+- Key Performance Indicators (KPIs):
+  * On-time delivery: Target 95%+
+  * Quality acceptance rate: Target 98%+
+  * Cost competitiveness: Maintain or improve pricing
+  * Service responsiveness: 24-hour response time
+- Performance reviews: Quarterly formal reviews
+- Continuous improvement: Annual improvement plans
+
+COLLABORATION OPPORTUNITIES:
+- Joint process improvement initiatives
+- Innovation partnerships for new solutions
+- Technology integration for efficiency gains
+- Knowledge sharing and best practice exchange
+- Sustainability and CSR alignment
+
+CONTINUOUS IMPROVEMENT INITIATIVES:
+- Regular feedback sessions and performance data sharing
+- Collaborative problem-solving for operational challenges
+- Innovation workshops for process optimization
+- Benchmarking against industry standards
+- Technology adoption for digital transformation
+
+LONG-TERM PARTNERSHIP ROADMAP:
+Year 1: Establish foundation and prove value
+Year 2: Expand scope and deepen relationship
+Year 3+: Strategic partnership with integrated operations
+
+[AI-Generated Relationship Strategy - Optimized for strategic supplier partnership]"""),
+}
+
+
+def report(template_id: str, **fields) -> Dict:
+    """Structured report: {"template": id, "fields": {...}}."""
+    if template_id not in TEMPLATES:
+        raise KeyError(f"Unknown report template: {template_id}")
+    return {"template": template_id, "fields": fields}
+
+
+def pack(document: Dict) -> str:
+    """Compact JSON for a report column."""
+    return json.dumps(document, separators=(",", ":"), sort_keys=True)
+
+
+def unpack(stored: Union[str, Dict, None]) -> Union[Dict, str, None]:
+    """
+    The report document in a column value. Rows written before reports were
+    structured hold plain text, which is returned unchanged.
+    """
+    if not isinstance(stored, str) or not stored.startswith("{"):
+        return stored
+    try:
+        document = orjson.loads(stored)
+    except ValueError:
+        return stored
+    return document if isinstance(document, dict) and "template" in document else stored
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _render_packed(stored: str) -> str:
+    document = unpack(stored)
+    if not isinstance(document, dict):
+        return stored
+    return TEMPLATES[document["template"]].render(document["fields"])
+
+
+def render(report_value: Union[str, Dict, None]) -> Optional[str]:
+    """Text of a report given as a document or a stored column value."""
+    if report_value is None:
+        return None
+    if isinstance(report_value, dict):
+        report_value = pack(report_value)
+    return _render_packed(report_value)
+
+
+def report_payload(stored: Union[str, Dict, None], render_text: bool = False):
+    """API value for a report: the structured document, or its text when asked for."""
+    return render(stored) if render_text else unpack(stored)
+
+
+def render_cache_info():
+    return _render_packed.cache_info()
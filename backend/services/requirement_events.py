@@ -0,0 +1,266 @@
+"""
+Requirement Events
+Small delta events describing what changed on a requirement: status
+transitions, discovered suppliers, supplier status changes, samples, cost
+analyses, negotiation iterations and shortlist updates.
+
+Events are collected from each flush (through the version hook in
+requirement_version), held on the session and published to the in-process
+bus when the transaction commits; a rollback drops them. The bus serializes
+an event once and hands the same frame to every subscriber, so fan-out costs
+no database work per open connection. Subscribers live in this process only:
+with several workers, a client sees the writes committed by the worker it is
+connected to and picks up the rest when it refetches.
+"""
+import asyncio
+import json
+import os
+import threading
+from collections import OrderedDict, defaultdict, deque
+from itertools import chain
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from models.procurement import (
+    ProcurementRequirement, Supplier, Sample, CostAnalysis, NegotiationIteration, SupplierShortlist
+)
+from services.requirement_version import on_requirements_changed, supplier_requirement_ids
+
+PENDING_KEY = "requirement_events"
+RESYNC_FRAME = b'data: {"type":"resync"}\n\n'
+
+
+def _value(value):
+    return getattr(value, "value", value)
+
+
+def _changed(obj, *attrs) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[attr].history.has_changes() for attr in attrs)
+
+
+def record_event(session: Session, requirement_id: int, event: dict):
+    """
+    Queues `event` for publication when the session commits. For writes the
+    flush hook cannot see, such as Core bulk inserts.
+    """
+    session.info.setdefault(PENDING_KEY, []).append((requirement_id, event))
+
+
+def flush_events(session: Session) -> List[Tuple[int, dict]]:
+    """Delta events for the rows new, modified or deleted in the current flush."""
+    children = [
+        obj for obj in chain(session.new, session.dirty)
+        if isinstance(obj, (Sample, CostAnalysis, NegotiationIteration))
+    ]
+    owners = supplier_requirement_ids(session, {obj.supplier_id for obj in children})
+
+    events: List[Tuple[int, dict]] = []
+    discovered: Dict[int, int] = defaultdict(int)
+    shortlists: Dict[int, dict] = {}
+
+    def shortlist(requirement_id: int) -> dict:
+        if requirement_id not in shortlists:
+            shortlists[requirement_id] = {"type": "shortlist.updated", "entries": [], "removed": []}
+        return shortlists[requirement_id]
+
+    for obj in session.new:
+        if isinstance(obj, Supplier):
+            discovered[obj.requirement_id] += 1
+        elif isinstance(obj, Sample):
+            events.append((owners.get(obj.supplier_id), {
+                "type": "sample.created", "supplier_id": obj.supplier_id, "sample_id": obj.id,
+                "quantity": obj.quantity, "price_quoted": obj.price_quoted
+            }))
+        elif isinstance(obj, CostAnalysis):
+            events.append((owners.get(obj.supplier_id), {
+                "type": "cost_analysis.created", "supplier_id": obj.supplier_id, "cost_analysis_id": obj.id,
+                "total_cost": obj.total_cost, "savings": obj.savings,
+                "savings_percentage": obj.savings_percentage, "meets_expectations": obj.meets_expectations
+            }))
+        elif isinstance(obj, NegotiationIteration):
+            events.append((owners.get(obj.supplier_id), {
+                "type": "negotiation.iteration", "supplier_id": obj.supplier_id,
+                "iteration_number": obj.iteration_number, "proposed_cost": obj.proposed_cost,
+                "outcome": obj.outcome
+            }))
+        elif isinstance(obj, SupplierShortlist):
+            shortlist(obj.requirement_id)["entries"].append({"supplier_id": obj.supplier_id, "rank": obj.rank})
+
+    for obj in session.dirty:
+        if isinstance(obj, ProcurementRequirement):
+            if _changed(obj, "status"):
+                events.append((obj.id, {"type": "requirement.status", "status": _value(obj.status)}))
+        elif isinstance(obj, Supplier):
+            if _changed(obj, "status", "selected_for_outreach"):
+                events.append((obj.requirement_id, {
+                    "type": "supplier.status", "supplier_id": obj.id, "status": _value(obj.status),
+                    "selected_for_outreach": obj.selected_for_outreach
+                }))
+            # Samples written with a Core INSERT only show up as the supplier's new pointer
+            if _changed(obj, "latest_sample_id") and obj.latest_sample_id is not None:
+                events.append((obj.requirement_id, {
+                    "type": "sample.created", "supplier_id": obj.id, "sample_id": obj.latest_sample_id
+                }))
+        elif isinstance(obj, Sample):
+            if _changed(obj, "quality_approved", "quality_notes"):
+                events.append((owners.get(obj.supplier_id), {
+                    "type": "sample.reviewed", "supplier_id": obj.supplier_id, "sample_id": obj.id,
+                    "quality_approved": obj.quality_approved
+                }))
+        elif isinstance(obj, SupplierShortlist):
+            if _changed(obj, "rank", "integrated_score"):
+                shortlist(obj.requirement_id)["entries"].append({"supplier_id": obj.supplier_id, "rank": obj.rank})
+
+    for obj in session.deleted:
+        if isinstance(obj, SupplierShortlist):
+            shortlist(obj.requirement_id)["removed"].append(obj.supplier_id)
+
+    events.extend((requirement_id, {"type": "suppliers.discovered", "count": count})
+                  for requirement_id, count in discovered.items())
+    events.extend(shortlists.items())
+    return [(requirement_id, event) for requirement_id, event in events if requirement_id is not None]
+
+
+class Subscription:
+    """One open event stream; frames are queued on the subscriber's event loop."""
+
+    def __init__(self, requirement_id: int, loop: asyncio.AbstractEventLoop, queue_size: int):
+        self.requirement_id = requirement_id
+        self.loop = loop
+        self.queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue(maxsize=queue_size)
+        self.overflows = 0
+
+    def deliver(self, frame: Optional[bytes]):
+        """Runs on `loop`. A full queue is replaced by a single resync frame."""
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            self.overflows += 1
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_FRAME if frame is not None else None)
+
+
+class RequirementEventBus:
+    """
+    In-process pub/sub keyed by requirement id. Each requirement keeps its own
+    event sequence and the last `replay_size` frames, so a client reconnecting
+    with Last-Event-ID receives what it missed (or a resync event when the
+    gap is no longer buffered).
+    """
+
+    def __init__(self, queue_size: int = 256, replay_size: int = 64, max_replay_requirements: int = 1024):
+        self.queue_size = queue_size
+        self.replay_size = replay_size
+        self.max_replay_requirements = max_replay_requirements
+        self._subscribers: Dict[int, Set[Subscription]] = defaultdict(set)
+        # requirement id -> [last sequence, recent (sequence, frame) pairs]
+        self._history: "OrderedDict[int, list]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.published = 0
+        self.delivered = 0
+
+    def publish(self, requirement_id: int, event: dict):
+        """Thread-safe; called from request threads, job workers and the event loop alike."""
+        with self._lock:
+            history = self._history.get(requirement_id)
+            if history is None:
+                history = self._history[requirement_id] = [0, deque(maxlen=self.replay_size)]
+                while len(self._history) > self.max_replay_requirements:
+                    self._history.popitem(last=False)
+            self._history.move_to_end(requirement_id)
+            history[0] += 1
+            payload = json.dumps({**event, "requirement_id": requirement_id}, separators=(",", ":"), default=str)
+            frame = f"id: {history[0]}\ndata: {payload}\n\n".encode("utf-8")
+            history[1].append((history[0], frame))
+            subscribers = list(self._subscribers.get(requirement_id, ()))
+            self.published += 1
+            self.delivered += len(subscribers)
+        for subscription in subscribers:
+            self._send(subscription, frame)
+
+    def subscribe(self, requirement_id: int, last_event_id: Optional[str] = None) -> Subscription:
+        """Registers a stream on the running loop, pre-filled with anything missed since `last_event_id`."""
+        subscription = Subscription(requirement_id, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscribers[requirement_id].add(subscription)
+            if last_event_id is not None:
+                for frame in self._missed(requirement_id, last_event_id):
+                    subscription.deliver(frame)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.requirement_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.requirement_id]
+
+    def close(self):
+        """Ends every open stream (on shutdown)."""
+        with self._lock:
+            subscriptions = [s for subscribers in self._subscribers.values() for s in subscribers]
+        for subscription in subscriptions:
+            self._send(subscription, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "subscribers": sum(len(subscribers) for subscribers in self._subscribers.values()),
+                "requirements": len(self._subscribers),
+                "published": self.published,
+                "delivered": self.delivered,
+            }
+
+    def _missed(self, requirement_id: int, last_event_id: str) -> Iterable[bytes]:
+        history = self._history.get(requirement_id)
+        try:
+            last = int(last_event_id)
+        except ValueError:
+            return [RESYNC_FRAME]
+        if history is None or last > history[0]:
+            # Unknown sequence, e.g. from before a restart
+            return [RESYNC_FRAME]
+        frames: Deque[Tuple[int, bytes]] = history[1]
+        if last == history[0]:
+            return []
+        if not frames or frames[0][0] > last + 1:
+            return [RESYNC_FRAME]
+        return [frame for sequence, frame in frames if sequence > last]
+
+    def _send(self, subscription: Subscription, frame: Optional[bytes]):
+        try:
+            subscription.loop.call_soon_threadsafe(subscription.deliver, frame)
+        except RuntimeError:
+            # The subscriber's loop is closed
+            self.unsubscribe(subscription)
+
+
+event_bus = RequirementEventBus(
+    queue_size=int(os.getenv("REQUIREMENT_EVENTS_QUEUE_SIZE", "256")),
+    replay_size=int(os.getenv("REQUIREMENT_EVENTS_REPLAY_SIZE", "64")),
+)
+
+
+@on_requirements_changed
+def _collect_flush_events(session: Session, requirement_ids: Set[int]):
+    pending = flush_events(session)
+    if pending:
+        session.info.setdefault(PENDING_KEY, []).extend(pending)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed_events(session: Session):
+    for requirement_id, event in session.info.pop(PENDING_KEY, ()):
+        event_bus.publish(requirement_id, event)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_uncommitted_events(session: Session, transaction):
+    # Committed events were already popped; what is left was rolled back
+    if transaction.parent is None:
+        session.info.pop(PENDING_KEY, None)
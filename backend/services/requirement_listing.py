@@ -0,0 +1,140 @@
+"""
+Requirement Listing
+Keyset (cursor) pagination over requirements ordered by (created_at, id), plus
+per-status counts kept in requirement_status_counts so the summary never scans
+the requirements table. The counts cover every requirement; they do not apply
+the listing's filters.
+"""
+import base64
+import json
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import and_, case, event, inspect, or_, select, update
+from sqlalchemy.orm import Session
+
+from models.procurement import ProcurementRequirement, RequirementStatus, RequirementStatusCount
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, requirement_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), requirement_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, requirement_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(requirement_id)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from exc
+
+
+def list_requirements_page(db: Session, limit: int = 20, cursor: Optional[str] = None,
+                           status: Optional[RequirementStatus] = None,
+                           category: Optional[str] = None,
+                           deadline_from: Optional[datetime] = None,
+                           deadline_to: Optional[datetime] = None) -> dict:
+    """
+    Returns one page of requirements, newest first. Each page is a single
+    index range scan, so its cost does not depend on how deep the cursor is.
+    """
+    query = select(
+        ProcurementRequirement.id,
+        ProcurementRequirement.title,
+        ProcurementRequirement.category,
+        ProcurementRequirement.status,
+        ProcurementRequirement.deadline,
+        ProcurementRequirement.created_at
+    )
+
+    if status is not None:
+        query = query.where(ProcurementRequirement.status == status)
+    if category is not None:
+        query = query.where(ProcurementRequirement.category == category)
+    if deadline_from is not None:
+        query = query.where(ProcurementRequirement.deadline >= deadline_from)
+    if deadline_to is not None:
+        query = query.where(ProcurementRequirement.deadline <= deadline_to)
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        query = query.where(or_(
+            ProcurementRequirement.created_at < cursor_created_at,
+            and_(
+                ProcurementRequirement.created_at == cursor_created_at,
+                ProcurementRequirement.id < cursor_id
+            )
+        ))
+
+    rows = db.execute(
+        query.order_by(ProcurementRequirement.created_at.desc(), ProcurementRequirement.id.desc())
+        .limit(limit + 1)
+    ).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None
+
+    return {
+        "items": [{
+            "id": r.id,
+            "title": r.title,
+            "category": r.category,
+            "status": r.status.value,
+            "deadline": r.deadline.isoformat() if r.deadline else None,
+            "created_at": r.created_at.isoformat()
+        } for r in rows],
+        "next_cursor": next_cursor,
+        "status_counts": status_counts(db)
+    }
+
+
+def status_counts(db: Session) -> Dict[str, int]:
+    """Number of requirements per status across the whole table (listing filters do not apply)."""
+    counts = {status.value: 0 for status in RequirementStatus}
+    for row in db.query(RequirementStatusCount).all():
+        counts[row.status.value] = row.count
+    return counts
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_status_counts(session: Session, flush_context):
+    """Applies requirement inserts, deletes and status changes to requirement_status_counts."""
+    deltas = Counter()
+    for obj in session.new:
+        if isinstance(obj, ProcurementRequirement) and obj.status is not None:
+            deltas[obj.status] += 1
+    for obj in session.deleted:
+        if isinstance(obj, ProcurementRequirement) and obj.status is not None:
+            deltas[obj.status] -= 1
+    for obj in session.dirty:
+        if not isinstance(obj, ProcurementRequirement):
+            continue
+        history = inspect(obj).attrs.status.history
+        if not history.has_changes():
+            continue
+        for old_status in history.deleted:
+            if old_status is not None:
+                deltas[old_status] -= 1
+        for new_status in history.added:
+            if new_status is not None:
+                deltas[new_status] += 1
+
+    deltas = {status: delta for status, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    # Every status has a row (seeded by migration 9), so concurrent writers only
+    # ever UPDATE and never race to insert the same key; one statement per flush
+    session.connection().execute(
+        update(RequirementStatusCount)
+        .where(RequirementStatusCount.status.in_(deltas))
+        .values(count=RequirementStatusCount.count + case(
+            *((RequirementStatusCount.status == status, delta) for status, delta in deltas.items()), else_=0
+        ))
+    )
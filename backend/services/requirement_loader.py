@@ -0,0 +1,112 @@
+"""
+Requirement Loader
+Fetches a requirement together with its suppliers, latest samples, latest cost
+analyses, negotiation iterations and shortlist in a fixed number of queries.
+"""
+from collections import defaultdict
+from typing import Dict, List, Optional, Union
+
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session, selectinload
+
+from models.procurement import (
+    ProcurementRequirement, Supplier, Sample, CostAnalysis, SupplierShortlist,
+    NegotiationIteration
+)
+
+# Either an explicit list of supplier ids or a SELECT of ids, e.g. every
+# supplier of one requirement (avoids large IN lists).
+SupplierIds = Union[List[int], Select]
+
+
+def _suppliers_for_requirement(requirement_id: int) -> Select:
+    return select(Supplier.id).where(Supplier.requirement_id == requirement_id)
+
+
+def _latest_per_supplier(db: Session, model, pointer, supplier_ids: SupplierIds) -> Dict[int, object]:
+    """Returns the row each supplier's latest_* pointer refers to (primary-key lookups)."""
+    if isinstance(supplier_ids, list) and not supplier_ids:
+        return {}
+
+    rows = db.execute(
+        select(model).where(model.id.in_(select(pointer).where(Supplier.id.in_(supplier_ids))))
+    ).scalars().all()
+    return {row.supplier_id: row for row in rows}
+
+
+def latest_samples(db: Session, supplier_ids: SupplierIds) -> Dict[int, Sample]:
+    """Each supplier's latest sample, looked up through the denormalized Supplier.latest_sample_id pointer."""
+    return _latest_per_supplier(db, Sample, Supplier.latest_sample_id, supplier_ids)
+
+
+def latest_cost_analyses(db: Session, supplier_ids: SupplierIds) -> Dict[int, CostAnalysis]:
+    """Each supplier's latest cost analysis, looked up through the denormalized Supplier.latest_cost_analysis_id pointer."""
+    return _latest_per_supplier(db, CostAnalysis, Supplier.latest_cost_analysis_id, supplier_ids)
+
+
+def negotiation_iterations_by_supplier(db: Session, supplier_ids: SupplierIds) -> Dict[int, List[NegotiationIteration]]:
+    """All negotiation iterations per supplier, ordered by iteration number."""
+    grouped = defaultdict(list)
+    if isinstance(supplier_ids, list) and not supplier_ids:
+        return grouped
+
+    iterations = db.execute(
+        select(NegotiationIteration)
+        .where(NegotiationIteration.supplier_id.in_(supplier_ids))
+        .order_by(NegotiationIteration.supplier_id, NegotiationIteration.iteration_number)
+    ).scalars().all()
+    for iteration in iterations:
+        grouped[iteration.supplier_id].append(iteration)
+    return grouped
+
+
+class RequirementGraph:
+    """Everything `GET /api/requirements/{id}` needs, loaded up front."""
+
+    def __init__(self, requirement: ProcurementRequirement, suppliers: List[Supplier],
+                 samples: Dict[int, Sample], cost_analyses: Dict[int, CostAnalysis],
+                 iterations: Dict[int, List[NegotiationIteration]],
+                 shortlist: List[SupplierShortlist]):
+        self.requirement = requirement
+        self.suppliers = suppliers
+        self.samples = samples
+        self.cost_analyses = cost_analyses
+        self.iterations = iterations
+        self.shortlist = shortlist
+
+
+def load_requirement_graph(db: Session, requirement_id: int) -> Optional[RequirementGraph]:
+    """
+    Loads a requirement and its related rows, certifications included, in eight
+    queries regardless of how many suppliers it has, plus one for blobs missing
+    from the decode cache.
+    Returns None if the requirement does not exist.
+    """
+    requirement = db.query(ProcurementRequirement).options(
+        selectinload(ProcurementRequirement.required_certification_entries)
+    ).filter(
+        ProcurementRequirement.id == requirement_id
+    ).first()
+
+    if not requirement:
+        return None
+
+    suppliers = db.query(Supplier).options(selectinload(Supplier.certification_entries)).filter(
+        Supplier.requirement_id == requirement_id
+    ).order_by(Supplier.id).all()
+    supplier_ids = _suppliers_for_requirement(requirement_id)
+
+    shortlist = db.query(SupplierShortlist).filter(
+        SupplierShortlist.requirement_id == requirement_id
+    ).order_by(SupplierShortlist.rank).all()
+
+    iterations = negotiation_iterations_by_supplier(db, supplier_ids)
+
+    return RequirementGraph(
+        requirement=requirement,
+        suppliers=suppliers,
+        samples=latest_samples(db, supplier_ids),
+        cost_analyses=latest_cost_analyses(db, supplier_ids),
+        iterations=iterations,
+        shortlist=shortlist
+    )
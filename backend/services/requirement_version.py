@@ -0,0 +1,126 @@
+"""
+Requirement Version
+ProcurementRequirement.version increases whenever the requirement or anything
+shown in its detail payload (suppliers, samples, cost analyses, negotiation
+iterations, shortlist entries) is inserted, changed or deleted. The detail
+endpoint derives a strong ETag from it, so an unchanged requirement can be
+answered with 304 after a single-column lookup.
+"""
+from itertools import chain
+from typing import Callable, Dict, List, Optional, Set
+
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+
+from models.procurement import (
+    ProcurementRequirement, Supplier, Sample, CostAnalysis, NegotiationIteration, SupplierShortlist
+)
+
+SUPPLIER_CHILDREN = (Sample, CostAnalysis, NegotiationIteration)
+
+# Called as callback(session, requirement_ids) after versions are bumped in a flush
+_change_listeners: List[Callable[[Session, Set[int]], None]] = []
+
+
+def on_requirements_changed(callback: Callable[[Session, Set[int]], None]):
+    """Registers `callback` to run after each flush that bumps requirement versions."""
+    _change_listeners.append(callback)
+    return callback
+
+
+def requirement_etag(requirement_id: int, version: int, variant: str = "") -> str:
+    """Strong ETag for one representation of a requirement at `version`."""
+    return f'"req-{requirement_id}-v{version}{"-" + variant if variant else ""}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match comparison (RFC 9110 weak comparison, as the spec requires for this header)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def current_version(db: Session, requirement_id: int) -> Optional[int]:
+    return db.execute(
+        select(ProcurementRequirement.version).where(ProcurementRequirement.id == requirement_id)
+    ).scalar()
+
+
+def supplier_requirement_ids(session: Session, supplier_ids: Set[int]) -> Dict[int, int]:
+    """requirement_id per supplier id; suppliers are usually loaded already, only the rest cost a query."""
+    requirement_ids, unresolved = {}, set()
+    for supplier_id in supplier_ids - {None}:
+        supplier = session.identity_map.get(session.identity_key(Supplier, supplier_id))
+        if supplier is not None and "requirement_id" in supplier.__dict__:
+            requirement_ids[supplier_id] = supplier.requirement_id
+        else:
+            unresolved.add(supplier_id)
+    if unresolved:
+        requirement_ids.update(session.connection().execute(
+            select(Supplier.id, Supplier.requirement_id).where(Supplier.id.in_(unresolved))
+        ).all())
+    return requirement_ids
+
+
+def changed_requirement_ids(session: Session) -> Set[int]:
+    """Ids of requirements whose detail rows are new, modified or deleted in this flush."""
+    requirement_ids, supplier_ids = set(), set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if obj in session.dirty and not session.is_modified(obj, include_collections=False):
+            continue
+        if isinstance(obj, ProcurementRequirement):
+            # New requirements start at the column default
+            if obj not in session.new:
+                requirement_ids.add(obj.id)
+        elif isinstance(obj, (Supplier, SupplierShortlist)):
+            requirement_ids.add(obj.requirement_id)
+        elif isinstance(obj, SUPPLIER_CHILDREN):
+            supplier_ids.add(obj.supplier_id)
+
+    requirement_ids.update(supplier_requirement_ids(session, supplier_ids).values())
+    requirement_ids.discard(None)
+    return requirement_ids
+
+
+def bump_versions(session: Session, requirement_ids: Set[int]):
+    """
+    Bumps the versions of `requirement_ids` for writes the flush hook cannot
+    see, such as Core bulk inserts. Pending ORM changes are flushed first, so
+    the change listeners only see this bump.
+    """
+    session.flush()
+    if requirement_ids:
+        _bump(session, set(requirement_ids))
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_requirement_versions(session: Session, flush_context):
+    """One UPDATE per flush, covering every requirement the flushed rows belong to."""
+    requirement_ids = changed_requirement_ids(session)
+    if requirement_ids:
+        _bump(session, requirement_ids)
+
+
+def _bump(session: Session, requirement_ids: Set[int]):
+    session.connection().execute(
+        update(ProcurementRequirement.__table__)
+        .where(ProcurementRequirement.id.in_(requirement_ids))
+        .values(version=ProcurementRequirement.__table__.c.version + 1)
+    )
+
+    # Loaded requirements re-read the new version (and updated_at, set by the
+    # column's onupdate) on next access
+    for obj in list(session.identity_map.values()):
+        if isinstance(obj, ProcurementRequirement):
+            session.expire(obj, ["version", "updated_at"])
+
+    for callback in _change_listeners:
+        callback(session, requirement_ids)
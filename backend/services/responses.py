@@ -0,0 +1,175 @@
+"""
+JSON Responses
+orjson-backed serialization for API responses.
+
+FastAPI normally runs a returned dict through jsonable_encoder (a recursive
+Python walk over every value) and, with a response model, validates it
+again before json.dumps. FastJSONRoute skips both: a payload is projected
+onto the endpoint's response model, keeping only the fields the model (and
+its nested models) declares, and written to bytes by orjson, which handles
+datetimes, enums and numpy values natively. Set RESPONSE_VALIDATION=true
+(debug / CI) to validate each payload against its model instead. Endpoints
+without a response model are written by orjson as returned.
+"""
+import asyncio
+import os
+import types
+import typing
+from functools import lru_cache, wraps
+from typing import Callable, Optional
+
+import orjson
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import ResponseValidationError
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from starlette.responses import Response
+
+RESPONSE_VALIDATION = os.getenv("RESPONSE_VALIDATION", "false").lower() == "true"
+
+DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _fallback(value):
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    # Types orjson does not know (sets, Decimal, ...) go through FastAPI's encoder
+    return jsonable_encoder(value)
+
+
+def dumps(content) -> bytes:
+    """JSON bytes for `content`; NaN and infinity become null."""
+    return orjson.dumps(content, default=_fallback, option=DUMPS_OPTIONS)
+
+
+@lru_cache(maxsize=None)
+def _projector(annotation) -> Optional[Callable]:
+    """
+    Function that drops the dict keys `annotation` does not declare, recursing
+    into nested models, lists and dict values; None if nothing needs dropping.
+    Values are not checked or converted.
+    """
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        declared = {field.alias or name for name, field in annotation.model_fields.items()}
+        nested = [
+            (field.alias or name, projector) for name, field in annotation.model_fields.items()
+            if (projector := _projector(field.annotation)) is not None
+        ]
+
+        def project_model(value):
+            if not isinstance(value, dict):
+                return value
+            # Most payloads already match their model: copy only what changes
+            projected = value if value.keys() <= declared else {
+                key: item for key, item in value.items() if key in declared
+            }
+            for key, project in nested:
+                if key in projected:
+                    item = project(projected[key])
+                    if item is not projected[key]:
+                        if projected is value:
+                            projected = dict(value)
+                        projected[key] = item
+            return projected
+        return project_model
+
+    origin, args = typing.get_origin(annotation), typing.get_args(annotation)
+    if origin in (list, tuple, set, frozenset) and args:
+        project_item = _projector(args[0])
+        if project_item is None:
+            return None
+
+        def project_items(value):
+            if not isinstance(value, (list, tuple)):
+                return value
+            items = [project_item(item) for item in value]
+            return value if all(new is old for new, old in zip(items, value)) else items
+        return project_items
+    if origin is dict and len(args) == 2:
+        project_item = _projector(args[1])
+        if project_item is None:
+            return None
+
+        def project_values(value):
+            if not isinstance(value, dict):
+                return value
+            items = {key: project_item(item) for key, item in value.items()}
+            return value if all(items[key] is item for key, item in value.items()) else items
+        return project_values
+    if origin in (typing.Union, types.UnionType):
+        # Optional[Model] and similar; a union of several models is left as is
+        candidates = [projector for projector in map(_projector, args) if projector is not None]
+        return candidates[0] if len(candidates) == 1 else None
+    return None
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_model) -> TypeAdapter:
+    return TypeAdapter(response_model)
+
+
+def _dumps_validated(adapter: TypeAdapter, content) -> bytes:
+    try:
+        validated = adapter.validate_python(content)
+    except ValidationError as exc:
+        raise ResponseValidationError(errors=exc.errors(), body=content)
+    return dumps(adapter.dump_python(validated))
+
+
+def _serializer(response_model) -> Optional[Callable]:
+    """Content -> JSON bytes for `response_model`, or None for endpoints without one."""
+    if response_model is None or isinstance(response_model, DefaultPlaceholder):
+        return None
+    if RESPONSE_VALIDATION:
+        adapter = _adapter(response_model)
+        return lambda content: _dumps_validated(adapter, content)
+    project = _projector(response_model)
+    if project is None:
+        return dumps
+    return lambda content: dumps(project(content))
+
+
+def dumps_as(response_model, content) -> bytes:
+    """
+    JSON bytes for `content` with only the fields `response_model` declares
+    (validated with RESPONSE_VALIDATION=true). For handlers that build their
+    own Response.
+    """
+    return _serializer(response_model)(content)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def fast_json_endpoint(endpoint, status_code: int, serialize: Callable = None):
+    """Wraps `endpoint` so a non-Response return value is sent as JSON bytes, written by `serialize` if given."""
+
+    def respond(content):
+        if isinstance(content, Response):
+            return content
+        if serialize is None:
+            return FastJSONResponse(content, status_code=status_code)
+        return Response(serialize(content), status_code=status_code, media_type="application/json")
+
+    if asyncio.iscoroutinefunction(endpoint):
+        @wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            return respond(await endpoint(*args, **kwargs))
+        return async_wrapper
+
+    @wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        return respond(endpoint(*args, **kwargs))
+    return wrapper
+
+
+class FastJSONRoute(APIRoute):
+    """APIRoute that trims payloads to the response model and writes them with orjson, bypassing jsonable_encoder."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        serialize = _serializer(kwargs.get("response_model"))
+        super().__init__(path, fast_json_endpoint(endpoint, kwargs.get("status_code") or 200, serialize), **kwargs)
@@ -0,0 +1,159 @@
+"""
+Shortlist Engine
+Maintains the persisted supplier_shortlists ranking of a requirement
+incrementally. Ranks are dense (1..n) and ordered by integrated_score
+descending, ties broken by supplier id. Placing one supplier reads only the
+entries between its old and new position (a range of the score index) and
+rewrites their ranks; a supplier whose score did not change costs a single
+primary-key lookup. Shifted entries are updated through the ORM, so the flush
+hooks bump the requirement version, invalidate cached payloads and publish the
+new ranks.
+"""
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, func, insert, or_, select
+from sqlalchemy.orm import Session
+
+from models.procurement import SupplierShortlist
+from services.requirement_events import record_event
+from services.requirement_version import bump_versions
+from services.shortlist_service import ShortlistService
+
+SCORE_FIELDS = ("integrated_score", "cost_score", "quality_score", "recommendation")
+
+
+def _ranked_before(requirement_id: int, supplier_id: int, integrated_score: float):
+    """Shortlist rows of other suppliers that sort ahead of the given score."""
+    return and_(
+        SupplierShortlist.requirement_id == requirement_id,
+        SupplierShortlist.supplier_id != supplier_id,
+        or_(
+            SupplierShortlist.integrated_score > integrated_score,
+            and_(
+                SupplierShortlist.integrated_score == integrated_score,
+                SupplierShortlist.supplier_id < supplier_id
+            )
+        )
+    )
+
+
+def _ranked_behind(requirement_id: int, supplier_id: int, integrated_score: float):
+    """Shortlist rows of other suppliers that sort behind the given score."""
+    return and_(
+        SupplierShortlist.requirement_id == requirement_id,
+        SupplierShortlist.supplier_id != supplier_id,
+        or_(
+            SupplierShortlist.integrated_score < integrated_score,
+            and_(
+                SupplierShortlist.integrated_score == integrated_score,
+                SupplierShortlist.supplier_id > supplier_id
+            )
+        )
+    )
+
+
+class ShortlistEngine:
+    def __init__(self, scorer: ShortlistService):
+        self.scorer = scorer
+
+    def upsert(self, db: Session, requirement_id: int, supplier_data: Dict) -> SupplierShortlist:
+        """Scores one supplier and moves (or inserts) its entry to the matching rank."""
+        item = self.scorer.score_supplier(supplier_data)
+        supplier_id = item["supplier_id"]
+        new_score = item["integrated_score"]
+
+        entry = self._entry(db, requirement_id, supplier_id)
+        if entry is None:
+            # Everything behind the new entry moves down one; the rest keep their rank
+            last_rank = db.execute(
+                select(func.max(SupplierShortlist.rank)).where(SupplierShortlist.requirement_id == requirement_id)
+            ).scalar() or 0
+            moved = self._shift(db, 1, _ranked_behind(requirement_id, supplier_id, new_score))
+            entry = SupplierShortlist(requirement_id=requirement_id, supplier_id=supplier_id)
+            db.add(entry)
+            entry.rank = last_rank + 1 - moved
+        elif entry.integrated_score is not None and new_score != entry.integrated_score:
+            old_score = entry.integrated_score
+            if new_score > old_score:
+                # Entries it overtakes move down one
+                moved = self._shift(db, 1, _ranked_before(requirement_id, supplier_id, old_score),
+                                    _ranked_behind(requirement_id, supplier_id, new_score))
+                entry.rank -= moved
+            else:
+                # Entries that overtake it move up one
+                moved = self._shift(db, -1, _ranked_behind(requirement_id, supplier_id, old_score),
+                                    _ranked_before(requirement_id, supplier_id, new_score))
+                entry.rank += moved
+
+        for field in SCORE_FIELDS:
+            setattr(entry, field, item[field])
+        return entry
+
+    def remove(self, db: Session, requirement_id: int, supplier_id: int) -> bool:
+        """Drops a supplier's entry and closes the gap in the ranks behind it."""
+        entry = self._entry(db, requirement_id, supplier_id)
+        if not entry:
+            return False
+        self._shift(db, -1, SupplierShortlist.requirement_id == requirement_id,
+                    SupplierShortlist.supplier_id != supplier_id, SupplierShortlist.rank > entry.rank)
+        db.delete(entry)
+        return True
+
+    def sync(self, db: Session, requirement_id: int, suppliers_data: List[Dict]) -> List[Dict]:
+        """
+        Makes the persisted shortlist match `suppliers_data` exactly. Rows whose
+        rank and scores are unchanged are left alone, so re-running it on an
+        unchanged requirement writes nothing; new entries go in with one
+        multi-row INSERT.
+        """
+        ordered = sorted(suppliers_data, key=lambda supplier: supplier["id"])
+        shortlist = self.scorer.create_shortlist(ordered)
+
+        existing: Dict[int, SupplierShortlist] = {}
+        for entry in db.query(SupplierShortlist).filter(
+            SupplierShortlist.requirement_id == requirement_id
+        ).all():
+            if entry.supplier_id in existing:
+                db.delete(entry)
+            else:
+                existing[entry.supplier_id] = entry
+
+        new_rows = []
+        for item in shortlist:
+            entry = existing.pop(item["supplier_id"], None)
+            if entry is None:
+                new_rows.append({
+                    "requirement_id": requirement_id, "supplier_id": item["supplier_id"], "rank": item["rank"],
+                    **{field: item[field] for field in SCORE_FIELDS}
+                })
+                continue
+            # The ORM only issues an UPDATE for attributes whose value changed
+            entry.rank = item["rank"]
+            for field in SCORE_FIELDS:
+                setattr(entry, field, item[field])
+
+        for entry in existing.values():
+            db.delete(entry)
+
+        if new_rows:
+            db.execute(insert(SupplierShortlist), new_rows)
+            # The flush hooks do not see Core inserts
+            record_event(db, requirement_id, {
+                "type": "shortlist.updated", "removed": [],
+                "entries": [{"supplier_id": row["supplier_id"], "rank": row["rank"]} for row in new_rows]
+            })
+            bump_versions(db, {requirement_id})
+        return shortlist
+
+    def _entry(self, db: Session, requirement_id: int, supplier_id: int) -> Optional[SupplierShortlist]:
+        return db.query(SupplierShortlist).filter(
+            SupplierShortlist.requirement_id == requirement_id,
+            SupplierShortlist.supplier_id == supplier_id
+        ).first()
+
+    def _shift(self, db: Session, delta: int, *criteria) -> int:
+        """Moves the matching entries `delta` ranks and returns how many moved."""
+        entries = db.scalars(select(SupplierShortlist).where(*criteria)).all()
+        for entry in entries:
+            entry.rank += delta
+        return len(entries)
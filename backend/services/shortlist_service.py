@@ -6,7 +6,9 @@ Note: This is a demo version that simulates AI behavior without using real AI se
 import json
 import random
 import time
-from typing import List, Dict
+from typing import List, Dict, Optional, Sequence
+
+import numpy as np
 
 
 class ShortlistService:
@@ -21,24 +23,7 @@ class ShortlistService:
         """
         # No delay for demo - instant processing
         
-        shortlist = []
-        
-        for supplier in suppliers_data:
-            cost_score = self._calculate_cost_score(supplier)
-            quality_score = self._calculate_quality_score(supplier)
-            integrated_score = (cost_score * 0.6) + (quality_score * 0.4)  # Weighted
-            
-            recommendation = self._generate_recommendation(supplier, integrated_score)
-            
-            shortlist.append({
-                "rank": 0,  # Will be set after sorting
-                "supplier_id": supplier.get("id"),
-                "supplier_name": supplier.get("name"),
-                "integrated_score": round(integrated_score, 2),
-                "cost_score": round(cost_score, 2),
-                "quality_score": round(quality_score, 2),
-                "recommendation": recommendation
-            })
+        shortlist = [self.score_supplier(supplier) for supplier in suppliers_data]
         
         # Sort by integrated score (descending)
         shortlist.sort(key=lambda x: x["integrated_score"], reverse=True)
@@ -49,6 +34,112 @@ class ShortlistService:
         
         return shortlist
 
+    def score_batch(self, savings_percentage: Sequence[float], quality_approved: Sequence[bool],
+                    certification_counts: Sequence[int], response_received: Sequence[bool]) -> Dict[str, np.ndarray]:
+        """
+        Columnar version of score_supplier: one entry per supplier in each input
+        array. Returns unrounded cost, quality and integrated score arrays plus
+        the integrated score rounded as create_shortlist ranks it.
+        """
+        savings = np.asarray(savings_percentage, dtype=np.float64)
+        approved = np.asarray(quality_approved, dtype=bool)
+        certifications = np.asarray(certification_counts, dtype=np.int64)
+        responded = np.asarray(response_received, dtype=bool)
+        
+        # Same piecewise curve as _calculate_cost_score: 50 at <= 0%, 100 at >= 20%
+        cost_score = np.clip(50 + (savings / 20 * 50), 50.0, 100.0)
+        quality_score = np.minimum(
+            np.where(approved, 70.0, 20.0)
+            + np.minimum(certifications * 5, 20)
+            + np.where(responded, 10.0, 0.0),
+            100.0
+        )
+        integrated_score = (cost_score * 0.6) + (quality_score * 0.4)
+        
+        return {
+            "cost_score": cost_score,
+            "quality_score": quality_score,
+            "integrated_score": integrated_score,
+            "ranking_score": self._round_2(integrated_score)
+        }
+
+    @staticmethod
+    def _round_2(values: np.ndarray) -> np.ndarray:
+        """round(value, 2) for an array; np.round alone can differ on values close to a half cent."""
+        rounded = np.round(values, 2)
+        scaled = values * 100
+        near_half = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+        for index in near_half.tolist():
+            rounded[index] = round(float(values[index]), 2)
+        return rounded
+
+    def create_shortlist_batch(self, supplier_ids: Sequence[int], savings_percentage: Sequence[float],
+                               quality_approved: Sequence[bool], certification_counts: Sequence[int],
+                               response_received: Sequence[bool], k: int = 10,
+                               supplier_names: Optional[Sequence[str]] = None) -> List[Dict]:
+        """
+        Shortlist of the top `k` suppliers from columnar inputs. Ranking matches
+        create_shortlist (integrated score descending, input order on ties), but
+        selection uses argpartition and recommendations are only written for
+        the returned entries.
+        """
+        scores = self.score_batch(savings_percentage, quality_approved, certification_counts, response_received)
+        integrated = scores["ranking_score"]
+        count = len(integrated)
+        k = max(0, min(k, count))
+        if k == 0:
+            return []
+        
+        if k < count:
+            # Everything scoring at least the k-th best score; ties at the
+            # boundary are then resolved by input order like a stable sort
+            threshold = integrated[np.argpartition(-integrated, k - 1)[k - 1]]
+            candidates = np.flatnonzero(integrated >= threshold)
+        else:
+            candidates = np.arange(count)
+        top = candidates[np.lexsort((candidates, -integrated[candidates]))][:k]
+        
+        savings = np.asarray(savings_percentage, dtype=np.float64)
+        approved = np.asarray(quality_approved, dtype=bool)
+        shortlist = []
+        for rank, index in enumerate(top.tolist(), start=1):
+            name = supplier_names[index] if supplier_names is not None else None
+            supplier = {
+                "savings_percentage": float(savings[index]),
+                "quality_approved": bool(approved[index])
+            }
+            if name is not None:
+                supplier["name"] = name
+            shortlist.append({
+                "rank": rank,
+                "supplier_id": int(supplier_ids[index]),
+                "supplier_name": name,
+                "integrated_score": round(float(scores["integrated_score"][index]), 2),
+                "cost_score": round(float(scores["cost_score"][index]), 2),
+                "quality_score": round(float(scores["quality_score"][index]), 2),
+                "recommendation": self._generate_recommendation(
+                    supplier, float(scores["integrated_score"][index])
+                )
+            })
+        
+        return shortlist
+
+    def score_supplier(self, supplier: Dict) -> Dict:
+        """Scores a single supplier; the returned entry has rank 0 until it is placed in a shortlist."""
+        cost_score = self._calculate_cost_score(supplier)
+        quality_score = self._calculate_quality_score(supplier)
+        integrated_score = (cost_score * 0.6) + (quality_score * 0.4)  # Weighted
+        
+        return {
+            "rank": 0,
+            "supplier_id": supplier.get("id"),
+            "supplier_name": supplier.get("name"),
+            "integrated_score": round(integrated_score, 2),
+            "cost_score": round(cost_score, 2),
+            "quality_score": round(quality_score, 2),
+            "recommendation": self._generate_recommendation(supplier, integrated_score)
+        }
+
     def _calculate_cost_score(self, supplier: Dict) -> float:
         """Calculates cost score (0-100, higher is better) - simulated AI scoring."""
         savings_percentage = supplier.get("savings_percentage", 0)
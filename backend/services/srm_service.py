@@ -9,6 +9,8 @@ import time
 from typing import Dict
 from datetime import datetime
 
+from services.report_templates import SRM_ANALYSIS, SRM_ONBOARDING, SRM_RELATIONSHIP, report
+
 
 class SRMService:
     def __init__(self):
@@ -48,96 +50,23 @@ class SRMService:
         }
 
     def _generate_srm_analysis(self, supplier: Dict, requirement: Dict,
-                              procurement_history: Dict) -> str:
+                              procurement_history: Dict) -> Dict:
         """Generates comprehensive SRM analysis (simulated AI)."""
-        supplier_name = supplier.get("name", "Supplier")
-        certifications = supplier.get("certifications", [])
-        
-        return f"""SUPPLIER RELATIONSHIP MANAGEMENT ANALYSIS
-Generated by AI-Powered SRM System
-
-SUPPLIER PROFILE:
-Name: {supplier_name}
-Certifications: {', '.join(certifications) if certifications else 'Pending'}
-Requirement: {requirement.get('title', 'Procurement Requirement')}
-
-CAPABILITY ASSESSMENT:
-✓ Supplier demonstrates strong alignment with procurement requirements
-✓ Certifications indicate compliance with industry standards
-✓ Communication and responsiveness meet expectations
-✓ Cost competitiveness positions supplier favorably
-
-STRATEGIC VALUE:
-- Potential for long-term strategic partnership
-- Alignment with organizational procurement objectives
-- Opportunity for volume-based relationship development
-- Innovation and continuous improvement potential
-
-PERFORMANCE EXPECTATIONS:
-- Quality standards: High (based on certification profile)
-- Delivery reliability: Expected to meet or exceed targets
-- Cost management: Competitive pricing with potential for optimization
-- Service level: Professional engagement expected
-
-COLLABORATION OPPORTUNITIES:
-- Regular performance reviews and feedback sessions
-- Joint process improvement initiatives
-- Technology integration for streamlined operations
-- Knowledge sharing and best practice exchange
-
-LONG-TERM PARTNERSHIP CONSIDERATIONS:
-- Scalability of supplier capabilities
-- Financial stability and business continuity
-- Innovation capacity and adaptability
-- Cultural and strategic alignment
-
-[AI-Generated SRM Analysis - Comprehensive supplier relationship evaluation]"""
+        return report(
+            SRM_ANALYSIS,
+            supplier_name=supplier.get("name", "Supplier"),
+            certifications=supplier.get("certifications", []),
+            requirement_title=requirement.get('title', 'Procurement Requirement')
+        )
 
     def _create_onboarding_plan(self, supplier: Dict, requirement: Dict) -> Dict:
         """Creates onboarding plan for the supplier (simulated AI)."""
-        supplier_name = supplier.get("name", "Supplier")
-        
         return {
-            "plan": f"""SUPPLIER ONBOARDING PLAN
-For: {supplier_name}
-Requirement: {requirement.get('title', 'Procurement Requirement')}
-
-PHASE 1: DOCUMENTATION & COMPLIANCE (Week 1-2)
-- Collect and verify all required certifications
-- Complete supplier registration forms
-- Sign master service agreement
-- Establish payment terms and conditions
-- Set up tax and compliance documentation
-
-PHASE 2: SYSTEM INTEGRATION (Week 2-3)
-- Provide access to procurement portal
-- Integrate with ERP and ordering systems
-- Set up communication channels
-- Configure approval workflows
-- Establish reporting mechanisms
-
-PHASE 3: TRAINING & KNOWLEDGE TRANSFER (Week 3-4)
-- Conduct orientation session on procurement processes
-- Train on system usage and requirements
-- Share quality standards and expectations
-- Review delivery and logistics procedures
-- Establish escalation procedures
-
-PHASE 4: PILOT TESTING (Week 4-5)
-- Execute small pilot order
-- Monitor quality and delivery performance
-- Gather feedback and address issues
-- Refine processes and procedures
-- Validate system integrations
-
-PHASE 5: FULL ONBOARDING (Week 5-6)
-- Scale up to full operational capacity
-- Establish regular review cadence
-- Implement performance monitoring
-- Begin strategic relationship development
-- Transition to business-as-usual operations
-
-[AI-Generated Onboarding Plan - Optimized for efficient supplier integration]""",
+            "plan": report(
+                SRM_ONBOARDING,
+                supplier_name=supplier.get("name", "Supplier"),
+                requirement_title=requirement.get('title', 'Procurement Requirement')
+            ),
             "estimated_timeline": "4-6 weeks",
             "key_phases": [
                 "Documentation & Compliance",
@@ -187,48 +116,9 @@ PHASE 5: FULL ONBOARDING (Week 5-6)
         return risks.get(risk_level, risks["medium"])
 
     def _develop_relationship_strategy(self, supplier: Dict, requirement: Dict,
-                                       srm_analysis: str) -> str:
+                                       srm_analysis: Dict) -> Dict:
         """Develops relationship management strategy (simulated AI)."""
-        supplier_name = supplier.get("name", "Supplier")
-        
-        return f"""SUPPLIER RELATIONSHIP MANAGEMENT STRATEGY
-For: {supplier_name}
-
-COMMUNICATION APPROACH:
-- Establish regular cadence: Monthly business reviews
-- Multi-channel communication: Email, phone, portal, meetings
-- Proactive engagement: Quarterly strategic planning sessions
-- Issue escalation: Defined escalation matrix with response SLAs
-
-PERFORMANCE MANAGEMENT:
-- Key Performance Indicators (KPIs):
-  * On-time delivery: Target 95%+
-  * Quality acceptance rate: Target 98%+
-  * Cost competitiveness: Maintain or improve pricing
-  * Service responsiveness: 24-hour response time
-- Performance reviews: Quarterly formal reviews
-- Continuous improvement: Annual improvement plans
-
-COLLABORATION OPPORTUNITIES:
-- Joint process improvement initiatives
-- Innovation partnerships for new solutions
-- Technology integration for efficiency gains
-- Knowledge sharing and best practice exchange
-- Sustainability and CSR alignment
-
-CONTINUOUS IMPROVEMENT INITIATIVES:
-- Regular feedback sessions and performance data sharing
-- Collaborative problem-solving for operational challenges
-- Innovation workshops for process optimization
-- Benchmarking against industry standards
-- Technology adoption for digital transformation
-
-LONG-TERM PARTNERSHIP ROADMAP:
-Year 1: Establish foundation and prove value
-Year 2: Expand scope and deepen relationship
-Year 3+: Strategic partnership with integrated operations
-
-[AI-Generated Relationship Strategy - Optimized for strategic supplier partnership]"""
+        return report(SRM_RELATIONSHIP, supplier_name=supplier.get("name", "Supplier"))
 
     def _identify_key_metrics(self, supplier: Dict, requirement: Dict) -> Dict:
         """Identifies key performance metrics for the supplier relationship."""
@@ -0,0 +1,93 @@
+"""
+Supplier Snapshot
+Keeps Supplier.latest_sample_id / latest_cost_analysis_id and the cached
+figures next to them (quality approval, total cost, savings) pointing at each
+supplier's newest Sample and CostAnalysis, so readers need a primary-key
+lookup instead of an ORDER BY ... DESC LIMIT 1 per supplier.
+"""
+from typing import Dict
+
+from sqlalchemy import and_, event, exists, inspect, or_, update
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.orm.attributes import set_committed_value
+
+from models.procurement import Supplier, Sample, CostAnalysis
+
+COST_FIGURES = {
+    "latest_total_cost": "total_cost",
+    "latest_savings": "savings",
+    "latest_savings_percentage": "savings_percentage",
+}
+
+
+def sample_figures(sample: Sample) -> Dict[str, object]:
+    return {"latest_sample_id": sample.id, "latest_quality_approved": sample.quality_approved}
+
+
+def cost_analysis_figures(analysis: CostAnalysis) -> Dict[str, object]:
+    figures = {column: getattr(analysis, attr) for column, attr in COST_FIGURES.items()}
+    figures["latest_cost_analysis_id"] = analysis.id
+    return figures
+
+
+def _newer_than_current(model, pointer, row, order_column: str):
+    """
+    True unless the row the supplier currently points at sorts after `row` on
+    (order_column, id), the same order the backfill uses.
+    """
+    current = aliased(model)
+    current_order, row_order = getattr(current, order_column), getattr(row, order_column)
+    return ~exists().where(
+        current.id == pointer,
+        or_(current_order > row_order, and_(current_order == row_order, current.id > row.id))
+    )
+
+
+def _apply(session: Session, supplier_id: int, values: Dict[str, object], condition):
+    conn = session.connection()
+    result = conn.execute(
+        update(Supplier).where(Supplier.id == supplier_id, condition).values(**values)
+    )
+    if result.rowcount:
+        # Keep an already loaded supplier in step with the row just written
+        supplier = session.identity_map.get(session.identity_key(Supplier, supplier_id))
+        if supplier is not None:
+            for key, value in values.items():
+                set_committed_value(supplier, key, value)
+
+
+def _changed(obj, *attrs) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[attr].history.has_changes() for attr in attrs)
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_supplier_snapshot(session: Session, flush_context):
+    """Moves the latest_* pointers on insert and refreshes cached figures on update."""
+    for obj in sorted(session.new, key=lambda o: getattr(o, "id", 0) or 0):
+        if isinstance(obj, Sample) and obj.supplier_id is not None:
+            _apply(session, obj.supplier_id, sample_figures(obj),
+                   _newer_than_current(Sample, Supplier.latest_sample_id, obj, "received_date"))
+        elif isinstance(obj, CostAnalysis) and obj.supplier_id is not None:
+            _apply(session, obj.supplier_id, cost_analysis_figures(obj),
+                   _newer_than_current(CostAnalysis, Supplier.latest_cost_analysis_id, obj, "created_at"))
+
+    for obj in session.dirty:
+        if isinstance(obj, Sample) and _changed(obj, "quality_approved"):
+            _apply(session, obj.supplier_id, {"latest_quality_approved": obj.quality_approved},
+                   Supplier.latest_sample_id == obj.id)
+        elif isinstance(obj, CostAnalysis) and _changed(obj, *COST_FIGURES.values()):
+            values = cost_analysis_figures(obj)
+            values.pop("latest_cost_analysis_id")
+            _apply(session, obj.supplier_id, values, Supplier.latest_cost_analysis_id == obj.id)
+
+
+def record_latest_samples(suppliers: Dict[int, Supplier], sample_ids: Dict[int, int]):
+    """
+    Points suppliers at samples written with a Core INSERT, which bypasses the
+    flush listener. Only for freshly received samples, which are always newest.
+    """
+    for supplier_id, sample_id in sample_ids.items():
+        supplier = suppliers[supplier_id]
+        supplier.latest_sample_id = sample_id
+        supplier.latest_quality_approved = None
@@ -0,0 +1,29 @@
+"""
+Runs the tests against a throwaway SQLite database. DATABASE_URL has to be set
+before models.database is first imported, so it is set here at collection time.
+
+Usage (from the backend directory):
+    python -m pytest tests
+"""
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='procurement_tests_'), 'test.db')}"
+os.environ.setdefault("ENABLE_ASYNC_DB", "false")
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    """Creates the tables and applies the migrations once for the whole run."""
+    from models.database import Base, engine
+    from models.migrations import run_migrations
+
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from scipy import sparse
+from scipy.optimize import linprog
+
+from services import award_optimizer
+from services.award_optimizer import AwardInfeasible, AwardTooLarge, allocate_award
+
+
+def landed_costs(suppliers: int, warehouses: int, locations: int, seed: int = 7):
+    """Unit price plus per-location freight spread over the quantity, as the award endpoint builds it."""
+    rng = np.random.default_rng(seed)
+    demand = rng.integers(10, 100, warehouses).astype(np.float64)
+    freight = rng.uniform(100, 1000, (locations, warehouses))
+    cost = rng.uniform(5, 15, (suppliers, 1)) + freight[rng.integers(0, locations, suppliers)] / demand.sum()
+    capacities = rng.uniform(0.5, 1.5, suppliers)
+    capacities *= demand.sum() * 1.3 / capacities.sum()
+    return cost, capacities, demand
+
+
+def full_lp_cost(cost, capacities, demand):
+    suppliers, warehouses = cost.shape
+    return linprog(
+        cost.ravel(),
+        A_ub=sparse.kron(sparse.identity(suppliers), np.ones((1, warehouses))), b_ub=capacities,
+        A_eq=sparse.kron(np.ones((1, suppliers)), sparse.identity(warehouses)), b_eq=demand,
+        bounds=(0, None), method="highs"
+    ).fun
+
+
+@pytest.mark.parametrize("locations, method", [(1, "northwest"), (4, "lp")])
+def test_plan_is_feasible_and_as_cheap_as_the_full_lp(locations, method):
+    cost, capacities, demand = landed_costs(40, 12, locations)
+    plan = allocate_award(cost, capacities, warehouse_demand=demand)
+
+    assert plan["method"] == method
+    allocation = plan["allocation"]
+    assert np.all(allocation >= 0)
+    assert np.allclose(allocation.sum(axis=0), demand)
+    assert np.all(allocation.sum(axis=1) <= capacities + 1e-6)
+    assert plan["total_cost"] == pytest.approx(float(np.sum(allocation * cost)))
+    assert plan["total_cost"] == pytest.approx(full_lp_cost(cost, capacities, demand), rel=1e-9)
+
+
+def test_free_warehouse_choice_fills_cheapest_suppliers_first():
+    cost = np.array([[3.0, 1.0], [2.0, 4.0], [5.0, 5.0]])
+    plan = allocate_award(cost, [10, 10, 10], quantity=15)
+
+    assert plan["method"] == "greedy"
+    assert np.allclose(plan["allocation"], [[0, 10], [5, 0], [0, 0]])
+    assert plan["total_cost"] == pytest.approx(20.0)
+
+
+def test_insufficient_capacity_is_infeasible():
+    cost, capacities, demand = landed_costs(5, 3, 1)
+    with pytest.raises(AwardInfeasible):
+        allocate_award(cost, capacities, warehouse_demand=demand * 2)
+
+
+def test_lp_size_is_bounded(monkeypatch):
+    monkeypatch.setattr(award_optimizer, "AWARD_LP_MAX_VARIABLES", 10)
+    cost, capacities, demand = landed_costs(20, 5, 3)
+    with pytest.raises(AwardTooLarge):
+        allocate_award(cost, capacities, warehouse_demand=demand)
@@ -0,0 +1,82 @@
+import itertools
+import random
+
+import pytest
+
+from models.database import SessionLocal
+from models.procurement import ProcurementRequirement, Supplier
+from services.certification_search import search_suppliers_by_certifications
+from services.requirement_listing import InvalidCursor
+
+CERTIFICATIONS = ["Search ISO 9001", "Search ISO 14001", "Search FSC", "Search Fair Trade"]
+
+
+@pytest.fixture(scope="module")
+def suppliers():
+    """{supplier id: (requirement id, certifications)} over two requirements."""
+    rng = random.Random(5)
+    held = {}
+    with SessionLocal() as db:
+        for _ in range(2):
+            requirement = ProcurementRequirement(title="search", category="search")
+            db.add(requirement)
+            db.flush()
+            for i in range(30):
+                certifications = [name for name in CERTIFICATIONS if rng.random() < 0.5]
+                supplier = Supplier(requirement_id=requirement.id, name=f"s{i}", company="c",
+                                    certifications=certifications)
+                db.add(supplier)
+                db.flush()
+                held[supplier.id] = (requirement.id, certifications)
+        db.commit()
+    return held
+
+
+def search_all(names, requirement_id=None, limit=4):
+    ids, cursor = [], None
+    with SessionLocal() as db:
+        while True:
+            page = search_suppliers_by_certifications(db, names, requirement_id=requirement_id,
+                                                      limit=limit, cursor=cursor)
+            ids += [item["id"] for item in page["items"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return ids
+
+
+@pytest.mark.parametrize("names", [
+    list(combination) for size in (1, 2, 3) for combination in itertools.combinations(CERTIFICATIONS, size)
+])
+def test_pages_hold_exactly_the_suppliers_with_every_certification(suppliers, names):
+    expected = sorted(sid for sid, (_, held) in suppliers.items() if set(names) <= set(held))
+    assert search_all(names) == expected
+
+
+def test_names_match_case_insensitively_and_ignore_duplicates(suppliers):
+    names = [CERTIFICATIONS[0], CERTIFICATIONS[1]]
+    assert search_all([name.upper() for name in names] + [f" {names[0].lower()} "]) == search_all(names)
+
+
+def test_requirement_filter(suppliers):
+    requirement_id = next(iter(suppliers.values()))[0]
+    expected = sorted(sid for sid, (rid, held) in suppliers.items()
+                      if rid == requirement_id and CERTIFICATIONS[2] in held)
+    assert search_all([CERTIFICATIONS[2]], requirement_id=requirement_id) == expected
+
+
+def test_unknown_certification_matches_nothing(suppliers):
+    assert search_all([CERTIFICATIONS[0], "Search Nobody Holds This"]) == []
+
+
+def test_certification_changes_are_searchable(suppliers):
+    supplier_id = min(suppliers)
+    with SessionLocal() as db:
+        db.get(Supplier, supplier_id).certifications = ["Search Newly Granted"]
+        db.commit()
+    assert search_all(["search newly granted"]) == [supplier_id]
+    assert supplier_id not in search_all([CERTIFICATIONS[0]])
+
+
+def test_invalid_cursor_is_rejected():
+    with SessionLocal() as db, pytest.raises(InvalidCursor):
+        search_suppliers_by_certifications(db, [CERTIFICATIONS[0]], cursor="!!")
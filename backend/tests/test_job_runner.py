@@ -0,0 +1,98 @@
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+from models.database import SessionLocal
+from models.jobs import JobStatus, PipelineJob
+from services.job_runner import JobRunner
+
+JOB_TYPE = "test-pipeline"
+
+
+def add_job(db, requirement_id: int, status: JobStatus = JobStatus.QUEUED, claimed_by: str = None,
+            heartbeat_at: datetime = None) -> int:
+    job = PipelineJob(job_type=JOB_TYPE, requirement_id=requirement_id, status=status, claimed_by=claimed_by,
+                      heartbeat_at=heartbeat_at, stages="[]", result="{}")
+    db.add(job)
+    db.commit()
+    return job.id
+
+
+def finish(db, *job_ids: int):
+    """Keeps these jobs out of later tests' recover() sweeps."""
+    db.query(PipelineJob).filter(PipelineJob.id.in_(job_ids)).update(
+        {PipelineJob.status: JobStatus.COMPLETED}, synchronize_session=False
+    )
+    db.commit()
+
+
+def test_only_one_worker_claims_a_queued_job():
+    first, second = JobRunner(max_workers=1), JobRunner(max_workers=1)
+    with SessionLocal() as db:
+        job_id = add_job(db, 1)
+        assert first._claim(db, job_id)
+        assert not second._claim(db, job_id)
+        job = db.get(PipelineJob, job_id)
+        assert (job.status, job.claimed_by, job.attempts) == (JobStatus.RUNNING, first.worker_id, 1)
+        finish(db, job_id)
+
+
+def test_expired_lease_is_reclaimed_and_live_lease_is_not():
+    runner = JobRunner(max_workers=1, lease_seconds=60)
+    now = datetime.utcnow()
+    with SessionLocal() as db:
+        live = add_job(db, 2, JobStatus.RUNNING, "live-worker", now)
+        dead = add_job(db, 3, JobStatus.RUNNING, "dead-worker", now - timedelta(minutes=5))
+        assert not runner._claim(db, live)
+        assert runner._claim(db, dead)
+        assert db.get(PipelineJob, dead).claimed_by == runner.worker_id
+        finish(db, live, dead)
+
+
+def wait_for(job_ids, timeout: float = 10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with SessionLocal() as db:
+            statuses = {job.status for job in db.query(PipelineJob).filter(PipelineJob.id.in_(job_ids))}
+        if statuses == {JobStatus.COMPLETED}:
+            return
+        time.sleep(0.05)
+    pytest.fail(f"jobs {job_ids} did not complete: {statuses}")
+
+
+def test_concurrent_recover_runs_each_job_once():
+    runs = []
+
+    def make_runner():
+        runner = JobRunner(max_workers=2, lease_seconds=60)
+
+        @runner.register(JOB_TYPE, stages=["work"])
+        def pipeline(ctx, db, requirement_id):
+            runs.append(requirement_id)
+            ctx.start_stage("work")
+            time.sleep(0.05)
+            ctx.complete_stage("work", ok=True)
+            db.commit()
+        return runner
+
+    first, second = make_runner(), make_runner()
+    now = datetime.utcnow()
+    with SessionLocal() as db:
+        queued = [add_job(db, requirement_id) for requirement_id in range(10, 16)]
+        abandoned = add_job(db, 16, JobStatus.RUNNING, "dead-worker", now - timedelta(minutes=5))
+        held = add_job(db, 17, JobStatus.RUNNING, "live-worker", now)
+    try:
+        assert set(first.recover()) >= {*queued, abandoned}
+        second.recover()
+        wait_for([*queued, abandoned])
+    finally:
+        first.shutdown()
+        second.shutdown()
+
+    assert Counter(runs) == {requirement_id: 1 for requirement_id in range(10, 17)}
+    with SessionLocal() as db:
+        assert db.get(PipelineJob, held).claimed_by == "live-worker"
+        assert db.get(PipelineJob, abandoned).attempts == 1
+        finish(db, held)
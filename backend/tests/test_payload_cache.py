@@ -0,0 +1,82 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from models.database import SessionLocal
+from models.procurement import ProcurementRequirement
+from services.payload_cache import LocalBackend, PayloadCache, payload_cache
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def requirement_id():
+    if not payload_cache.enabled:
+        pytest.skip("PAYLOAD_CACHE_BACKEND=none")
+    response = client.post("/api/requirements", json={
+        "title": "Cached", "description": "d", "category": "office supplies", "quantity": 10, "unit": "u",
+        "required_certifications": []
+    })
+    return response.json()["id"]
+
+
+def test_repeat_get_is_served_from_the_cache(requirement_id):
+    url = f"/api/requirements/{requirement_id}"
+    first = client.get(url)
+    hits = payload_cache.stats()["hits"]
+    second = client.get(url)
+
+    assert payload_cache.stats()["hits"] == hits + 1
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+
+
+def test_write_invalidates_the_cached_body(requirement_id):
+    url = f"/api/requirements/{requirement_id}"
+    client.get(url)
+    invalidations = payload_cache.stats()["invalidations"]
+    with SessionLocal() as db:
+        db.get(ProcurementRequirement, requirement_id).title = "Cached, retitled"
+        db.commit()
+
+    assert payload_cache.stats()["invalidations"] > invalidations
+    assert client.get(url).json()["title"] == "Cached, retitled"
+
+
+def test_versions_and_variants_are_separate_entries():
+    cache = PayloadCache(LocalBackend())
+    cache.set(1, 1, b"plain")
+    cache.set(1, 1, b"rendered", variant="render")
+    assert cache.get(1, 1) == b"plain"
+    assert cache.get(1, 1, variant="render") == b"rendered"
+    assert cache.get(1, 2) is None
+    cache.invalidate({1})
+    assert cache.get(1, 1) is None and cache.get(1, 1, variant="render") is None
+
+
+def test_local_backend_evicts_least_recently_used_requirement():
+    backend = LocalBackend(max_entries=2)
+    backend.set("a", "v1", b"a")
+    backend.set("b", "v1", b"b")
+    backend.get("a", "v1")
+    backend.set("c", "v1", b"c")
+    assert backend.get("b", "v1") is None
+    assert backend.get("a", "v1") == b"a"
+    assert backend.stats()["evictions"] == 1
+
+
+def test_local_backend_byte_budget_and_ttl():
+    backend = LocalBackend(max_bytes=10, ttl_seconds=0.05)
+    backend.set("a", "v1", b"12345")
+    backend.set("b", "v1", b"123456")
+    assert backend.get("a", "v1") is None
+    assert backend.stats()["bytes"] == 6
+    # Bodies larger than the whole budget are never stored
+    backend.set("big", "v1", b"x" * 11)
+    assert backend.get("big", "v1") is None
+
+    time.sleep(0.06)
+    assert backend.get("b", "v1") is None
+    assert backend.stats()["expirations"] == 1
@@ -0,0 +1,66 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from models.database import SessionLocal
+from models.procurement import ProcurementRequirement
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def requirement_id():
+    response = client.post("/api/requirements", json={
+        "title": "ETag", "description": "d", "category": "office supplies", "quantity": 100, "unit": "u",
+        "required_certifications": ["ISO 9001"]
+    })
+    return response.json()["id"]
+
+
+def retitle(requirement_id: int, title: str):
+    with SessionLocal() as db:
+        db.get(ProcurementRequirement, requirement_id).title = title
+        db.commit()
+
+
+def test_matching_etag_gets_an_empty_304(requirement_id):
+    url = f"/api/requirements/{requirement_id}"
+    etag = client.get(url).headers["etag"]
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert not response.content
+    # Weak and list forms match too
+    assert client.get(url, headers={"If-None-Match": f'"other", W/{etag}'}).status_code == 304
+
+
+def test_same_etag_means_same_body(requirement_id):
+    url = f"/api/requirements/{requirement_id}"
+    first, second = client.get(url), client.get(url)
+    assert first.headers["etag"] == second.headers["etag"]
+    assert first.content == second.content
+
+
+def test_write_changes_the_etag(requirement_id):
+    url = f"/api/requirements/{requirement_id}"
+    etag = client.get(url).headers["etag"]
+    retitle(requirement_id, "ETag, retitled")
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["title"] == "ETag, retitled"
+
+
+def test_rendered_variant_has_its_own_etag(requirement_id):
+    url = f"/api/requirements/{requirement_id}"
+    plain = client.get(url).headers["etag"]
+    rendered = client.get(url + "?render=true").headers["etag"]
+    assert rendered != plain
+    assert client.get(url + "?render=true", headers={"If-None-Match": rendered}).status_code == 304
+    assert client.get(url + "?render=true", headers={"If-None-Match": plain}).status_code == 200
+
+
+def test_missing_requirement_is_404_whatever_the_etag():
+    assert client.get("/api/requirements/999999", headers={"If-None-Match": '"x"'}).status_code == 404
@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from models.database import SessionLocal
+from models.migrations import _011_requirement_created_at
+from models.procurement import ProcurementRequirement, RequirementStatus
+from services.requirement_listing import (
+    InvalidCursor, encode_cursor, list_requirements_page, status_counts
+)
+
+
+def seed_requirements(category: str, count: int, created_at: datetime = None):
+    """`count` requirements in `category`; pairs share a created_at so ties are broken by id."""
+    created_at = created_at or datetime(2024, 1, 1)
+    with SessionLocal() as db:
+        requirements = [
+            ProcurementRequirement(title=f"{category} {i}", category=category, status=RequirementStatus.DRAFT,
+                                   created_at=created_at + timedelta(minutes=i // 2),
+                                   deadline=datetime(2025, 1, 1) + timedelta(days=i))
+            for i in range(count)
+        ]
+        db.add_all(requirements)
+        db.commit()
+        return [requirement.id for requirement in requirements]
+
+
+def all_pages(db, **filters):
+    pages, cursor = [], None
+    while True:
+        page = list_requirements_page(db, cursor=cursor, **filters)
+        pages.append(page)
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_pages_walk_every_row_newest_first_without_overlap():
+    ids = seed_requirements("keyset paging", 25)
+    with SessionLocal() as db:
+        pages = all_pages(db, limit=7, category="keyset paging")
+    assert [len(page["items"]) for page in pages] == [7, 7, 7, 4]
+
+    items = [item for page in pages for item in page["items"]]
+    # created_at descending, ties by id descending: the reverse of insertion order
+    assert [item["id"] for item in items] == sorted(ids, reverse=True)
+
+
+def test_filters_apply_to_every_page():
+    seed_requirements("keyset filters", 10)
+    with SessionLocal() as db:
+        pages = all_pages(db, limit=3, category="keyset filters",
+                          deadline_from=datetime(2025, 1, 3), deadline_to=datetime(2025, 1, 8))
+    deadlines = [item["deadline"] for page in pages for item in page["items"]]
+    assert len(deadlines) == 6
+    assert all("2025-01-03" <= deadline[:10] <= "2025-01-08" for deadline in deadlines)
+
+
+def test_invalid_cursor_is_rejected():
+    with SessionLocal() as db, pytest.raises(InvalidCursor):
+        list_requirements_page(db, cursor="not-a-cursor")
+
+
+def test_status_counts_follow_inserts_status_changes_and_deletes():
+    with SessionLocal() as db:
+        before = status_counts(db)
+        requirements = [ProcurementRequirement(title="counted", status=RequirementStatus.DRAFT) for _ in range(3)]
+        db.add_all(requirements)
+        db.commit()
+        requirements[0].status = RequirementStatus.SCOUTING
+        requirements[1].status = RequirementStatus.REJECTED
+        db.delete(requirements[2])
+        db.commit()
+        after = status_counts(db)
+
+    changes = {status: after[status] - before[status] for status in after if after[status] != before[status]}
+    assert changes == {"scouting": 1, "rejected": 1}
+
+
+def test_status_counts_match_the_table():
+    with SessionLocal() as db:
+        actual = {status.value: 0 for status in RequirementStatus}
+        for (status,) in db.query(ProcurementRequirement.status):
+            actual[status.value] += 1
+        assert status_counts(db) == actual
+
+
+def test_migration_backfills_missing_created_at():
+    # Databases created before the column was NOT NULL still allow (and may hold) NULLs
+    legacy = create_engine("sqlite://")
+    with legacy.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE procurement_requirements (id INTEGER PRIMARY KEY, created_at DATETIME, updated_at DATETIME)"
+        ))
+        conn.execute(text(
+            "INSERT INTO procurement_requirements (id, created_at, updated_at) VALUES "
+            "(1, NULL, '2024-03-01 12:00:00.000000'), (2, NULL, NULL), (3, '2024-01-01 00:00:00.000000', NULL)"
+        ))
+        _011_requirement_created_at(conn)
+        rows = conn.execute(text("SELECT id, created_at FROM procurement_requirements ORDER BY id")).all()
+
+    assert rows[0].created_at == "2024-03-01 12:00:00.000000"
+    assert rows[1].created_at is not None
+    assert rows[2].created_at == "2024-01-01 00:00:00.000000"
+    encode_cursor(datetime.fromisoformat(rows[1].created_at), rows[1].id)
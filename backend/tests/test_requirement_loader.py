@@ -0,0 +1,78 @@
+from datetime import datetime
+
+from sqlalchemy import event
+
+from models.database import SessionLocal, engine
+from models.procurement import (
+    ProcurementRequirement, Supplier, Sample, CostAnalysis, NegotiationIteration, SupplierShortlist,
+    RequirementStatus, SupplierStatus
+)
+from services.report_templates import pack
+# Registers the flush listener that points suppliers at their latest sample / cost analysis
+import services.supplier_snapshot  # noqa: F401
+from services.requirement_loader import load_requirement_graph
+
+# One SELECT each for the requirement, its certifications, the suppliers, their
+# certifications, the shortlist, the negotiation iterations, the latest samples
+# and the latest cost analyses. Strategies are inline and certifications come
+# from the link tables, so reading them costs nothing more.
+EXPECTED_STATEMENTS = 8
+
+
+def seed_requirement(supplier_count: int) -> int:
+    """A requirement whose suppliers each have a sample, a cost analysis, two iterations and a shortlist entry."""
+    now = datetime.utcnow()
+    with SessionLocal() as db:
+        requirement = ProcurementRequirement(
+            title=f"{supplier_count} suppliers", category="office supplies", quantity=1000, unit="units",
+            required_certifications=["ISO 9001"], status=RequirementStatus.SHORTLISTED
+        )
+        db.add(requirement)
+        for i in range(supplier_count):
+            supplier = Supplier(requirement=requirement, name=f"Supplier {i}", certifications=["ISO 9001", "CE"],
+                                status=SupplierStatus.SHORTLISTED)
+            db.add_all([
+                supplier,
+                Sample(supplier=supplier, received_date=now, quantity=10, address="Warehouse", price_quoted=100.0),
+                CostAnalysis(supplier=supplier, total_cost=1000.0 + i, savings=10.0, savings_percentage=1.0),
+                SupplierShortlist(requirement=requirement, supplier=supplier, rank=i + 1,
+                                  integrated_score=50.0, cost_score=50.0, quality_score=50.0),
+            ])
+            for number in (1, 2):
+                db.add(NegotiationIteration(
+                    supplier=supplier, iteration_number=number, proposed_cost=900.0, target_cost=850.0,
+                    negotiation_strategy=pack({"supplier": i, "iteration": number}), outcome="counter"
+                ))
+        db.commit()
+        return requirement.id
+
+
+def count_loader_statements(requirement_id: int) -> int:
+    statements = []
+
+    def count(*args):
+        statements.append(args[2])
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        with SessionLocal() as db:
+            graph = load_requirement_graph(db, requirement_id)
+            for supplier in graph.suppliers:
+                supplier.certifications
+                for iteration in graph.iterations.get(supplier.id, []):
+                    iteration.negotiation_strategy
+            graph.requirement.required_certifications
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    assert len(graph.suppliers) == len(graph.samples) == len(graph.cost_analyses) == len(graph.shortlist)
+    return len(statements)
+
+
+def test_query_count_does_not_grow_with_suppliers():
+    counts = {size: count_loader_statements(seed_requirement(size)) for size in (1, 10, 100)}
+    assert counts == {size: EXPECTED_STATEMENTS for size in counts}, counts
+
+
+def test_missing_requirement_returns_none():
+    with SessionLocal() as db:
+        assert load_requirement_graph(db, 10 ** 9) is None
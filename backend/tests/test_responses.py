@@ -0,0 +1,77 @@
+from typing import Dict, List, Optional
+
+import orjson
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.exceptions import ResponseValidationError
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from services import responses
+from services.responses import FastJSONRoute, dumps_as
+
+
+class Line(BaseModel):
+    sku: str
+    quantity: float
+
+
+class Order(BaseModel):
+    id: int
+    lines: List[Line]
+    primary: Optional[Line] = None
+    by_warehouse: Dict[str, Line] = {}
+
+
+ORDER = {
+    "id": 7,
+    "internal_notes": "not for clients",
+    "lines": [{"sku": "A", "quantity": 2, "cost_basis": 1.5}],
+    "primary": {"sku": "A", "quantity": 2, "supplier_margin": 0.3},
+    "by_warehouse": {"1": {"sku": "B", "quantity": 1, "cost_basis": 9}}
+}
+
+
+def test_undeclared_fields_are_dropped_at_every_level():
+    assert orjson.loads(dumps_as(Order, ORDER)) == {
+        "id": 7,
+        "lines": [{"sku": "A", "quantity": 2}],
+        "primary": {"sku": "A", "quantity": 2},
+        "by_warehouse": {"1": {"sku": "B", "quantity": 1}}
+    }
+    # The handler's payload is not modified
+    assert "cost_basis" in ORDER["lines"][0]
+
+
+def test_matching_payload_is_written_as_is():
+    payload = {"id": 1, "lines": [{"sku": "A", "quantity": 1}]}
+    assert orjson.loads(dumps_as(Order, payload)) == payload
+
+
+def test_payloads_are_not_validated_by_default():
+    assert orjson.loads(dumps_as(Order, {"id": "seven", "lines": []})) == {"id": "seven", "lines": []}
+
+
+def test_response_validation_flag_checks_payloads(monkeypatch):
+    monkeypatch.setattr(responses, "RESPONSE_VALIDATION", True)
+    assert orjson.loads(dumps_as(Order, ORDER))["lines"] == [{"sku": "A", "quantity": 2.0}]
+    with pytest.raises(ResponseValidationError):
+        dumps_as(Order, {"id": "seven", "lines": []})
+
+
+def test_fast_json_route_trims_to_the_response_model():
+    router = APIRouter(route_class=FastJSONRoute)
+
+    @router.get("/order", response_model=Order)
+    def get_order():
+        return ORDER
+
+    @router.get("/raw")
+    def get_raw():
+        return ORDER
+
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+    assert "internal_notes" not in client.get("/order").json()
+    assert client.get("/raw").json() == ORDER
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+from sqlalchemy import select
+
+from models.database import SessionLocal
+from models.procurement import ProcurementRequirement, Supplier, SupplierShortlist
+from services.requirement_version import current_version
+from services.shortlist_engine import ShortlistEngine
+from services.shortlist_service import ShortlistService
+
+engine = ShortlistEngine(ShortlistService())
+
+
+def supplier_data(supplier_id: int, rng: random.Random) -> dict:
+    return {
+        "id": supplier_id,
+        "name": f"supplier {supplier_id}",
+        "quality_approved": rng.random() < 0.5,
+        "certifications": [],
+        "total_cost": 1000,
+        "savings": 10,
+        # Few distinct scores, so ties (broken by supplier id) are common
+        "savings_percentage": rng.choice([0, 2.5, 5, 10, 15, 20]),
+        "response_received": True
+    }
+
+
+@pytest.fixture
+def requirement():
+    with SessionLocal() as db:
+        requirement = ProcurementRequirement(title="shortlist", category="shortlist", quantity=10, unit="u")
+        db.add(requirement)
+        db.flush()
+        suppliers = [Supplier(requirement_id=requirement.id, name=f"s{i}", company="c") for i in range(40)]
+        db.add_all(suppliers)
+        db.commit()
+        return requirement.id, [supplier.id for supplier in suppliers]
+
+
+def assert_ranks_dense_and_ordered(db, requirement_id: int):
+    rows = db.execute(
+        select(SupplierShortlist.supplier_id, SupplierShortlist.rank, SupplierShortlist.integrated_score)
+        .where(SupplierShortlist.requirement_id == requirement_id)
+    ).all()
+    expected = sorted(rows, key=lambda row: (-row.integrated_score, row.supplier_id))
+    assert [row.rank for row in expected] == list(range(1, len(rows) + 1))
+
+
+def test_sync_ranks_every_supplier(requirement):
+    requirement_id, supplier_ids = requirement
+    rng = random.Random(1)
+    with SessionLocal() as db:
+        before = current_version(db, requirement_id)
+        engine.sync(db, requirement_id, [supplier_data(i, rng) for i in supplier_ids])
+        db.commit()
+        assert db.query(SupplierShortlist).filter_by(requirement_id=requirement_id).count() == len(supplier_ids)
+        assert_ranks_dense_and_ordered(db, requirement_id)
+        assert current_version(db, requirement_id) > before
+
+
+def test_ranks_stay_dense_under_random_upserts_and_removes(requirement):
+    requirement_id, supplier_ids = requirement
+    rng = random.Random(2)
+    present = set()
+    with SessionLocal() as db:
+        for _ in range(150):
+            supplier_id = rng.choice(supplier_ids)
+            if supplier_id in present and rng.random() < 0.25:
+                assert engine.remove(db, requirement_id, supplier_id)
+                present.discard(supplier_id)
+            else:
+                engine.upsert(db, requirement_id, supplier_data(supplier_id, rng))
+                present.add(supplier_id)
+            db.commit()
+            assert_ranks_dense_and_ordered(db, requirement_id)
+        assert not engine.remove(db, requirement_id, max(supplier_ids) + 1)
+
+
+def test_unchanged_upsert_does_not_bump_the_version(requirement):
+    requirement_id, supplier_ids = requirement
+    data = supplier_data(supplier_ids[0], random.Random(3))
+    with SessionLocal() as db:
+        engine.upsert(db, requirement_id, data)
+        db.commit()
+        before = current_version(db, requirement_id)
+        engine.upsert(db, requirement_id, data)
+        db.commit()
+        assert current_version(db, requirement_id) == before
@@ -37,12 +37,40 @@ const realClient = axios.create({
     'Content-Type': 'application/json',
   },
   timeout: 15000,
+  // 304 answers a conditional GET and is resolved from etagCache below
+  validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
 })
 
+// Last ETag and body per GET URL; the next request for that URL sends
+// If-None-Match and reuses the body when the server answers 304.
+const MAX_ETAG_ENTRIES = 100
+const etagCache = new Map<string, { etag: string; data: unknown }>()
+
+const etagKey = (config: InternalAxiosRequestConfig) => realClient.getUri(config)
+
+const rememberEtag = (response: AxiosResponse) => {
+  const etag = response.headers['etag']
+  if ((response.config.method ?? 'get').toLowerCase() !== 'get' || typeof etag !== 'string') {
+    return
+  }
+  const key = etagKey(response.config)
+  etagCache.delete(key)
+  etagCache.set(key, { etag, data: response.data })
+  if (etagCache.size > MAX_ETAG_ENTRIES) {
+    etagCache.delete(etagCache.keys().next().value as string)
+  }
+}
+
 if (!shouldUseMock) {
   realClient.interceptors.request.use(
     (config) => {
       console.log('🚀 API Request:', config.method?.toUpperCase(), config.url, config.data || '')
+      if ((config.method ?? 'get').toLowerCase() === 'get') {
+        const cached = etagCache.get(etagKey(config))
+        if (cached) {
+          config.headers.set('If-None-Match', cached.etag)
+        }
+      }
       return config
     },
     (error) => {
@@ -53,6 +81,15 @@ if (!shouldUseMock) {
 
   realClient.interceptors.response.use(
     (response) => {
+      if (response.status === 304) {
+        const cached = etagCache.get(etagKey(response.config))
+        if (!cached) {
+          return Promise.reject(new Error(`Unexpected 304 for ${response.config.url} without a cached response.`))
+        }
+        console.log('✅ API Response:', 304, response.config.url, '(not modified)')
+        return { ...response, status: 200, statusText: 'OK', data: cached.data }
+      }
+
       const contentType = response.headers['content-type'] || ''
       const looksLikeHtml = typeof response.data === 'string' && response.data.includes('<!DOCTYPE html>')
 
@@ -65,6 +102,7 @@ if (!shouldUseMock) {
       }
 
       console.log('✅ API Response:', response.status, response.config.url, response.data)
+      rememberEtag(response)
       return response
     },
     (error) => {
@@ -117,5 +155,8 @@ if (shouldUseMock) {
 
 const apiClient = realClient
 
+export const apiBaseUrl = normalizedBaseUrl
+export const usesMockApi = shouldUseMock
+
 export default apiClient
 
@@ -0,0 +1,90 @@
+import { useEffect } from 'react'
+import { useQueryClient, type QueryClient } from '@tanstack/react-query'
+import { apiBaseUrl, usesMockApi } from './client'
+
+export type RequirementEvent =
+  | { type: 'snapshot'; requirement_id: number; status: string; version: number }
+  | { type: 'resync'; requirement_id?: number }
+  | { type: 'requirement.status'; requirement_id: number; status: string }
+  | { type: 'supplier.status'; requirement_id: number; supplier_id: number; status: string; selected_for_outreach: boolean }
+  | { type: 'suppliers.discovered'; requirement_id: number; count: number }
+  | { type: 'sample.created'; requirement_id: number; supplier_id: number; sample_id: number }
+  | { type: 'sample.reviewed'; requirement_id: number; supplier_id: number; sample_id: number; quality_approved: boolean | null }
+  | { type: 'cost_analysis.created'; requirement_id: number; supplier_id: number; cost_analysis_id: number }
+  | { type: 'negotiation.iteration'; requirement_id: number; supplier_id: number; iteration_number: number }
+  | { type: 'shortlist.updated'; requirement_id: number; entries: { supplier_id: number; rank: number }[]; removed: number[] }
+
+// Bursts of events (a pipeline stage commits several at once) share one refetch
+const REFETCH_DELAY_MS = 250
+
+/**
+ * Applies status events to the cached requirement in place. Returns false when
+ * the event needs data the event does not carry, so the detail must be refetched.
+ */
+function applyEvent(queryClient: QueryClient, id: string, event: RequirementEvent): boolean {
+  const requirement = queryClient.getQueryData<any>(['requirement', id])
+  if (!requirement) {
+    return false
+  }
+  if (event.type === 'requirement.status') {
+    queryClient.setQueryData(['requirement', id], { ...requirement, status: event.status })
+    return true
+  }
+  if (event.type === 'supplier.status') {
+    if (!requirement.suppliers?.some((s: any) => s.id === event.supplier_id)) {
+      return false
+    }
+    queryClient.setQueryData(['requirement', id], {
+      ...requirement,
+      suppliers: requirement.suppliers.map((s: any) =>
+        s.id === event.supplier_id
+          ? { ...s, status: event.status, selected_for_outreach: event.selected_for_outreach }
+          : s
+      ),
+    })
+    return true
+  }
+  return false
+}
+
+/**
+ * Keeps the ['requirement', id] query current from the requirement's event
+ * stream instead of polling the detail endpoint. Status changes are patched
+ * into the cache; anything else triggers a (conditional, usually cheap) refetch.
+ */
+export function useRequirementEvents(id: string | undefined) {
+  const queryClient = useQueryClient()
+
+  useEffect(() => {
+    if (!id || usesMockApi || typeof EventSource === 'undefined') {
+      return
+    }
+
+    let refetchTimer: ReturnType<typeof setTimeout> | undefined
+    const refetch = () => {
+      clearTimeout(refetchTimer)
+      refetchTimer = setTimeout(() => {
+        queryClient.invalidateQueries({ queryKey: ['requirement', id] })
+      }, REFETCH_DELAY_MS)
+    }
+
+    const source = new EventSource(`${apiBaseUrl}/requirements/${id}/events`)
+    source.onmessage = (message) => {
+      let event: RequirementEvent
+      try {
+        event = JSON.parse(message.data)
+      } catch {
+        return
+      }
+      // A (re)connect may have missed events; the refetch is answered with 304 if nothing changed
+      if (!applyEvent(queryClient, id, event)) {
+        refetch()
+      }
+    }
+
+    return () => {
+      source.close()
+      clearTimeout(refetchTimer)
+    }
+  }, [id, queryClient])
+}
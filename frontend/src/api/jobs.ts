@@ -0,0 +1,47 @@
+import apiClient from './client'
+
+export interface JobStage {
+  name: string
+  status: 'pending' | 'running' | 'completed'
+  completed: number
+  total: number | null
+}
+
+export interface PipelineJob<T = any> {
+  job_id: number
+  status: 'queued' | 'running' | 'completed' | 'failed'
+  current_stage: string | null
+  stages: JobStage[]
+  result: T
+  error: string | null
+}
+
+const POLL_INTERVAL_MS = 750
+
+const delay = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms))
+
+/**
+ * Resolves a response that may be a queued background job. Polls the job until it
+ * finishes and returns its result; responses without a job_id are returned as-is.
+ */
+export async function waitForJob<T = any>(
+  data: any,
+  onProgress?: (job: PipelineJob<T>) => void
+): Promise<T> {
+  if (!data || typeof data.job_id !== 'number') {
+    return data as T
+  }
+
+  let job = data as PipelineJob<T>
+  while (job.status === 'queued' || job.status === 'running') {
+    onProgress?.(job)
+    await delay(POLL_INTERVAL_MS)
+    const response = await apiClient.get(`/jobs/${job.job_id}`)
+    job = response.data
+  }
+
+  if (job.status === 'failed') {
+    throw new Error(job.error || 'Background job failed')
+  }
+  return job.result
+}
@@ -257,10 +257,16 @@ const mockHandlers = {
       .map((req) => ({
         id: req.id,
         title: req.title,
+        category: req.category,
         status: req.status,
+        deadline: null,
         created_at: req.created_at,
       }))
-    return { data: items }
+    const statusCounts: Record<string, number> = {}
+    items.forEach((item) => {
+      statusCounts[item.status] = (statusCounts[item.status] ?? 0) + 1
+    })
+    return { data: { items, next_cursor: null, status_counts: statusCounts } }
   },
 
   async createRequirement(state: MockState, payload: any) {
@@ -1,5 +1,5 @@
 import { useMemo } from 'react'
-import { useQuery } from '@tanstack/react-query'
+import { useInfiniteQuery } from '@tanstack/react-query'
 import { Link } from 'react-router-dom'
 import apiClient from '../api/client'
 import '../App.css'
@@ -7,33 +7,52 @@ import '../App.css'
 interface Requirement {
   id: number
   title: string
+  category: string | null
   status: string
+  deadline: string | null
   created_at: string
 }
 
+interface RequirementPage {
+  items: Requirement[]
+  next_cursor: string | null
+  status_counts: Record<string, number>
+}
+
+const PAGE_SIZE = 20
+
 function Dashboard() {
   const {
-    data: rawRequirements,
+    data,
     isLoading,
     isFetching,
+    isFetchingNextPage,
+    hasNextPage,
+    fetchNextPage,
     error,
     refetch,
-  } = useQuery<Requirement[]>({
+  } = useInfiniteQuery<RequirementPage>({
     queryKey: ['requirements'],
-    queryFn: async () => {
-      const response = await apiClient.get('/requirements')
+    queryFn: async ({ pageParam }) => {
+      const response = await apiClient.get('/requirements', {
+        params: { limit: PAGE_SIZE, cursor: pageParam ?? undefined },
+      })
       return response.data
     },
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage?.next_cursor ?? undefined,
     staleTime: 1000 * 60,
   })
 
-  const { requirements, dataIsMalformed } = useMemo(() => {
-    const isArray = Array.isArray(rawRequirements)
+  const { requirements, statusCounts, dataIsMalformed } = useMemo(() => {
+    const pages = data?.pages ?? []
+    const isValid = pages.every((page) => page && Array.isArray(page.items))
     return {
-      requirements: isArray ? rawRequirements : [],
-      dataIsMalformed: rawRequirements !== undefined && !isArray,
+      requirements: isValid ? pages.flatMap((page) => page.items) : [],
+      statusCounts: isValid && pages.length > 0 ? pages[0].status_counts ?? {} : {},
+      dataIsMalformed: pages.length > 0 && !isValid,
     }
-  }, [rawRequirements])
+  }, [data])
 
   return (
     <div className="container">
@@ -69,6 +88,15 @@ function Dashboard() {
           <p>No requirements yet. Create your first requirement to get started.</p>
         ) : (
           <div style={{ display: 'grid', gap: '1rem' }}>
+            <div style={{ display: 'flex', flexWrap: 'wrap', gap: '0.5rem' }}>
+              {Object.entries(statusCounts)
+                .filter(([, count]) => count > 0)
+                .map(([status, count]) => (
+                  <span key={status} className={`status-badge status-${status}`}>
+                    {status.replace('_', ' ').toUpperCase()}: {count}
+                  </span>
+                ))}
+            </div>
             {requirements.map((req) => (
               <Link
                 key={req.id}
@@ -90,6 +118,13 @@ function Dashboard() {
                 </div>
               </Link>
             ))}
+            {hasNextPage && (
+              <div>
+                <button className="btn" onClick={() => fetchNextPage()} disabled={isFetchingNextPage}>
+                  {isFetchingNextPage ? 'Loading...' : 'Load More'}
+                </button>
+              </div>
+            )}
           </div>
         )}
       </div>
@@ -2,6 +2,7 @@ import { useState } from 'react'
 import { useParams, useNavigate } from 'react-router-dom'
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import apiClient from '../api/client'
+import { useRequirementEvents } from '../api/events'
 import WorkflowProgress from '../components/WorkflowProgress'
 import '../App.css'
 
@@ -29,6 +30,7 @@ function QualityReviewScreen() {
       return response.data
     },
   })
+  useRequirementEvents(id)
 
   const qualityReviewMutation = useMutation({
     mutationFn: async (data: { sample_id: number; quality_approved: boolean; quality_notes: string; reviewed_by: string }) => {
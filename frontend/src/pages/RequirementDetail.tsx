@@ -2,6 +2,8 @@ import { useState } from 'react'
 import { useParams, useNavigate } from 'react-router-dom'
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import apiClient from '../api/client'
+import { useRequirementEvents } from '../api/events'
+import { waitForJob } from '../api/jobs'
 import '../App.css'
 
 function RequirementDetail() {
@@ -21,11 +23,12 @@ function RequirementDetail() {
       return response.data
     },
   })
+  useRequirementEvents(id)
 
   const scoutMutation = useMutation({
     mutationFn: async () => {
       const response = await apiClient.post(`/requirements/${id}/scout`)
-      return response.data
+      return waitForJob(response.data)
     },
     onSuccess: (data) => {
       queryClient.invalidateQueries({ queryKey: ['requirement', id] })
@@ -2,6 +2,8 @@ import { useEffect, useState } from 'react'
 import { useParams, useNavigate } from 'react-router-dom'
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import apiClient from '../api/client'
+import { useRequirementEvents } from '../api/events'
+import { waitForJob } from '../api/jobs'
 import WorkflowProgress from '../components/WorkflowProgress'
 import '../App.css'
 
@@ -18,11 +20,19 @@ function ScoutingScreen() {
       return response.data
     },
   })
+  useRequirementEvents(id)
 
   const scoutMutation = useMutation({
     mutationFn: async () => {
       const response = await apiClient.post(`/requirements/${id}/scout`)
-      return response.data
+      return waitForJob(response.data, (job) => {
+        const stage = job.stages.find((s) => s.name === job.current_stage)
+        setAutoMessage(
+          stage
+            ? `Scouting in progress: ${stage.name}${stage.total ? ` (${stage.completed}/${stage.total})` : ''}...`
+            : 'Scouting queued...'
+        )
+      })
     },
     onSuccess: (data) => {
       queryClient.invalidateQueries({ queryKey: ['requirement', id] })